@@ -1,78 +1,324 @@
-import requests
 import csv
-import time
-from PIL import Image
+import json
+import threading
 
-from Obra import Obra
-from libreria_pillow import guardar_imagen_desde_url
+from cache_de_imagenes import CacheDeImagenes
+from descargas_de_imagenes import DescargasDeImagenes
+from catalogo import Catalogo
+from cliente_api import ClienteAPI
+from fechas import AÑO_DE_AUTOR_VIVO
+from indices import IndiceDeAutores, IndiceDeFacetas, IndiceDeIntervalos, IndiceDeNacionalidades
+from instrumentacion import instrumentacion
+from lector_de_obras import crear_obra, crear_obra_para_listado, leer_datos_para_indices
+from listado_progresivo import ListadoProgresivo
+from motor_de_descarga import LimitadorDeTasa, MotorDeDescarga
+from peticiones_compartidas import PeticionesCompartidas
 from funciones import *
 
+URL_API = "https://collectionapi.metmuseum.org/public/collection/v1"
+CLAVE_DEPARTAMENTOS = "departamentos"
+ESPERA_PARA_SEGUNDO_PLANO = 0.1  # Segundos desde que se muestra el menú hasta lanzar las tareas en segundo plano
+
 class MetroArt:
     """ Clase principal MetroArt que tiene las funcionalidades del 
         sistema de catálogo de la colección de arte.
     """    
     
-    def __init__(self):
+    def __init__(self, trabajadores=8, peticiones_por_segundo=50, cache=None, tamaño_de_pagina=20, modo_perezoso=True, cache_de_imagenes=None, url_api=URL_API):
         """ Método constructor de la clase MetroArt.
-        Inicializa el museo con un nombre y listas vacías para obras y departamentos.
+        Inicializa el museo con un nombre, un catálogo vacío de obras y listas vacías para departamentos.
         Atributos:
             self (MetroArt): Instancia de la clase MetroArt.
+            trabajadores (int): Cantidad de obras que se descargan a la vez.
+            peticiones_por_segundo (float): Maximo de peticiones por segundo a la API.
+            cache (CacheDeObjetos): Cache en disco de las respuestas de la API. Si es None no se usa.
+            tamaño_de_pagina (int): Cantidad de obras por página en los listados progresivos.
+            modo_perezoso (bool): Si es True las obras se guardan solo con los datos del listado
+                                  y el resto se completa cuando se piden los detalles.
+            cache_de_imagenes (CacheDeImagenes): Cache de imágenes. Si es None se usa uno en la carpeta imagenes.
+            url_api (str): Dirección base de la API del museo.
         """        
         self.nombre_del_museo = "Museo metropolitano de Arte"
-        self.obras = [] 
+        self.url_api = url_api
+        self.obras = Catalogo()
         self.departamentos = []
         self.nacionalidades = []
         self.obras_por_departamento = {}
         self.obras_por_nacionalidad = {}
+        self.sin_conexion = False
+        self.indice_de_nacionalidades = IndiceDeNacionalidades()
+        self.indice_de_autores = IndiceDeAutores()
+        self.indice_de_facetas = IndiceDeFacetas()
+        self.indice_de_creacion = IndiceDeIntervalos()
+        self.indice_de_vida_de_autores = IndiceDeIntervalos()
+        self.cache = cache
+        self.precarga = None  # PrecargaDeDepartamentos opcional, ver main.py
+        self.cache_de_imagenes = cache_de_imagenes if cache_de_imagenes is not None else CacheDeImagenes()
+        self.descargas_de_imagenes = DescargasDeImagenes(self.cache_de_imagenes)
+        self.tamaño_de_pagina = tamaño_de_pagina
+        self.modo_perezoso = modo_perezoso
+        self.hidratador = self.hidratar_obra # Se guarda una sola vez para que todas las obras compartan el mismo
+        self.limitador = LimitadorDeTasa(peticiones_por_segundo)
+        self.cliente = ClienteAPI(self.limitador, conexiones=trabajadores)
+        self.peticiones_compartidas = PeticionesCompartidas()
+        self.motor = MotorDeDescarga(self.leer_obra, trabajadores)
 
-    def leer_api(self,url):
+    def leer_api(self,url, si_no_existe=None):
         """ Metodo para leer la API del museo metropolitano de arte.
         Atributos:
             self (MetroArt): Instancia de la clase MetroArt.
             url (str): URL a leer.
+            si_no_existe: Lo que se retorna si la API respondió 404, ver ClienteAPI.leer.
+            
+            Las peticiones pasan por el cliente de la API, que reutiliza conexiones y reintenta
+            los errores temporales una cantidad limitada de veces. Si otra busqueda ya está
+            leyendo la misma URL se espera su respuesta en lugar de pedirla de nuevo.
         Retorna:
-            Los datos obtenidos de la respuesta de la lectura para luego manipularlos y utilizarlos
+            Los datos obtenidos de la respuesta de la lectura para luego manipularlos y utilizarlos,
+            o None si la API respondió 404, no se pudo leer o el sistema trabaja sin conexión
         """
-        while True:
-            print('.',end="")
-            try:
-                respuesta = requests.get(url)
-                respuesta.raise_for_status()
-                if respuesta.status_code == 200:
-                    datos = respuesta.json()                    
-                    break
-            except requests.exceptions.RequestException as e:
-                if e.response.status_code == 404:
-                    datos = None
-                    break
-                #print(e)
-                time.sleep(1.5)
-                continue
-        return datos 
-        
+        if self.sin_conexion:
+            return None
+        # Solo se comparte la lectura con quien espera la misma respuesta para el 404
+        clave = url if si_no_existe is None else (url, si_no_existe)
+        with instrumentacion.medir("leer_api"):
+            return self.peticiones_compartidas.leer(clave, self.cliente.leer, url, si_no_existe)
+
+    def leer_obra(self, numero_de_obra, usar_cache=True, si_no_existe=None):
+        """ Metodo para leer una obra de la API del museo.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            numero_de_obra (int): ID de la obra a leer.
+            usar_cache (bool): Si es False se lee de la API aunque la obra esté guardada.
+            si_no_existe: Lo que se retorna si la API respondió 404, ver ClienteAPI.leer.
+            Si hay cache se consulta primero y solo se va a la API si la obra no está guardada.
+        Retorna:
+            El JSON de la obra o None si la API no la tiene
+        """
+        if self.cache is not None and usar_cache:
+            datos = self.cache.obtener_obra(numero_de_obra)
+            if datos is not None:
+                instrumentacion.contar("cache_de_obras.aciertos")
+                self.registrar_respuesta(datos)
+                return datos
+            instrumentacion.contar("cache_de_obras.fallos")
+        url = f"{self.url_api}/objects/{numero_de_obra}"
+        datos = self.leer_api(url, si_no_existe)
+        if datos is not None and datos is not si_no_existe:
+            self.registrar_respuesta(datos)
+            if self.cache is not None:
+                self.cache.guardar_obra(numero_de_obra, datos)
+        return datos
+
+    def registrar_respuesta(self, obra_respuesta):
+        """ Metodo para registrar en los índices una obra leída, se guarde o no en el catálogo.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            obra_respuesta (dict): JSON de la obra devuelto por la API.
+        """
+        # Las palabras del autor solo se calculan si el índice no tenía la obra con ese autor
+        self.registrar_datos_para_indices(leer_datos_para_indices(obra_respuesta, normalizar_autor=False))
+
+    def olvidar_obra(self, numero_de_obra):
+        """ Metodo para sacar una obra que ya no está en la API del catálogo, los índices y el cache.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            numero_de_obra (int): ID de la obra.
+        """
+        self.obras.quitar(numero_de_obra)
+        self.indice_de_nacionalidades.quitar(numero_de_obra)
+        self.indice_de_autores.quitar(numero_de_obra)
+        self.indice_de_facetas.quitar(numero_de_obra)
+        self.indice_de_creacion.registrar(numero_de_obra, None)
+        self.indice_de_vida_de_autores.registrar(numero_de_obra, None)
+        if self.cache is not None:
+            self.cache.borrar_obra(numero_de_obra)
+
+    def registrar_datos_para_indices(self, datos):
+        """ Metodo para registrar en los índices una obra ya preparada por leer_datos_para_indices,
+            por ejemplo en otro proceso al importar un volcado.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            datos (tuple): Datos de la obra para los índices, ver lector_de_obras.leer_datos_para_indices.
+        """
+        numero_de_obra, nacionalidad, nombre_del_autor, palabras_del_autor, departamento, clasificacion, tiene_imagen, creacion, vida = datos
+        self.indice_de_nacionalidades.registrar(numero_de_obra, nacionalidad)
+        self.indice_de_autores.registrar(numero_de_obra, nombre_del_autor, palabras_del_autor)
+        self.indice_de_facetas.registrar(numero_de_obra, departamento, clasificacion, tiene_imagen)
+        # Las fechas ya vienen convertidas a años, se convierten una sola vez al leer la obra
+        self.indice_de_creacion.registrar(numero_de_obra, creacion)
+        self.indice_de_vida_de_autores.registrar(numero_de_obra, vida)
+
+    def indexar_cache(self):
+        """ Metodo para llenar los índices con todas las obras guardadas en el cache de disco.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            
+            Se puede llamar en un hilo aparte al iniciar: mientras no termina, las busquedas
+            simplemente consultan la API por las obras que el índice aún no conoce.
+        """
+        if self.cache is None:
+            return
+        for obra_respuesta in self.cache.iterar_obras():
+            self.registrar_respuesta(obra_respuesta)
+
+    def leer_busqueda(self, url):
+        """ Metodo para leer una busqueda de la API del museo.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            url (str): URL de la busqueda.
+            
+            Si hay cache se consulta primero y solo se va a la API si la busqueda no está guardada.
+        Retorna:
+            El JSON de la respuesta de la busqueda
+        """
+        if self.cache is not None:
+            datos = self.cache.obtener_busqueda(url)
+            if datos is not None:
+                return datos
+        datos = self.leer_api(url)
+        if datos is not None and self.cache is not None:
+            self.cache.guardar_busqueda(url, datos)
+        return datos
+
+    def iterar_obras(self, ids_de_obras, mostrar_progreso=False):
+        """ Metodo para recorrer las obras de un grupo de ids, descargando las que falten.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            ids_de_obras (list): IDs de las obras a recorrer.
+            mostrar_progreso (bool): Si es True imprime cada obra descargada.
+            
+            Primero entrega las obras que ya están en el catálogo y luego las que se descargan,
+            que se agregan al catálogo a medida que llegan.
+        Retorna:
+            Un generador con las obras
+        """
+        faltantes = []
+        for numero_de_obra in ids_de_obras:
+            obra = self.obras.obtener(numero_de_obra)
+            if obra is None:
+                faltantes.append(numero_de_obra)
+            else:
+                yield obra
+        instrumentacion.contar("catalogo.aciertos", len(ids_de_obras) - len(faltantes))
+        instrumentacion.contar("catalogo.fallos", len(faltantes))
+
+        def convertir(obra_respuesta):
+            nueva_obra = self.convertir_respuesta(obra_respuesta)
+            #Lo agrego si no está guardada
+            self.obras.agregar(nueva_obra)
+            return nueva_obra
+
+        yield from self.motor.obtener_obras(faltantes, convertir, mostrar_progreso)
+
+    def convertir_respuesta(self, obra_respuesta):
+        """ Metodo para convertir la respuesta de la API en la obra que se guarda en el catálogo.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            obra_respuesta (dict): JSON de la obra devuelto por la API.
+        Retorna:
+            Una obra perezosa con los datos del listado si está activo el modo perezoso,
+            o la obra completa si no
+        """
+        if not self.modo_perezoso:
+            return self.crear_obra(obra_respuesta)
+        with instrumentacion.medir("crear_obra"):
+            return crear_obra_para_listado(obra_respuesta, self.hidratador)
+
+    def hidratar_obra(self, numero_de_obra):
+        """ Metodo para buscar la obra completa de una obra perezosa.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            numero_de_obra (int): ID de la obra.
+        Retorna:
+            La obra completa o None si no se pudo leer
+        """
+        obra_respuesta = self.leer_obra(numero_de_obra)
+        if obra_respuesta is None:
+            return None
+        return self.crear_obra(obra_respuesta)
+
+    def hidratar_lote(self, obras):
+        """ Metodo para completar de una vez los datos de varias obras perezosas,
+            por ejemplo las de la página que se está mostrando.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            obras (list): Obras a completar.
+        """
+        pendientes = {}
+        for obra in obras:
+            if not obra.esta_hidratada():
+                pendientes[obra.numero] = obra
+        for obra_completa in self.motor.obtener_obras(list(pendientes), self.crear_obra, mostrar_progreso=False):
+            pendientes[obra_completa.numero].hidratar(obra_completa)
+
+    def crear_obra(self, obra_respuesta):
+        """ Metodo para crear una obra a partir de la respuesta de la API.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            obra_respuesta (dict): JSON de la obra devuelto por la API.
+            
+            La normalización de los campos está en lector_de_obras.
+        Retorna:
+            La obra creada
+        """
+        with instrumentacion.medir("crear_obra"):
+            return crear_obra(obra_respuesta)
     
-    def cargar_datos_API(self):
+    def cargar_datos_API(self, esperar_actualizacion=True):
         """ Metodo para cargar los datos de la API del museo metropolitano de arte.
         Atributos:
             self (MetroArt): Instancia de la clase MetroArt.
+            esperar_actualizacion (bool): Si es False y hay departamentos guardados, no se actualizan
+                                          aquí: queda para actualizar_departamentos, por ejemplo en un hilo aparte.
         
-            Carga los datos iniciales desde la API, en este caso los departamentos, la función
-            se ejecuta pero no tiene un valor de retorno
+            Carga los datos iniciales desde la API, en este caso los departamentos.
+            Si el cache tiene los departamentos de una sesión anterior se usan enseguida y la API
+            solo se espera la primera vez; sin conexión se usan los guardados, si los hay.
+        Retorna:
+            True si se usaron los departamentos guardados y falta actualizarlos desde la API
         """        
+        guardados = self.cache.obtener_estado(CLAVE_DEPARTAMENTOS) if self.cache is not None else None
+        if guardados is not None:
+            self.departamentos = json.loads(guardados)
+            if self.sin_conexion:
+                return False
+            if not esperar_actualizacion:
+                return True
+            self.actualizar_departamentos()
+            return False
+        if self.sin_conexion:
+            return False
         
         print(f'\n---------- Cargando desde la API ----------\n')        
         #Cargo los departamentos
-        url = "https://collectionapi.metmuseum.org/public/collection/v1/departments"
-        datos = self.leer_api(url)
-        
-        if datos is None:
+        if not self.actualizar_departamentos():
             print("La API no permitió leer los departamentos")
         
-        else:
-            for departamento in datos['departments']:
-                self.departamentos.append(departamento)
-        
         print(f'\n---------- Carga finalizada. ----------\n')
+        return False
+
+    def actualizar_departamentos(self):
+        """ Metodo para leer los departamentos de la API y guardarlos en el cache para la próxima sesión.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+        Retorna:
+            True si se pudieron leer, False si no
+        """
+        datos = self.leer_api(f"{self.url_api}/departments")
+        if datos is None:
+            return False
+        # Se conservan los departamentos que no da la API, por ejemplo los de un volcado
+        # importado o de la instantánea, que pueden haberse agregado mientras se esperaba
+        departamentos = list(datos['departments'])
+        de_la_api = {departamento['departmentId'] for departamento in departamentos}
+        departamentos += [departamento for departamento in self.departamentos if departamento['departmentId'] not in de_la_api]
+        departamentos.sort(key=lambda departamento: departamento['departmentId'])
+        # Se reemplaza la lista entera, el menú puede estar recorriendo la anterior
+        self.departamentos = departamentos
+        if self.cache is not None:
+            self.cache.guardar_estado(CLAVE_DEPARTAMENTOS, json.dumps(datos['departments']))
+        return True
     
     def cargar_datos_csv(self, archivo):
         """ Metodo para cargar las nacionalidades del archivo CSV.
@@ -100,26 +346,28 @@ class MetroArt:
         
         print(f'\n---------- Carga desde CSV finalizada. ----------\n')
     
-    def mostrar_imagen(self, url,titulo):
-        """ Metodo para mostrar una imagen desde una URL.
+    def mostrar_imagen(self, obra):
+        """ Metodo para mostrar la imagen de una obra.
         Atributos:
             self (MetroArt): Instancia de la clase MetroArt.
-            url (str): URL de la imagen a mostrar.
+            obra (Obra): Obra cuya imagen se quiere mostrar.
             
-            Si consigue un link se ejecuta, almacena la foto y la muestra
+            Si la obra tiene imagen pregunta si se desea ver y muestra una miniatura.
+            La imagen solo se descarga la primera vez, luego se usa la guardada en el cache de imágenes.
+            La descarga y la ventana no bloquean el menú: si la imagen no está lista se muestra al terminar.
         """
+        url = obra.imagen_de_la_obra
         if url == '':
             print("La obra no tiene imagen.")
         else:
             eleccion_mostrar_imagen = input('''
                 ¿Desea ver la imagen de la obra en una nueva ventana? Ingrese "y" si lo desea o "n" en caso contrario:''')
             if eleccion_mostrar_imagen.lower() == "y":
-                # Nombre deseado para el archivo (sin extensión, ya que se determinará automáticamente) 
-                nombre_archivo_destino = f"imagenes/{titulo}" 
-                # Llamar a la función para guardar la imagen 
-                nombre_archivo_destino=guardar_imagen_desde_url(url, nombre_archivo_destino) 
-                img = Image.open(nombre_archivo_destino) 
-                img.show()
+                if not self.descargas_de_imagenes.mostrar(obra.numero, url):
+                    print("La imagen se está descargando, se abrirá en una nueva ventana cuando esté lista.")
+            else:
+                # No la quiere ver, se deja de descargar
+                self.descargas_de_imagenes.cancelar(obra.numero, url)
     
     def submenu_obras_por_departamento(self,nombre_del_departamento,ids_de_obras=[]):
         """ Metodo para mostrar las obras de un departamento.
@@ -128,42 +376,83 @@ class MetroArt:
             nombre_del_departamento (str): Nombre del departamento.
             ids_de_obras (list): IDs de las obras a mostrar.
             
-            Si se le pasa una lista con las obras esta recorrerá la lista e imprimirá el menu
-            con las obras dando la opcion de ver mas detalles de esta.
+            Muestra las obras por páginas a medida que llegan de la API, dando la opcion de
+            ver mas detalles de cada una. Mientras el usuario lee una página se descargan las siguientes.
             Si no se le pasa ninguna lista, buscará la lista de ids en las obras almacenadas usando el nombre del
-            departamento y mostrará luego el mismo menu dado que se llama recursivamente
+            departamento
         """
         if ids_de_obras == []:
             ids_de_obras = self.obras_por_departamento[nombre_del_departamento]
-            self.submenu_obras_por_departamento(nombre_del_departamento, ids_de_obras)
-            
-        while True:
-                print(" ")
-                print(f"---------- Departamento {nombre_del_departamento} ----------")
-                print(" ")
-                for obra in self.obras:
-                    if obra.numero in ids_de_obras:
+
+        self.listar_por_paginas(f"Departamento {nombre_del_departamento}", ids_de_obras, "listado.departamento")
+
+    def listar_por_paginas(self, titulo, ids_de_obras, nombre_de_la_medicion):
+        """ Metodo para mostrar un grupo de obras por páginas.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            titulo (str): Titulo de las páginas.
+            ids_de_obras (list): IDs de las obras a mostrar.
+            nombre_de_la_medicion (str): Nombre con que se mide cada página en la instrumentación.
+
+            Muestra las obras por páginas a medida que llegan (del catálogo, del cache o de la API),
+            dando la opcion de ver mas detalles de cada una. Mientras el usuario lee una página
+            se descargan las siguientes.
+        """
+        listado = ListadoProgresivo(self.iterar_obras(ids_de_obras), self.tamaño_de_pagina)
+        pagina = 0
+        try:
+            while True:
+                with instrumentacion.medir(nombre_de_la_medicion):
+                    obras_de_la_pagina = listado.pagina(pagina)
+                    print(" ")
+                    print(f"---------- {titulo} - Página {pagina+1} ----------")
+                    print(" ")
+                    if len(obras_de_la_pagina) == 0:
+                        print("No hay obras para mostrar.")
+                    for obra in obras_de_la_pagina:
                         print(obra.mostrar_para_listado())
+                # Completo los detalles de la página en segundo plano mientras el usuario elige.
+                # Sin cache de disco las respuestas del listado no quedan guardadas y se volverían
+                # a pedir a la API todas las obras de la página, así que se espera a que elija una.
+                if self.cache is not None:
+                    threading.Thread(target=self.hidratar_lote, args=(obras_de_la_pagina,), daemon=True).start()
                 print(" ")
-                numero_de_la_obra_a_mostrar = input("Ingrese el numero de una obra para mostrar sus detalles o el numero 0 para salir: ")
-                while not es_numero(numero_de_la_obra_a_mostrar):
+                hay_siguiente = listado.hay_pagina_siguiente(pagina)
+                print(f"{listado.cargadas()} obras cargadas de {len(ids_de_obras)} resultados.")
+                self.descargas_de_imagenes.mostrar_avisos()
+                
+                mensaje = "Ingrese el numero de una obra para mostrar sus detalles"
+                if hay_siguiente:
+                    mensaje += ', "s" para la página siguiente'
+                if pagina > 0:
+                    mensaje += ', "a" para la página anterior'
+                mensaje += " o el numero 0 para salir: "
+                numero_de_la_obra_a_mostrar = input(mensaje)
+                while not es_numero(numero_de_la_obra_a_mostrar) and numero_de_la_obra_a_mostrar.lower() not in ("s", "a"):
                     print(" ")
                     print("Intente de nuevo.")
                     print(" ")
-                    numero_de_la_obra_a_mostrar = input("Ingrese el numero de una obra para mostrar sus detalles o el numero 0 para salir: ")
+                    numero_de_la_obra_a_mostrar = input(mensaje)
                 
                 # Si decide salir 
                 if numero_de_la_obra_a_mostrar == '0': 
                     break
                 
+                # Si decide cambiar de página, las imágenes adelantadas de esta ya no hacen falta
+                if numero_de_la_obra_a_mostrar.lower() == "s":
+                    if hay_siguiente:
+                        pagina += 1
+                        self.descargas_de_imagenes.cancelar_todas()
+                    continue
+                if numero_de_la_obra_a_mostrar.lower() == "a":
+                    if pagina > 0:
+                        pagina -= 1
+                        self.descargas_de_imagenes.cancelar_todas()
+                    continue
+                
                 #Verifico que el id pertenece a una obra. Si no sale busco su elección
-                obra_encontrada = False
-                obra_a_mostrar = " "
-                for obra in self.obras:
-                    if obra.numero == int(numero_de_la_obra_a_mostrar):
-                        obra_encontrada = True
-                        obra_a_mostrar = obra
-                        break
+                obra_a_mostrar = self.obras.obtener(int(numero_de_la_obra_a_mostrar))
+                obra_encontrada = obra_a_mostrar is not None
                     
                 # Si no seleccionó un departamento valido de la lista
                 if obra_encontrada == False:
@@ -171,14 +460,55 @@ class MetroArt:
                     print("Número de obra no existente.")
                     continue
                 
+                # Si antes no se pudieron leer sus detalles se intenta de nuevo
+                obra_a_mostrar.hidratar()
+                # La imagen se empieza a descargar por si el usuario la pide
+                self.descargas_de_imagenes.adelantar(obra_a_mostrar.numero, obra_a_mostrar.imagen_de_la_obra)
                 print(obra_a_mostrar.mostrar_detalles_completos())
                 
                 # Para mostrar la imagen
-                api_url = obra_a_mostrar.imagen_de_la_obra
-                titulo = obra_a_mostrar.titulo.replace(" ", "_")  # Reemplazo espacios por guiones bajos para el nombre del archivo
-                    
-                self.mostrar_imagen(api_url,titulo)
+                self.mostrar_imagen(obra_a_mostrar)
+        finally:
+            # Si sale del listado no se siguen descargando obras ni imágenes que no pidió
+            listado.cancelar()
+            self.descargas_de_imagenes.cancelar_todas()
+            
+    def buscar_ids_por_departamento(self, numero_del_departamento):
+        """ Metodo para buscar en la API los IDs de las obras de un departamento.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            numero_del_departamento (int): ID del departamento.
+        Retorna:
+            La lista de IDs (vacía si no hay resultados) o None si la API no respondió
+        """
+        # Busco las obras por ese departamento en la API
+        url = f"{self.url_api}/search?departmentId={numero_del_departamento}&q=cat"
+        datos = self.leer_busqueda(url)
+        if datos is None:
+            return None
+        return datos['objectIDs'] or []
+
+    def ids_del_departamento(self, numero_del_departamento):
+        """ Metodo para obtener los IDs de las obras de un departamento, de los ya conocidos o de la API.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            numero_del_departamento (int): ID del departamento.
             
+            Si se buscan en la API quedan guardados en obras_por_departamento.
+        Retorna:
+            La lista de IDs, vacía si el departamento no existe o la API no respondió
+        """
+        nombre_del_departamento = None
+        for departamento in self.departamentos:
+            if departamento['departmentId'] == numero_del_departamento:
+                nombre_del_departamento = departamento['displayName']
+        ids_de_obras = self.obras_por_departamento.get(nombre_del_departamento)
+        if ids_de_obras is None:
+            ids_de_obras = self.buscar_ids_por_departamento(numero_del_departamento) or []
+            if nombre_del_departamento is not None and ids_de_obras:
+                self.obras_por_departamento[nombre_del_departamento] = ids_de_obras
+        return ids_de_obras
+
     def busqueda_por_departamento(self):
         """ Metodo para la funcionalidad de busqueda por departamento.
         Atributos:
@@ -226,6 +556,11 @@ class MetroArt:
             print(' ')
             print(f"Buscando obras por {nombre_del_departamento} ")
             print(' ')
+            if self.cache is not None:
+                self.cache.contar_uso(f"departamento:{numero_del_departamento_seleccionado}")
+            if self.precarga is not None:
+                # El listado descarga sus primeras páginas, la precarga sigue desde ahí
+                self.precarga.priorizar(int(numero_del_departamento_seleccionado), desde=self.tamaño_de_pagina * 3)
             # Si es valido busco las obras
             if len(self.obras_por_departamento)>0:
                 # Verifico si ya se buscó en algun momento
@@ -247,104 +582,18 @@ class MetroArt:
                 
             print("No almacenadas, se procede a buscar en la API")
             print(" ")    
-            # Busco las obras por ese departamento en la API
-            url = f"https://collectionapi.metmuseum.org/public/collection/v1/search?departmentId={numero_del_departamento_seleccionado}&q=cat"
-            
-            datos = self.leer_api(url)
-            
-            ids_de_obras = datos['objectIDs']
-            
-            print("Recuperando obras desde la API. Espere por favor...") 
-            print("")
-            if ids_de_obras == None:
-                print("No existen resultados para el nombre de autor ingresado")
+            ids_de_obras = self.buscar_ids_por_departamento(numero_del_departamento_seleccionado)
+            if ids_de_obras is None:
+                print("La API no respondió. Intente de nuevo más tarde.")
+                print(" ")
+                continue
+            if len(ids_de_obras) == 0:
+                print("No existen resultados para el departamento ingresado")
                 print(" ")
                 continue
             
             self.obras_por_departamento[nombre_del_departamento] = ids_de_obras # Guardo los ids de obras del departamento
-            print(f"Filtrando de {len(ids_de_obras)} resultados.")
-            print('')
-            print("Revisando obras:")
-            for numero_de_obra in ids_de_obras:
-                print(f"    Obra numero {numero_de_obra}") 
-                url = f"https://collectionapi.metmuseum.org/public/collection/v1/objects/{numero_de_obra}"
-                obra_respuesta = self.leer_api(url)
-                
-                if obra_respuesta is None:
-                    print("Obra no válida en la API. No almacenada.")
-                    continue
-                
-                numero = obra_respuesta['objectID']
-                
-                titulo = obra_respuesta['title'],
-                if titulo == " " or titulo == "":
-                    titulo = "No especificado"
-                if type(titulo) == tuple:
-                    titulo = titulo[0]
-                
-                nombre_del_autor = obra_respuesta['artistDisplayName'],
-                if type(nombre_del_autor) == str:
-                    nombre_del_autor = nombre_del_autor.replace("(","").replace(")","").replace(",","")
-                if nombre_del_autor == " " or nombre_del_autor == "":
-                    nombre_del_autor = "No especificado"
-                if type(nombre_del_autor) == tuple:   # ("nombre ejemplo", ) Me salia esto en la API
-                    nombre_del_autor = nombre_del_autor[0]
-                
-                nacionalidad_del_autor = obra_respuesta['artistNationality'],
-                if nacionalidad_del_autor == " " or nacionalidad_del_autor == "":
-                    nacionalidad_del_autor = "No especificada"
-                if type(nacionalidad_del_autor) == tuple:
-                    nacionalidad_del_autor = nacionalidad_del_autor[0]
-                
-                fecha_de_nacimiento = obra_respuesta['artistBeginDate'],
-                if fecha_de_nacimiento == " " or fecha_de_nacimiento == "":
-                    fecha_de_nacimiento = "No especificada"
-                if type(fecha_de_nacimiento) == tuple:
-                    fecha_de_nacimiento = fecha_de_nacimiento[0]
-                
-                fecha_de_muerte = obra_respuesta['artistEndDate'],
-                if fecha_de_muerte == " " or fecha_de_muerte == "":
-                    fecha_de_muerte = "No especificada"
-                if type(fecha_de_muerte) == tuple:
-                    fecha_de_muerte = fecha_de_muerte[0]
-                
-                tipo = obra_respuesta['classification'],
-                if tipo == " " or tipo == "":
-                    tipo = "No especificado"
-                if type(tipo) == tuple:
-                    tipo = tipo[0]
-                
-                año_de_creación = obra_respuesta['objectDate'],
-                if año_de_creación == " " or año_de_creación == "":
-                    año_de_creación = "No especificado"
-                if type(año_de_creación) == tuple:
-                    año_de_creación = año_de_creación[0]
-                
-                imagen_de_la_obra = obra_respuesta['primaryImage']
-                if type(imagen_de_la_obra) == tuple:
-                    imagen_de_la_obra = imagen_de_la_obra[0]
-                    
-                nueva_obra = Obra(
-                    numero,
-                    titulo,
-                    nombre_del_autor,
-                    nacionalidad_del_autor,
-                    fecha_de_nacimiento,
-                    fecha_de_muerte,
-                    tipo,
-                    año_de_creación,
-                    imagen_de_la_obra,
-                    )
-                
-                #Verifico que no este guardada
-                guardada = False
-                for obra in self.obras:
-                    if obra.numero == nueva_obra.numero:
-                        guardada = True
-                        
-                if not guardada:
-                    self.obras.append(nueva_obra)
-                    
+            print(f"Mostrando {len(ids_de_obras)} resultados a medida que llegan.")
             self.submenu_obras_por_departamento(nombre_del_departamento, ids_de_obras)
     
     def submenu_obras_por_nacionalidad(self,nombre_de_la_nacionalidad,ids_de_obras=[]):
@@ -361,16 +610,16 @@ class MetroArt:
         """
         if ids_de_obras == []:
             ids_de_obras = self.obras_por_nacionalidad[nombre_de_la_nacionalidad]
-            self.submenu_obras_por_nacionalidad(nombre_de_la_nacionalidad, ids_de_obras)
             
         while True:
                 print(" ")
                 print(f"---------- Nacionalidad {nombre_de_la_nacionalidad} ----------")
                 print(" ")
-                for obra in self.obras:
-                    if obra.numero in ids_de_obras:
+                with instrumentacion.medir("listado.nacionalidad"):
+                    for obra in self.obras.listar(ids_de_obras):
                         print(obra.mostrar_para_listado())
                 print(" ")
+                self.descargas_de_imagenes.mostrar_avisos()
                 numero_de_la_obra_a_mostrar = input("Ingrese el numero una obra para mostrar sus detalles o el numero 0 para salir: ")
                 while not es_numero(numero_de_la_obra_a_mostrar):
                     print(" ")
@@ -378,18 +627,14 @@ class MetroArt:
                     print(" ")
                     numero_de_la_obra_a_mostrar = input("Ingrese el numero una obra para mostrar sus detalles o el numero 0 para salir: ")
                 
-                # Si decide salir 
+                # Si decide salir, las imágenes adelantadas que no pidió ya no hacen falta
                 if numero_de_la_obra_a_mostrar == '0': 
+                    self.descargas_de_imagenes.cancelar_todas()
                     break
                 
                 #Verifico que el id pertenece a una obra. Si no sale busco su elección
-                obra_encontrada = False
-                obra_a_mostrar = " "
-                for obra in self.obras:
-                    if obra.numero == int(numero_de_la_obra_a_mostrar):
-                        obra_encontrada = True
-                        obra_a_mostrar = obra
-                        break
+                obra_a_mostrar = self.obras.obtener(int(numero_de_la_obra_a_mostrar))
+                obra_encontrada = obra_a_mostrar is not None
                     
                 # Si no seleccionó un nacionalidad valido de la lista
                 if obra_encontrada == False:
@@ -397,14 +642,76 @@ class MetroArt:
                     print("Número de obra no existente.")
                     continue
                 
+                # Si antes no se pudieron leer sus detalles se intenta de nuevo
+                obra_a_mostrar.hidratar()
+                # La imagen se empieza a descargar por si el usuario la pide
+                self.descargas_de_imagenes.adelantar(obra_a_mostrar.numero, obra_a_mostrar.imagen_de_la_obra)
                 print(obra_a_mostrar.mostrar_detalles_completos())
                 
                 # Para mostrar la imagen
-                api_url = obra.imagen_de_la_obra
-                titulo = obra.titulo.replace(" ", "_")  # Reemplazo espacios por guiones bajos para el nombre del archivo
-                    
-                self.mostrar_imagen(api_url,titulo)
+                self.mostrar_imagen(obra_a_mostrar)
                             
+    def buscar_por_nacionalidad(self, nombre_de_la_nacionalidad, mostrar_progreso=True):
+        """ Metodo para buscar las obras de autores de una nacionalidad.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            nombre_de_la_nacionalidad (str): Nacionalidad buscada.
+            mostrar_progreso (bool): Si es True imprime el avance de la busqueda.
+        Retorna:
+            La lista de IDs de las obras de la nacionalidad, que quedan guardadas en el catálogo
+        """
+        return [obra.numero for obra in self.iterar_por_nacionalidad(nombre_de_la_nacionalidad, mostrar_progreso)]
+
+    def iterar_por_nacionalidad(self, nombre_de_la_nacionalidad, mostrar_progreso=False):
+        """ Metodo para recorrer las obras de autores de una nacionalidad a medida que se encuentran.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            nombre_de_la_nacionalidad (str): Nacionalidad buscada.
+            mostrar_progreso (bool): Si es True imprime el avance de la busqueda.
+            
+            Primero toma las obras que el índice de nacionalidades ya conoce. Luego consulta la busqueda
+            de la API y solo descarga las obras que nunca se han leído: las ya leídas se aceptan o
+            descartan con el índice, así una obra descartada no se vuelve a descargar.
+        Retorna:
+            Un generador con las obras de la nacionalidad, que se agregan al catálogo
+        """
+        ids_de_obras = self.indice_de_nacionalidades.obras_de(nombre_de_la_nacionalidad)
+        aceptados = set(ids_de_obras)
+        desconocidos = []
+        
+        # Busco las obras por ese nacionalidad en la API
+        url = f"{self.url_api}/search?artistOrCulture=true&q={nombre_de_la_nacionalidad}"
+        datos = self.leer_busqueda(url)
+        if datos is None:
+            if mostrar_progreso:
+                print("La API no respondió, se muestran solo las obras conocidas.")
+        elif datos['objectIDs'] is not None:
+            for numero_de_obra in datos['objectIDs']:
+                nacionalidad = self.indice_de_nacionalidades.nacionalidad_de(numero_de_obra)
+                if nacionalidad is None:
+                    desconocidos.append(numero_de_obra)
+                elif nacionalidad == nombre_de_la_nacionalidad and numero_de_obra not in aceptados:
+                    aceptados.add(numero_de_obra)
+                    ids_de_obras.append(numero_de_obra)
+            if mostrar_progreso:
+                print(f"{len(ids_de_obras)} obras ya conocidas. Revisando {len(desconocidos)} obras nuevas de la API:")
+
+        # Las obras conocidas por el índice pueden no estar en el catálogo de esta sesión
+        yield from self.iterar_obras(ids_de_obras)
+
+        def convertir(obra_respuesta):
+            # Solo se guardan las obras cuyo autor es de la nacionalidad buscada
+            if obra_respuesta['artistNationality'] != nombre_de_la_nacionalidad:
+                return None
+            return self.convertir_respuesta(obra_respuesta)
+
+        for nueva_obra in self.motor.obtener_obras(desconocidos, convertir, mostrar_progreso):
+            #Lo agrego si no está guardada
+            self.obras.agregar(nueva_obra)
+            if nueva_obra.numero not in aceptados:
+                aceptados.add(nueva_obra.numero)
+                yield nueva_obra
+
     def busqueda_por_nacionalidad_del_autor(self):
         """ Metodo para la funcionalidad de busqueda por nacionalidad.
         Atributos:
@@ -443,135 +750,27 @@ class MetroArt:
                 
                 # Si esta en el diccionario se procede a mostrar las obras USAR FUNCION
                 if encontrado != -1:
-                    print("Entré")
-                    print(nombre_de_la_nacionalidad)
-                    print(self.obras_por_departamento[nombre_de_la_nacionalidad])
-
                     # lista es la que contiene las obras
                     ids_de_obras = self.obras_por_nacionalidad[nombre_de_la_nacionalidad]
 
-                    self.submenu_obras_por_nacionalidad(nombre_de_la_nacionalidad, ids_de_obras)
+                    if len(ids_de_obras)>0:
+                        self.submenu_obras_por_nacionalidad(nombre_de_la_nacionalidad, ids_de_obras)
+                    else:
+                        print("No existen resultados para la nacionalidad ingresada")
+                        print(" ")
                     
                     continue #Si la consiguió no hace buscar en la API, vuelve al bucle
                 
-            print("No almacenadas, se procede a buscar en la API")
+            print("No almacenadas, se buscan en las obras conocidas y luego en la API")
             print(" ")    
             
-            # Busco las obras por ese nacionalidad en la API
-            url = f"https://collectionapi.metmuseum.org/public/collection/v1/search?artistOrCulture=true&q={nombre_de_la_nacionalidad}"
-            
-            datos = self.leer_api(url)
-            
-            ids_de_obras = datos['objectIDs']
-            
-            print("Recuperando obras desde la API. Espere por favor...") 
-            print("")
-            if ids_de_obras == None:
-                print("No existen resultados para el nombre de autor ingresado")
-                print(" ")
-                continue
-                 
-            # Las guardo en el nacionalidad
+            ids_de_obras = self.buscar_por_nacionalidad(nombre_de_la_nacionalidad)
             self.obras_por_nacionalidad[nombre_de_la_nacionalidad] = ids_de_obras
             
-            # Guardo los ids en una copia
-            copia_ids_de_obras = []
-            for id in ids_de_obras:
-                copia_ids_de_obras.append(id)
-            print(f"Filtrando de {len(ids_de_obras)} resultados.")
-            print('')
-            print("Revisando obras:")
-            for numero_de_obra in copia_ids_de_obras: 
-                print(f"    Obra numero {numero_de_obra}") 
-                url = f"https://collectionapi.metmuseum.org/public/collection/v1/objects/{numero_de_obra}"
-                
-                obra_respuesta = self.leer_api(url)
-                
-                if obra_respuesta is None:
-                    print("Obra no válida en la API. No almacenada.")
-                    ids_de_obras.remove(numero_de_obra)
-                    continue
-                
-                if obra_respuesta['artistNationality'] == nombre_de_la_nacionalidad:    
-                    
-                    numero = obra_respuesta['objectID']
-
-                    titulo = obra_respuesta['title'],
-                    if titulo == " " or titulo == "":
-                        titulo = "No especificado"
-                    if type(titulo) == tuple:
-                        titulo = titulo[0]
-
-                    nombre_del_autor = obra_respuesta['artistDisplayName'],
-                    print(nombre_del_autor)
-                    print(type(nombre_del_autor))
-                    if type(nombre_del_autor) == str:
-                        nombre_del_autor = nombre_del_autor.replace("(","").replace(")","").replace(",","")
-                    if nombre_del_autor == " " or nombre_del_autor == "":
-                        nombre_del_autor = "No especificado"
-                    if type(nombre_del_autor) == tuple:
-                        nombre_del_autor = nombre_del_autor[0]
-
-                    nacionalidad_del_autor = obra_respuesta['artistNationality'],
-                    if nacionalidad_del_autor == " " or nacionalidad_del_autor == "":
-                        nacionalidad_del_autor = "No especificada"
-                    if type(nacionalidad_del_autor) == tuple:
-                        nacionalidad_del_autor = nacionalidad_del_autor[0]
-
-                    fecha_de_nacimiento = obra_respuesta['artistBeginDate'],
-                    if fecha_de_nacimiento == " " or fecha_de_nacimiento == "":
-                        fecha_de_nacimiento = "No especificada"
-                    if type(fecha_de_nacimiento) == tuple:
-                        fecha_de_nacimiento = fecha_de_nacimiento[0]
-
-                    fecha_de_muerte = obra_respuesta['artistEndDate'],
-                    if fecha_de_muerte == " " or fecha_de_muerte == "":
-                        fecha_de_muerte = "No especificada"
-                    if type(fecha_de_muerte) == tuple:
-                        fecha_de_muerte = fecha_de_muerte[0]
-
-                    tipo = obra_respuesta['classification'],
-                    if tipo == " " or tipo == "":
-                        tipo = "No especificado"
-                    if type(tipo) == tuple:
-                        tipo = tipo[0]
-
-                    año_de_creación = obra_respuesta['objectDate'],
-                    if año_de_creación == " " or año_de_creación == "":
-                        año_de_creación = "No especificado"
-                    if type(año_de_creación) == tuple:
-                        año_de_creación = año_de_creación[0]
-
-                    imagen_de_la_obra = obra_respuesta['primaryImage']
-                    if type(imagen_de_la_obra) == tuple:
-                        imagen_de_la_obra = imagen_de_la_obra[0]
-
-                    nueva_obra = Obra(
-                        numero,
-                        titulo,
-                        nombre_del_autor,
-                        nacionalidad_del_autor,
-                        fecha_de_nacimiento,
-                        fecha_de_muerte,
-                        tipo,
-                        año_de_creación,
-                        imagen_de_la_obra,
-                        )
-                        #Verifico que no este guardada
-                    guardada = False
-                    for obra in self.obras:
-                        if obra.numero == nueva_obra.numero:
-                            guardada = True
-
-                    if not guardada:
-                        self.obras.append(nueva_obra)
-                else:
-                    ids_de_obras.remove(numero_de_obra)
-            
             if len(ids_de_obras)>0:
                 self.submenu_obras_por_nacionalidad(nombre_de_la_nacionalidad, ids_de_obras)
             else:
-                print("No existen resultados para el nombre de autor ingresado")
+                print("No existen resultados para la nacionalidad ingresada")
                 print(" ")
     
     def submenu_obras_por_nombre(self,nombre_autor,ids_de_obras):
@@ -589,10 +788,11 @@ class MetroArt:
                     print(" ")
                     print(f"---------- Nombre del autor: {nombre_autor} ----------")
                     print(" ")
-                    for obra in self.obras:
-                        if obra.numero in ids_de_obras:
+                    with instrumentacion.medir("listado.autor"):
+                        for obra in self.obras.listar(ids_de_obras):
                             print(obra.mostrar_para_listado())
                     print(" ")
+                    self.descargas_de_imagenes.mostrar_avisos()
                     numero_de_la_obra_a_mostrar = input("Ingrese el numero una obra para mostrar sus detalles o el numero 0 para salir: ")
                     while not es_numero(numero_de_la_obra_a_mostrar):
                         print(" ")
@@ -600,18 +800,14 @@ class MetroArt:
                         print(" ")
                         numero_de_la_obra_a_mostrar = input("Ingrese el numero una obra para mostrar sus detalles o el numero 0 para salir: ")
 
-                    # Si decide salir 
+                    # Si decide salir, las imágenes adelantadas que no pidió ya no hacen falta
                     if numero_de_la_obra_a_mostrar == '0': 
+                        self.descargas_de_imagenes.cancelar_todas()
                         break
                     
                     #Verifico que el id pertenece a una obra. Si no sale busco su elección
-                    obra_encontrada = False
-                    obra_a_mostrar = " "
-                    for obra in self.obras:
-                        if obra.numero == int(numero_de_la_obra_a_mostrar):
-                            obra_encontrada = True
-                            obra_a_mostrar = obra
-                            break
+                    obra_a_mostrar = self.obras.obtener(int(numero_de_la_obra_a_mostrar))
+                    obra_encontrada = obra_a_mostrar is not None
                         
                     # Si no seleccionó un nombre valido de la lista
                     if obra_encontrada == False:
@@ -619,23 +815,90 @@ class MetroArt:
                         print("Número de obra no existente.")
                         continue
                     
+                    # Si antes no se pudieron leer sus detalles se intenta de nuevo
+                    obra_a_mostrar.hidratar()
+                    # La imagen se empieza a descargar por si el usuario la pide
+                    self.descargas_de_imagenes.adelantar(obra_a_mostrar.numero, obra_a_mostrar.imagen_de_la_obra)
                     print(obra_a_mostrar.mostrar_detalles_completos())
 
                     # Para mostrar la imagen
-                    api_url = obra_a_mostrar.imagen_de_la_obra
-                    titulo = obra_a_mostrar.titulo.replace(" ", "_")  # Reemplazo espacios por guiones bajos para el nombre del archivo
-
-                    self.mostrar_imagen(api_url,titulo)    
+                    self.mostrar_imagen(obra_a_mostrar)    
         else:
             print("No existen resultados para el nombre de autor ingresado")
 
+    def buscar_por_autor(self, nombre_autor, mostrar_progreso=True):
+        """ Metodo para buscar las obras de un autor por su nombre.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            nombre_autor (str): Nombre o parte del nombre del autor.
+            mostrar_progreso (bool): Si es True imprime el avance de la busqueda.
+        Retorna:
+            La lista de IDs de las obras del autor, que quedan guardadas en el catálogo
+        """
+        return [obra.numero for obra in self.iterar_por_autor(nombre_autor, mostrar_progreso)]
+
+    def iterar_por_autor(self, nombre_autor, mostrar_progreso=False):
+        """ Metodo para recorrer las obras de un autor a medida que se encuentran.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            nombre_autor (str): Nombre o parte del nombre del autor.
+            mostrar_progreso (bool): Si es True imprime el avance de la busqueda.
+            
+            Primero busca en el índice de autores, que acepta nombres sin acentos, el comienzo de
+            las palabras o un error de tipeo. Luego usa la busqueda de la API solo para completar:
+            las obras ya leídas se revisan con el índice y solo se descargan las desconocidas.
+        Retorna:
+            Un generador con las obras del autor, que se agregan al catálogo
+        """
+        ids_de_obras = self.indice_de_autores.buscar(nombre_autor)
+        coincidentes = set(ids_de_obras)
+        desconocidos = []
+        if mostrar_progreso:
+            print(f"{len(ids_de_obras)} obras encontradas en las obras conocidas.")
+
+        def es_del_autor(nombre_del_autor):
+            return nombre_autor.lower() in nombre_del_autor.lower() or self.indice_de_autores.coincide(nombre_del_autor, nombre_autor)
+
+        # Busco las obras por ese nombre de autor en la API
+        url = f"{self.url_api}/search?artistOrCulture=true&q={nombre_autor}"
+        datos = self.leer_busqueda(url)
+        if datos is None:
+            if mostrar_progreso:
+                print("La API no respondió, se muestran solo las obras conocidas.")
+        elif datos['objectIDs'] is not None:
+            for numero_de_obra in datos['objectIDs']:
+                nombre_del_autor = self.indice_de_autores.autor_de(numero_de_obra)
+                if nombre_del_autor is None:
+                    desconocidos.append(numero_de_obra)
+                elif numero_de_obra not in coincidentes and es_del_autor(nombre_del_autor):
+                    coincidentes.add(numero_de_obra)
+                    ids_de_obras.append(numero_de_obra)
+            if mostrar_progreso:
+                print(f"Revisando {len(desconocidos)} obras nuevas de la API:")
+
+        # Las obras conocidas por el índice pueden no estar en el catálogo de esta sesión
+        yield from self.iterar_obras(ids_de_obras)
+
+        def convertir(obra_respuesta):
+            #Verifico el nombre del autor
+            if not es_del_autor(obra_respuesta['artistDisplayName']):
+                return None
+            return self.convertir_respuesta(obra_respuesta)
+
+        for nueva_obra in self.motor.obtener_obras(desconocidos, convertir, mostrar_progreso):
+            #Lo agrego si no está guardada
+            self.obras.agregar(nueva_obra)
+            if nueva_obra.numero not in coincidentes:
+                coincidentes.add(nueva_obra.numero)
+                yield nueva_obra
+
     def busqueda_por_nombre_del_autor(self):
         """ Metodo para la funcionalidad de busqueda por nombre del autor.
         Atributos:
             self (MetroArt): Instancia de la clase MetroArt.
         
             Permite ingresar un nombre del autor para que el programa busque a las obras correspondientes
-            por coincidencia parcial con el nombre.
+            por coincidencia parcial con el nombre, sin importar acentos ni un error de tipeo.
             
             Si no hay ninguna coincidencia indica al usuario
         """        
@@ -659,127 +922,209 @@ class MetroArt:
             print(f"Buscando obras por {nombre_autor} ")
             print(' ')
             
-            # Busco las obras por ese nombre de autor en la API
-            url = f"https://collectionapi.metmuseum.org/public/collection/v1/search?artistOrCulture=true&q={nombre_autor}"
-            
-            datos = self.leer_api(url)
-            ids_de_obras = datos['objectIDs']        
-            
-            print("Recuperando obras desde la API. Espere por favor...") 
-            print(" ")
-            if ids_de_obras == None:
-                print("No existen resultados para el nombre de autor ingresado")
-                print(" ")
-                continue
-            
-            print(f"Filtrando de {len(ids_de_obras)} resultados.")
-            print('')     
-            print("Revisando obras:")
-            for numero_de_obra in ids_de_obras: 
-                print(f"    Obra numero {numero_de_obra}") 
-                url = f"https://collectionapi.metmuseum.org/public/collection/v1/objects/{numero_de_obra}"
-                
-                obra_respuesta = self.leer_api(url)
-                
-                if obra_respuesta is None:
-                    print("Obra no válida en la API. No almacenada.")
-                    continue
-                
-                numero = obra_respuesta['objectID']
-                
-                titulo = obra_respuesta['title'],
-                if titulo == " " or titulo == "":
-                    titulo = "No especificado"
-                if type(titulo) == tuple:
-                    titulo = titulo[0]
-                
-                nombre_del_autor = obra_respuesta['artistDisplayName'],
-                if type(nombre_del_autor) == str:
-                    nombre_del_autor = nombre_del_autor.replace("(","").replace(")","").replace(",","")
-                if nombre_del_autor == " " or nombre_del_autor == "":
-                    nombre_del_autor = "No especificado"
-                if type(nombre_del_autor) == tuple:
-                    nombre_del_autor = nombre_del_autor[0]
-                
-                nacionalidad_del_autor = obra_respuesta['artistNationality'],
-                if nacionalidad_del_autor == " " or nacionalidad_del_autor == "":
-                    nacionalidad_del_autor = "No especificada"
-                if type(nacionalidad_del_autor) == tuple:
-                    nacionalidad_del_autor = nacionalidad_del_autor[0]
-                
-                fecha_de_nacimiento = obra_respuesta['artistBeginDate'],
-                if fecha_de_nacimiento == " " or fecha_de_nacimiento == "":
-                    fecha_de_nacimiento = "No especificada"
-                if type(fecha_de_nacimiento) == tuple:
-                    fecha_de_nacimiento = fecha_de_nacimiento[0]
-                
-                fecha_de_muerte = obra_respuesta['artistEndDate'],
-                if fecha_de_muerte == " " or fecha_de_muerte == "":
-                    fecha_de_muerte = "No especificada"
-                if type(fecha_de_muerte) == tuple:
-                    fecha_de_muerte = fecha_de_muerte[0]
-                
-                tipo = obra_respuesta['classification'],
-                if tipo == " " or tipo == "":
-                    tipo = "No especificado"
-                if type(tipo) == tuple:
-                    tipo = tipo[0]
-                
-                año_de_creación = obra_respuesta['objectDate'],
-                if año_de_creación == " " or año_de_creación == "":
-                    año_de_creación = "No especificado"
-                if type(año_de_creación) == tuple:
-                    año_de_creación = año_de_creación[0]
-                
-                imagen_de_la_obra = obra_respuesta['primaryImage']
-                if type(imagen_de_la_obra) == tuple:
-                    imagen_de_la_obra = imagen_de_la_obra[0]
-                    
-                nueva_obra = Obra(
-                    numero,
-                    titulo,
-                    nombre_del_autor,
-                    nacionalidad_del_autor,
-                    fecha_de_nacimiento,
-                    fecha_de_muerte,
-                    tipo,
-                    año_de_creación,
-                    imagen_de_la_obra,
-                    )
-                
-                #Verifico que no este guardada
-                guardada = False
-                for obra in self.obras:
-                    if obra.numero == nueva_obra.numero:
-                        guardada = True
-                        
-                if not guardada:
-                    self.obras.append(nueva_obra)
-                    
-                #Verifico el nombre del autor
-                if nombre_autor.lower() not in nueva_obra.nombre_del_autor.lower():
-                    ids_de_obras.remove(nueva_obra.numero)
-            print(len(ids_de_obras))
+            ids_de_obras = self.buscar_por_autor(nombre_autor)
             if len(ids_de_obras)>0:
                 self.submenu_obras_por_nombre(nombre_autor,ids_de_obras)
             else:
                 print("No existen resultados para el nombre de autor ingresado")
     
-    def menu(self):
+    def buscar_combinada(self, departamento=None, nacionalidad=None, autor=None, clasificacion=None, con_imagen=False):
+        """ Metodo para buscar las obras conocidas que cumplen varias restricciones a la vez.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            departamento (str): Nombre del departamento, por ejemplo "European Paintings".
+            nacionalidad (str): Nacionalidad del autor.
+            autor (str): Nombre o parte del nombre del autor, con las reglas del índice de autores.
+            clasificacion (str): Clasificación de la obra (el tipo), por ejemplo "Paintings".
+            con_imagen (bool): Si es True solo las obras que tienen imagen.
+
+            Las restricciones que son None, vacías o False no se usan. No consulta la API: intersecta
+            los conjuntos de los índices locales, que tienen las obras leídas en esta sesión,
+            las del cache de disco y las de un volcado.
+        Retorna:
+            La lista ordenada de IDs de las obras encontradas, vacía si no se indicó ninguna restricción
+        """
+        restricciones = {}
+        if departamento:
+            restricciones["departamento"] = departamento
+        if clasificacion:
+            restricciones["clasificacion"] = clasificacion
+        if con_imagen:
+            restricciones["imagen"] = True
+        otros_conjuntos = []
+        if nacionalidad:
+            otros_conjuntos.append(self.indice_de_nacionalidades.conjunto_de(nacionalidad))
+        if autor:
+            otros_conjuntos.append(set(self.indice_de_autores.buscar(autor)))
+        with instrumentacion.medir("busqueda_combinada"):
+            return sorted(self.indice_de_facetas.intersectar(restricciones, otros_conjuntos))
+
+    def submenu_obras_combinadas(self, descripcion, ids_de_obras):
+        """ Metodo para mostrar las obras de una busqueda combinada.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            descripcion (str): Restricciones usadas, para el titulo.
+            ids_de_obras (list): IDs de las obras a mostrar.
+
+            Muestra las obras por páginas, dando la opcion de ver mas detalles de cada una.
+        """
+        # Las obras conocidas por los índices pueden no estar en el catálogo de esta sesión,
+        # el listado las trae a medida que se muestran
+        self.listar_por_paginas(descripcion, ids_de_obras, "listado.combinada")
+
+    def busqueda_combinada(self):
+        """ Metodo para la funcionalidad de busqueda combinada.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+
+            Pide departamento, nacionalidad, autor, clasificación y si debe tener imagen; cada una
+            se puede dejar vacía. Busca solo entre las obras conocidas (ver buscar_combinada),
+            por ejemplo las obras holandesas de European Paintings de tipo Paintings con imagen.
+        """
+        print("---------- Busqueda combinada ----------")
+        print('')
+        print(f"Se busca entre las {len(self.indice_de_facetas)} obras conocidas. Deje vacía una opción para no usarla.")
+        print('')
+        for departamento in self.departamentos:
+            print(f"Departamento #{departamento['departmentId']}: {departamento['displayName']}")
+        print('')
+        nombres_de_departamentos = {str(departamento['departmentId']): departamento['displayName'] for departamento in self.departamentos}
+        numero_del_departamento = input("Numero del departamento: ").strip()
+        while numero_del_departamento != "" and numero_del_departamento not in nombres_de_departamentos:
+            print(" ")
+            print("Intente de nuevo.")
+            print(" ")
+            numero_del_departamento = input("Numero del departamento: ").strip()
+        departamento = nombres_de_departamentos.get(numero_del_departamento)
+        nacionalidad = input("Nacionalidad del autor (por ejemplo Dutch): ").strip()
+        autor = input("Nombre del autor: ").strip()
+        clasificaciones = [valor for valor, cantidad in self.indice_de_facetas.valores("clasificacion")[:10] if valor]
+        if clasificaciones:
+            print(f"Clasificaciones más comunes: {', '.join(clasificaciones)}")
+        clasificacion = input("Clasificación (por ejemplo Paintings): ").strip()
+        con_imagen = input('¿Solo obras con imagen? Ingrese "y" si lo desea: ').strip().lower() == "y"
+
+        restricciones = []
+        if departamento:
+            restricciones.append(f"Departamento {departamento}")
+        if nacionalidad:
+            restricciones.append(f"Nacionalidad {nacionalidad}")
+        if autor:
+            restricciones.append(f"Autor {autor}")
+        if clasificacion:
+            restricciones.append(f"Clasificación {clasificacion}")
+        if con_imagen:
+            restricciones.append("Con imagen")
+        if not restricciones:
+            print(" ")
+            print("No se indicó ninguna restricción.")
+            return
+
+        ids_de_obras = self.buscar_combinada(departamento, nacionalidad, autor, clasificacion, con_imagen)
+        print(" ")
+        print(f"{len(ids_de_obras)} obras encontradas.")
+        if len(ids_de_obras) > 0:
+            self.submenu_obras_combinadas(", ".join(restricciones), ids_de_obras)
+        else:
+            print("No existen resultados para la combinación ingresada")
+
+    def buscar_por_fechas(self, creada_desde=None, creada_hasta=None, autor_vivo_en=None):
+        """ Metodo para buscar las obras conocidas por fecha de creación o por los años de vida de su autor.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+            creada_desde (int): Primer año del rango de creación, negativo antes de Cristo.
+            creada_hasta (int): Último año del rango de creación.
+            autor_vivo_en (int): Año en que el autor tenía que estar vivo.
+
+            Las restricciones que son None no se usan; si solo se indica un extremo del rango el
+            otro queda abierto. Una obra entra en el rango si su fecha (que puede ser aproximada,
+            como "ca. 1650–60") se cruza con él. No consulta la API.
+        Retorna:
+            La lista de IDs ordenada por año de creación, o por año de nacimiento del autor
+            si solo se busca por autor_vivo_en
+        """
+        ids_de_obras = None
+        with instrumentacion.medir("busqueda_por_fechas"):
+            if creada_desde is not None or creada_hasta is not None:
+                desde = creada_desde if creada_desde is not None else -AÑO_DE_AUTOR_VIVO
+                hasta = creada_hasta if creada_hasta is not None else AÑO_DE_AUTOR_VIVO
+                ids_de_obras = self.indice_de_creacion.buscar(desde, hasta)
+            if autor_vivo_en is not None:
+                vivos = self.indice_de_vida_de_autores.buscar(autor_vivo_en, autor_vivo_en)
+                if ids_de_obras is None:
+                    ids_de_obras = vivos
+                else:
+                    vivos = set(vivos)
+                    ids_de_obras = [numero_de_obra for numero_de_obra in ids_de_obras if numero_de_obra in vivos]
+        return ids_de_obras if ids_de_obras is not None else []
+
+    def busqueda_por_fechas(self):
+        """ Metodo para la funcionalidad de busqueda por fechas.
+        Atributos:
+            self (MetroArt): Instancia de la clase MetroArt.
+
+            Pide un rango de años de creación y un año en que el autor estaba vivo; cada uno se puede
+            dejar vacío. Busca solo entre las obras conocidas (ver buscar_por_fechas) y las muestra
+            de la más antigua a la más nueva.
+        """
+        print("---------- Busqueda por fechas ----------")
+        print('')
+        print(f"Se busca entre las {len(self.indice_de_creacion)} obras conocidas con fecha. Deje vacía una opción para no usarla.")
+        print("Los años antes de Cristo se ingresan negativos, por ejemplo -500.")
+        print('')
+        años = []
+        for mensaje in ("Creada desde el año: ", "Creada hasta el año: ", "Autor vivo en el año: "):
+            año = input(mensaje).strip()
+            while año != "" and not es_numero(año):
+                print(" ")
+                print("Intente de nuevo.")
+                print(" ")
+                año = input(mensaje).strip()
+            años.append(int(año) if año != "" else None)
+        creada_desde, creada_hasta, autor_vivo_en = años
+
+        restricciones = []
+        if creada_desde is not None or creada_hasta is not None:
+            restricciones.append(f"Creadas entre {creada_desde if creada_desde is not None else '...'} y {creada_hasta if creada_hasta is not None else '...'}")
+        if autor_vivo_en is not None:
+            restricciones.append(f"Autor vivo en {autor_vivo_en}")
+        if not restricciones:
+            print(" ")
+            print("No se indicó ninguna fecha.")
+            return
+
+        ids_de_obras = self.buscar_por_fechas(creada_desde, creada_hasta, autor_vivo_en)
+        print(" ")
+        print(f"{len(ids_de_obras)} obras encontradas.")
+        if len(ids_de_obras) > 0:
+            self.submenu_obras_combinadas(", ".join(restricciones), ids_de_obras)
+        else:
+            print("No existen resultados para las fechas ingresadas")
+
+    def menu(self, en_segundo_plano=()):
         """ Metodo para imprimir el menu principal del sistema
         Atributos:
             self (MetroArt): Instancia de la clase MetroArt.
+            en_segundo_plano (list): Funciones a ejecutar en hilos aparte mientras se usa el menú.
+
+            Los hilos se lanzan un momento después de mostrar el menú: si no, compiten con el
+            arranque, por ejemplo importando requests, y el menú tarda más en aparecer.
         """
+        for tarea in en_segundo_plano:
+            hilo = threading.Timer(ESPERA_PARA_SEGUNDO_PLANO, tarea)
+            hilo.daemon = True
+            hilo.start()
         while True:
             print(" ")
             print("---------- Sistema de catálogo de la colección de arte ----------")
             print(" ")
-            elegida = imprimir_menu("Busqueda por departamento","Busqueda por nacionalidad del autor","Busqueda por nombre del autor")
+            self.descargas_de_imagenes.mostrar_avisos()
+            elegida = imprimir_menu("Busqueda por departamento","Busqueda por nacionalidad del autor","Busqueda por nombre del autor","Busqueda combinada","Busqueda por fechas")
             while not es_numero(elegida):
                 print(" ")
                 print("Intente de nuevo.")
                 print(" ")
-                elegida = imprimir_menu("Busqueda por departamento","Busqueda por nacionalidad del autor","Busqueda por nombre del autor")
+                elegida = imprimir_menu("Busqueda por departamento","Busqueda por nacionalidad del autor","Busqueda por nombre del autor","Busqueda combinada","Busqueda por fechas")
                 
             # por departamento
             if elegida == '1':
@@ -796,7 +1141,17 @@ class MetroArt:
                 print(" ")
                 self.busqueda_por_nombre_del_autor()
             
+            # combinando varias restricciones
             elif elegida == '4':
+                print(" ")
+                self.busqueda_combinada()
+
+            # por fecha de creación o años de vida del autor
+            elif elegida == '5':
+                print(" ")
+                self.busqueda_por_fechas()
+
+            elif elegida == '6':
                 break
             
             else:
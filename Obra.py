@@ -1,4 +1,46 @@
+import sys
+
+CAMPOS_DE_DETALLE = (
+    "nacionalidad_del_autor",
+    "fecha_de_nacimiento",
+    "fecha_de_muerte",
+    "tipo",
+    "año_de_creación",
+    "imagen_de_la_obra",
+)
+
+# Valores de los detalles mientras no se consigue la obra completa.
+# La imagen queda vacía, así se trata como una obra sin imagen y no se intenta descargar.
+NO_DISPONIBLES = {campo: "No disponible" for campo in CAMPOS_DE_DETALLE}
+NO_DISPONIBLES["imagen_de_la_obra"] = ""
+
+def internar(valor):
+    """ Función para compartir en memoria los textos que se repiten mucho entre obras
+        (nacionalidades, tipos, fechas, "No especificado", nombres de autores).
+    Atributos:
+        valor (str): Texto a internar.
+    Retorna:
+        La copia única del texto, o el mismo valor si no es un texto
+    """
+    if type(valor) == str:
+        return sys.intern(valor)
+    return valor
+
 class Obra:
+    # Sin __dict__ por instancia: cada obra ocupa mucha menos memoria en catálogos grandes
+    __slots__ = (
+        "numero",
+        "titulo",
+        "nombre_del_autor",
+        "nacionalidad_del_autor",
+        "fecha_de_nacimiento",
+        "fecha_de_muerte",
+        "tipo",
+        "año_de_creación",
+        "imagen_de_la_obra",
+        "_hidratador",
+    )
+
     def __init__(self, numero, titulo, nombre_del_autor, nacionalidad_del_autor, fecha_de_nacimiento, fecha_de_muerte, tipo, año_de_creación, imagen_de_la_obra):
         """ Metodo constructor de la clase obra
         Atributos:
@@ -14,14 +56,71 @@ class Obra:
         """        
         self.numero = numero
         self.titulo = titulo
-        self.nombre_del_autor = nombre_del_autor
-        self.nacionalidad_del_autor = nacionalidad_del_autor
-        self.fecha_de_nacimiento = fecha_de_nacimiento
-        self.fecha_de_muerte = fecha_de_muerte
-        self.tipo = tipo
-        self.año_de_creación = año_de_creación
+        self.nombre_del_autor = internar(nombre_del_autor)
+        self.nacionalidad_del_autor = internar(nacionalidad_del_autor)
+        self.fecha_de_nacimiento = internar(fecha_de_nacimiento)
+        self.fecha_de_muerte = internar(fecha_de_muerte)
+        self.tipo = internar(tipo)
+        self.año_de_creación = internar(año_de_creación)
         self.imagen_de_la_obra = imagen_de_la_obra
+        self._hidratador = None
         
+    @classmethod
+    def para_listado(cls, numero, titulo, nombre_del_autor, hidratador):
+        """ Metodo para crear una obra perezosa que solo guarda los datos del listado.
+        Atributos:
+            numero (int): Numero de la obra.
+            titulo (str): Titulo de la obra.
+            nombre_del_autor (str): Nombre del autor.
+            hidratador (function): Función que recibe el numero de la obra y retorna la obra completa.
+            
+            El resto de los datos se buscan con el hidratador la primera vez que se usan.
+        Retorna:
+            La obra sin hidratar
+        """
+        obra = cls.__new__(cls)
+        obra.numero = numero
+        obra.titulo = titulo
+        obra.nombre_del_autor = internar(nombre_del_autor)
+        obra._hidratador = hidratador
+        return obra
+
+    def __getattr__(self, nombre):
+        # Solo se llama cuando el atributo no existe, es decir en una obra sin hidratar
+        if nombre in CAMPOS_DE_DETALLE and self._hidratador is not None:
+            self.hidratar()
+            return getattr(self, nombre)
+        raise AttributeError(nombre)
+
+    def esta_hidratada(self):
+        " Metodo para saber si la obra ya tiene todos sus datos"
+        return self._hidratador is None
+
+    def hidratar(self, obra_completa=None):
+        """ Metodo para completar los datos de una obra perezosa.
+        Atributos:
+            obra_completa (Obra): Obra con todos los datos. Si es None se busca con el hidratador.
+            
+            Si no se consigue la obra completa los datos quedan como "No disponible" (la imagen
+            vacía), pero la obra sigue sin hidratar: la próxima llamada lo intenta de nuevo.
+        """
+        # Se lee una sola vez: otro hilo (hidratar_lote) puede terminar de hidratarla mientras tanto
+        hidratador = self._hidratador
+        if hidratador is None:
+            return
+        if obra_completa is None:
+            obra_completa = hidratador(self.numero)
+        if obra_completa is None:
+            if self._hidratador is None:
+                # Mientras tanto la hidrató otro hilo
+                return
+            for campo, valor in NO_DISPONIBLES.items():
+                setattr(self, campo, valor)
+            return
+        for campo in CAMPOS_DE_DETALLE:
+            setattr(self, campo, getattr(obra_completa, campo))
+        self._hidratador = None
+
     def mostrar_para_listado(self):
         " Metodo para mostrar datos de la obra para el listado"
         
@@ -0,0 +1,134 @@
+""" Benchmark del arranque del menú.
+
+Cada arranque se mide en un proceso nuevo, contra la API simulada de benchmarks.servidor_simulado
+con una latencia parecida a la del museo, desde que se lanza el proceso hasta que el menú pide
+la primera opción:
+    primera vez:       sin departamentos guardados, se espera a la API.
+    con cache:         los departamentos de la sesión anterior se usan enseguida y se
+                       actualizan en segundo plano.
+    sin conexión:      --sin-conexion con los departamentos guardados.
+También muestra el perfil de importación de main (python -X importtime): los módulos que más
+tardan y si requests o Pillow se importaron antes del menú.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.arranque [--latencia 0.3] [--repeticiones 5]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CARPETA_DEL_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NACIONALIDADES = "CH_Nationality_List_20171130_v1.csv"
+
+
+def hasta_el_menu(carpeta, url, lanzado, argumentos_de_main):
+    """ Función que arranca main como lo haría el usuario y sale en cuanto aparece el menú.
+        Se ejecuta en un proceso aparte; escribe las mediciones como JSON.
+    """
+    import builtins
+    import contextlib
+    import io
+
+    mediciones = {}
+    inicio = time.perf_counter()
+    import main
+    mediciones["importar_main"] = time.perf_counter() - inicio
+    from MetroArt import MetroArt
+
+    class MetroArtSimulado(MetroArt):
+        def __init__(self, *argumentos, **opciones):
+            super().__init__(*argumentos, url_api=url, **opciones)
+
+    def entrada(mensaje=""):
+        if "menu" not in mediciones:
+            mediciones["menu"] = time.time() - lanzado
+            mediciones["importados"] = [modulo for modulo in ("requests", "PIL") if modulo in sys.modules]
+        return "6"
+
+    main.MetroArt = MetroArtSimulado
+    builtins.input = entrada
+    sys.argv = ["main.py"] + argumentos_de_main
+    os.chdir(carpeta)
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.main()
+    print(json.dumps(mediciones))
+
+
+def _arrancar(carpeta, url, argumentos_de_main):
+    lanzado = time.time()
+    salida = subprocess.run([sys.executable, "-m", "benchmarks.arranque", "--hasta-el-menu", carpeta, url, str(lanzado)]
+                            + argumentos_de_main, cwd=CARPETA_DEL_PROYECTO, check=True, capture_output=True, text=True).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def perfil_de_importacion(cantidad=8):
+    """ Función que mide con -X importtime lo que tarda importar main.
+    Retorna:
+        El total en segundos y una lista de (segundos acumulados, módulo) de los módulos
+        importados directamente por main o por sus módulos, de más lento a más rápido
+    """
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                               cwd=CARPETA_DEL_PROYECTO, check=True, capture_output=True, text=True)
+    modulos = []
+    total = 0
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea.split("|")
+        nivel = (len(nombre) - len(nombre.lstrip())) // 2
+        if nivel == 0 and nombre.strip() == "main":
+            total = int(acumulado) / 1e6
+            break
+        if nivel == 0:
+            # Lo que importó el intérprete al iniciar (site), los módulos de main vienen justo antes de main
+            modulos = []
+        elif nivel <= 2:
+            modulos.append((int(acumulado) / 1e6, nombre.strip()))
+    modulos.sort(reverse=True)
+    return total, modulos[:cantidad]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latencia", type=float, default=0.3, help="Segundos que tarda cada respuesta de la API simulada")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--hasta-el-menu", nargs=3, metavar=("CARPETA", "URL", "LANZADO"), help=argparse.SUPPRESS)
+    argumentos, argumentos_de_main = parser.parse_known_args()
+    if argumentos.hasta_el_menu:
+        carpeta, url, lanzado = argumentos.hasta_el_menu
+        hasta_el_menu(carpeta, url, float(lanzado), argumentos_de_main)
+        return
+
+    from benchmarks.servidor_simulado import ServidorSimulado, generar_obras
+
+    total, modulos = perfil_de_importacion()
+    print(f"Importar main: {total * 1000:.0f} ms. Módulos más lentos (acumulado):")
+    for segundos, nombre in modulos:
+        print(f"    {nombre:32} {segundos * 1000:6.1f} ms")
+
+    with ServidorSimulado(generar_obras(100), latencia=argumentos.latencia) as servidor:
+        print(f"\nHasta el menú, API simulada con {argumentos.latencia * 1000:.0f} ms por respuesta "
+              f"(mediana de {argumentos.repeticiones}):")
+        print(f"    {'Arranque':14} {'Menú':>9} {'Importar main':>14}  Importados antes del menú")
+        casos = {"primera vez": [], "con cache": [], "sin conexión": []}
+        for _ in range(argumentos.repeticiones):
+            with tempfile.TemporaryDirectory() as carpeta:
+                shutil.copy(os.path.join(CARPETA_DEL_PROYECTO, NACIONALIDADES), carpeta)
+                casos["primera vez"].append(_arrancar(carpeta, servidor.url, []))
+                casos["con cache"].append(_arrancar(carpeta, servidor.url, []))
+                casos["sin conexión"].append(_arrancar(carpeta, servidor.url, ["--sin-conexion"]))
+        for nombre, mediciones in casos.items():
+            menu = statistics.median(medicion["menu"] for medicion in mediciones)
+            importar = statistics.median(medicion["importar_main"] for medicion in mediciones)
+            importados = ", ".join(mediciones[-1]["importados"]) or "ninguno"
+            print(f"    {nombre:14} {menu * 1000:6.0f} ms {importar * 1000:11.0f} ms  {importados}")
+
+
+if __name__ == "__main__":
+    main()
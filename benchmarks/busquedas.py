@@ -0,0 +1,185 @@
+""" Benchmark de las busquedas contra la API simulada.
+
+Levanta benchmarks.servidor_simulado y ejecuta sin intervención del usuario las busquedas
+por departamento, nacionalidad y autor con distintas cantidades de trabajadores. Reporta tiempo,
+obras por segundo, latencias p50/p95, peticiones hechas y memoria máxima. Al final compara
+la lista de obras original (recorrido completo para evitar duplicados) con el Catalogo, y una
+busqueda combinada recorriendo todas las obras con la intersección de los índices locales,
+y una busqueda por fechas leyendo las fechas de todas las obras con el índice de intervalos.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.busquedas [--obras 3000] [--latencia 0.02] [--errores 0.0]
+                                   [--tasa-429 0.0] [--trabajadores 1,4,8,16]
+                                   [--obras-combinada 100000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from MetroArt import MetroArt
+from Obra import Obra
+from benchmarks.servidor_simulado import ServidorSimulado, generar_obras
+from cache_de_objetos import CacheDeObjetos
+from catalogo import Catalogo
+from fechas import años_de_creacion, años_de_vida
+
+
+def crear_museo(servidor, trabajadores, cache=None):
+    museo = MetroArt(trabajadores=trabajadores, peticiones_por_segundo=0, cache=cache, url_api=servidor.url)
+    museo.cliente.espera_base = 0.05
+    return museo
+
+
+def medir(nombre, servidor, museo, busqueda):
+    """ Función que ejecuta una busqueda y muestra sus números.
+    Atributos:
+        nombre (str): Nombre del caso.
+        servidor (ServidorSimulado): Servidor contra el que se ejecuta.
+        museo (MetroArt): Museo que hace la busqueda.
+        busqueda (function): Función sin argumentos que hace la busqueda y retorna la cantidad de obras.
+    """
+    peticiones_antes = servidor.total_de_peticiones()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    cantidad = busqueda()
+    duracion = time.perf_counter() - inicio
+    memoria_maxima = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    estadisticas = museo.cliente.estadisticas()
+    peticiones = servidor.total_de_peticiones() - peticiones_antes
+    p50 = estadisticas.get("latencia_p50_ms", 0)
+    p95 = estadisticas.get("latencia_p95_ms", 0)
+    print(f"    {nombre:38} {cantidad:6} obras {duracion:7.2f} s {cantidad / duracion if duracion else 0:8.0f} obras/s"
+          f"  p50 {p50:5.0f} ms  p95 {p95:5.0f} ms  {peticiones:6} peticiones"
+          f"  {estadisticas['reintentos']:4} reintentos  {memoria_maxima / 1024 / 1024:6.1f} MB")
+
+
+def por_departamento(museo, numero_del_departamento):
+    ids_de_obras = museo.buscar_ids_por_departamento(numero_del_departamento) or []
+    return sum(1 for obra in museo.iterar_obras(ids_de_obras))
+
+
+def comparar_catalogo(cantidad):
+    """ Función que compara agregar obras sin duplicados a una lista (como antes) y al Catalogo.
+    """
+    obras = [Obra(numero, "Titulo", "Autor", "", "", "", "", "", "") for numero in range(cantidad)]
+    print(f"Agregar {cantidad} obras evitando duplicados:")
+
+    inicio = time.perf_counter()
+    lista = []
+    for nueva_obra in obras:
+        guardada = False
+        for obra in lista:
+            if obra.numero == nueva_obra.numero:
+                guardada = True
+        if not guardada:
+            lista.append(nueva_obra)
+    print(f"    {'Lista con recorrido completo':38} {time.perf_counter() - inicio:7.3f} s")
+
+    inicio = time.perf_counter()
+    catalogo = Catalogo()
+    for nueva_obra in obras:
+        catalogo.agregar(nueva_obra)
+    print(f"    {'Catalogo':38} {time.perf_counter() - inicio:7.3f} s")
+
+
+def comparar_busqueda_combinada(cantidad, repeticiones=20):
+    """ Función que compara una busqueda de varias restricciones recorriendo todas las obras
+        con la intersección de los índices de MetroArt.buscar_combinada.
+    """
+    obras = list(generar_obras(cantidad).values())
+    museo = MetroArt(peticiones_por_segundo=0)
+    museo.sin_conexion = True
+    for obra_respuesta in obras:
+        museo.registrar_respuesta(obra_respuesta)
+    print(f"Busqueda combinada (Dutch, Drawings and Prints, Paintings, con imagen) entre {cantidad} obras:")
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        recorrido = sorted(obra["objectID"] for obra in obras
+                           if obra["artistNationality"] == "Dutch" and obra["department"] == "Drawings and Prints"
+                           and obra["classification"] == "Paintings" and obra["primaryImage"])
+    print(f"    {'Recorrido de todas las obras':38} {1000 * (time.perf_counter() - inicio) / repeticiones:7.2f} ms")
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        interseccion = museo.buscar_combinada("Drawings and Prints", "Dutch", None, "Paintings", True)
+    print(f"    {'Intersección de índices':38} {1000 * (time.perf_counter() - inicio) / repeticiones:7.2f} ms"
+          f"  {len(interseccion)} obras{'' if interseccion == recorrido else '  (DISTINTAS)'}")
+
+
+def comparar_busqueda_por_fechas(cantidad, repeticiones=20):
+    """ Función que compara buscar las obras creadas entre 1600 y 1700 de autores vivos en 1650
+        leyendo las fechas de todas las obras con los índices de MetroArt.buscar_por_fechas.
+    """
+    obras = list(generar_obras(cantidad).values())
+    museo = MetroArt(peticiones_por_segundo=0)
+    museo.sin_conexion = True
+    inicio = time.perf_counter()
+    for obra_respuesta in obras:
+        museo.registrar_respuesta(obra_respuesta)
+    print(f"Busqueda por fechas (creadas 1600-1700, autor vivo en 1650) entre {cantidad} obras:")
+    print(f"    {'Indexar (todas las busquedas)':38} {time.perf_counter() - inicio:7.2f} s")
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        recorrido = []
+        for obra in obras:
+            creacion = años_de_creacion(obra)
+            vida = años_de_vida(obra)
+            if creacion and vida and creacion[0] <= 1700 and creacion[1] >= 1600 and vida[0] <= 1650 <= vida[1]:
+                recorrido.append(obra["objectID"])
+    print(f"    {'Recorrido de todas las obras':38} {1000 * (time.perf_counter() - inicio) / repeticiones:7.2f} ms")
+
+    inicio = time.perf_counter()
+    museo.buscar_por_fechas(1600, 1700, 1650)
+    print(f"    {'Índice, primera (ordena los arreglos)':38} {1000 * (time.perf_counter() - inicio):7.2f} ms")
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        encontradas = museo.buscar_por_fechas(1600, 1700, 1650)
+    print(f"    {'Índice, siguientes':38} {1000 * (time.perf_counter() - inicio) / repeticiones:7.2f} ms"
+          f"  {len(encontradas)} obras{'' if sorted(encontradas) == sorted(recorrido) else '  (DISTINTAS)'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--obras", type=int, default=3000)
+    parser.add_argument("--latencia", type=float, default=0.02)
+    parser.add_argument("--errores", type=float, default=0.0)
+    parser.add_argument("--tasa-429", type=float, default=0.0)
+    parser.add_argument("--trabajadores", default="1,4,8,16")
+    parser.add_argument("--obras-combinada", type=int, default=100000)
+    argumentos = parser.parse_args()
+
+    obras = generar_obras(argumentos.obras)
+    with ServidorSimulado(obras, argumentos.latencia, argumentos.errores, argumentos.tasa_429) as servidor:
+        print(f"API simulada con {len(obras)} obras, latencia {argumentos.latencia * 1000:.0f} ms, "
+              f"errores {argumentos.errores:.0%}, 429 {argumentos.tasa_429:.0%}")
+        for trabajadores in [int(valor) for valor in argumentos.trabajadores.split(",")]:
+            print(f"Con {trabajadores} trabajadores:")
+            museo = crear_museo(servidor, trabajadores)
+            medir("Departamento 11 (European Paintings)", servidor, museo, lambda: por_departamento(museo, 11))
+            museo = crear_museo(servidor, trabajadores)
+            medir("Nacionalidad Dutch", servidor, museo, lambda: len(museo.buscar_por_nacionalidad("Dutch", mostrar_progreso=False)))
+            museo = crear_museo(servidor, trabajadores)
+            medir("Autor 'Apellido7'", servidor, museo, lambda: len(museo.buscar_por_autor("Apellido7", mostrar_progreso=False)))
+
+        with tempfile.TemporaryDirectory() as carpeta:
+            cache = CacheDeObjetos(os.path.join(carpeta, "cache.sqlite3"))
+            print("Con cache de disco (8 trabajadores):")
+            museo = crear_museo(servidor, 8, cache)
+            medir("Departamento 11, cache frío", servidor, museo, lambda: por_departamento(museo, 11))
+            museo = crear_museo(servidor, 8, cache)
+            medir("Departamento 11, cache caliente", servidor, museo, lambda: por_departamento(museo, 11))
+            cache.cerrar()
+
+    comparar_catalogo(min(argumentos.obras, 5000))
+    comparar_busqueda_combinada(argumentos.obras_combinada)
+    comparar_busqueda_por_fechas(argumentos.obras_combinada)
+
+
+if __name__ == "__main__":
+    main()
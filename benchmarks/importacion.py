@@ -0,0 +1,51 @@
+""" Benchmark de la importación de un volcado con distintas cantidades de procesos.
+
+Genera un volcado JSONL con las obras de benchmarks.servidor_simulado y lo importa con
+importacion.importar_volcado usando 1, 2, 4... procesos. Muestra obras por segundo de la
+preparación sola (lo que se reparte entre los procesos: interpretar el JSON, normalizar y
+calcular los datos de los índices) y de la importación completa, que además llena el catálogo
+y los índices en el proceso principal.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.importacion [--obras 100000] [--procesos 1,2,4,8]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from MetroArt import MetroArt
+from benchmarks.servidor_simulado import generar_obras
+from importacion import importar_volcado, preparar_volcado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--obras", type=int, default=100000)
+    parser.add_argument("--procesos", default=",".join(str(procesos) for procesos in (1, 2, 4, 8) if procesos <= max(2, os.cpu_count() or 1)))
+    argumentos = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "volcado.jsonl")
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            for obra_respuesta in generar_obras(argumentos.obras).values():
+                archivo.write(json.dumps(obra_respuesta) + "\n")
+        print(f"Volcado JSONL de {argumentos.obras} obras, {os.cpu_count()} núcleos:")
+        print(f"    {'Procesos':10} {'Preparación':>16} {'Importación completa':>22}")
+        for procesos in [int(valor) for valor in argumentos.procesos.split(",")]:
+            inicio = time.perf_counter()
+            for preparadas in preparar_volcado(ruta, procesos):
+                pass
+            preparacion = time.perf_counter() - inicio
+
+            museo = MetroArt(peticiones_por_segundo=0)
+            museo.sin_conexion = True
+            inicio = time.perf_counter()
+            importadas = importar_volcado(museo, ruta, mostrar_progreso=False, procesos=procesos)
+            importacion = time.perf_counter() - inicio
+            print(f"    {procesos:<10} {argumentos.obras / preparacion:10.0f} obras/s {importadas / importacion:14.0f} obras/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+""" Benchmark del arranque desde una instantánea del catálogo contra reconstruirlo.
+
+Genera un volcado JSONL con las obras de benchmarks.servidor_simulado, lo importa una vez y
+guarda la instantánea. Después, cada forma de arrancar se mide en un proceso nuevo, como
+al abrir el programa:
+    reconstruir: importar el volcado completo (catálogo e índices), como con --volcado.
+    instantanea: abrir la instantánea mapeada en memoria; el catálogo se usa enseguida y los
+                 índices se llenan después, como hace el menú en un hilo aparte.
+Para cada una muestra el tiempo hasta poder usar el catálogo, la primera busqueda de una obra,
+la memoria residente máxima (RSS) en ese momento y, para la instantánea, lo que tardan y
+ocupan los índices al terminar de llenarse.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.instantanea [--obras 100000] [--procesos 1]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _memoria_maxima():
+    """ Función que retorna la memoria residente máxima del proceso en MB, o None si no se puede medir.
+        En Linux se lee VmHWM, porque ru_maxrss incluye la memoria del proceso que lanzó a este.
+    """
+    try:
+        with open("/proc/self/status") as estado:
+            for linea in estado:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    memoria = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS la da en bytes
+    return memoria / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def medir(modo, ruta, procesos, numero_de_obra):
+    """ Función que arranca el catálogo de una forma y escribe las mediciones como JSON.
+        Se ejecuta en un proceso aparte para que cada forma empiece sin nada cargado.
+    """
+    inicio = time.perf_counter()
+    from MetroArt import MetroArt
+    from importacion import importar_volcado
+    from instantanea import abrir_instantanea, indexar_instantanea
+
+    museo = MetroArt(peticiones_por_segundo=0)
+    museo.sin_conexion = True
+    instantanea = None
+    if modo == "reconstruir":
+        importar_volcado(museo, ruta, mostrar_progreso=False, procesos=procesos)
+    else:
+        instantanea = abrir_instantanea(museo, ruta)
+    listo = time.perf_counter()
+    obra = museo.obras.obtener(numero_de_obra)
+    primera_obra = time.perf_counter() - listo
+    mediciones = {
+        "obras": len(museo.obras),
+        "arranque": listo - inicio,
+        "primera_obra": primera_obra,
+        "encontrada": obra is not None,
+        "memoria": _memoria_maxima(),
+    }
+    if instantanea is not None:
+        inicio = time.perf_counter()
+        indexar_instantanea(museo, instantanea)
+        mediciones["indices"] = time.perf_counter() - inicio
+        mediciones["memoria_con_indices"] = _memoria_maxima()
+    print(json.dumps(mediciones))
+
+
+def _en_otro_proceso(modo, ruta, procesos, numero_de_obra):
+    salida = subprocess.run([sys.executable, "-m", "benchmarks.instantanea", "--medir", modo, ruta,
+                             "--procesos", str(procesos), "--obra", str(numero_de_obra)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def _mb(valor):
+    return "n/d" if valor is None else f"{valor:.0f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--obras", type=int, default=100000)
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos para reconstruir desde el volcado")
+    parser.add_argument("--medir", nargs=2, metavar=("MODO", "RUTA"), help=argparse.SUPPRESS)
+    parser.add_argument("--obra", type=int, default=1, help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+    if argumentos.medir:
+        medir(*argumentos.medir, argumentos.procesos, argumentos.obra)
+        return
+
+    from MetroArt import MetroArt
+    from benchmarks.servidor_simulado import generar_obras
+    from importacion import importar_volcado
+    from instantanea import guardar_instantanea
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        volcado = os.path.join(carpeta, "volcado.jsonl")
+        obras = generar_obras(argumentos.obras)
+        with open(volcado, "w", encoding="utf-8") as archivo:
+            for obra_respuesta in obras.values():
+                archivo.write(json.dumps(obra_respuesta) + "\n")
+        numero_de_obra = list(obras)[len(obras) // 2]
+        del obras
+
+        museo = MetroArt(peticiones_por_segundo=0)
+        museo.sin_conexion = True
+        importar_volcado(museo, volcado, mostrar_progreso=False, procesos=argumentos.procesos)
+        ruta = os.path.join(carpeta, "catalogo.bin")
+        inicio = time.perf_counter()
+        guardar_instantanea(museo, ruta)
+        guardado = time.perf_counter() - inicio
+        del museo
+
+        print(f"{argumentos.obras} obras, volcado de {os.path.getsize(volcado) / 2**20:.0f} MB, "
+              f"instantánea de {os.path.getsize(ruta) / 2**20:.0f} MB (guardada en {guardado:.2f} s):")
+        print(f"    {'Arranque':12} {'Catálogo listo':>15} {'Primera obra':>14} {'RSS máximo':>12}")
+        reconstruir = _en_otro_proceso("reconstruir", volcado, argumentos.procesos, numero_de_obra)
+        instantanea = _en_otro_proceso("instantanea", ruta, argumentos.procesos, numero_de_obra)
+        for nombre, mediciones in (("reconstruir", reconstruir), ("instantanea", instantanea)):
+            print(f"    {nombre:12} {mediciones['arranque']:13.3f} s {mediciones['primera_obra'] * 1e6:10.0f} µs "
+                  f"{_mb(mediciones['memoria']):>12}")
+        print(f"    Catálogo listo {reconstruir['arranque'] / instantanea['arranque']:.0f} veces antes desde la instantánea.")
+        print(f"    Índices llenados desde la instantánea en segundo plano: {instantanea['indices']:.2f} s, "
+              f"RSS máximo después {_mb(instantanea['memoria_con_indices'])}.")
+
+
+if __name__ == "__main__":
+    main()
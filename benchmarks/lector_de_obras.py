@@ -0,0 +1,131 @@
+""" Benchmark del lector de obras contra la normalización anterior de MetroArt.crear_obra.
+
+Crea obras a partir de respuestas de la API simuladas (con campos en blanco y null) con la
+cadena de comparaciones anterior y con lector_de_obras, completas y para el listado
+(modo perezoso), y muestra el mejor de tres costos por obra de cada forma.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.lector_de_obras [cantidad_de_obras]
+"""
+import gc
+import sys
+import time
+
+from Obra import Obra
+from benchmarks.servidor_simulado import generar_obras
+from lector_de_obras import crear_obra, crear_obra_para_listado, crear_obras, leer_columnas
+
+
+def crear_obra_anterior(obra_respuesta):
+    """ Copia de MetroArt.crear_obra antes del lector de obras, para comparar.
+    """
+    numero = obra_respuesta['objectID']
+    
+    titulo = obra_respuesta['title'],
+    if titulo == " " or titulo == "":
+        titulo = "No especificado"
+    if type(titulo) == tuple:
+        titulo = titulo[0]
+    
+    nombre_del_autor = obra_respuesta['artistDisplayName'],
+    if type(nombre_del_autor) == str:
+        nombre_del_autor = nombre_del_autor.replace("(","").replace(")","").replace(",","")
+    if nombre_del_autor == " " or nombre_del_autor == "":
+        nombre_del_autor = "No especificado"
+    if type(nombre_del_autor) == tuple:   # ("nombre ejemplo", ) Me salia esto en la API
+        nombre_del_autor = nombre_del_autor[0]
+    
+    nacionalidad_del_autor = obra_respuesta['artistNationality'],
+    if nacionalidad_del_autor == " " or nacionalidad_del_autor == "":
+        nacionalidad_del_autor = "No especificada"
+    if type(nacionalidad_del_autor) == tuple:
+        nacionalidad_del_autor = nacionalidad_del_autor[0]
+    
+    fecha_de_nacimiento = obra_respuesta['artistBeginDate'],
+    if fecha_de_nacimiento == " " or fecha_de_nacimiento == "":
+        fecha_de_nacimiento = "No especificada"
+    if type(fecha_de_nacimiento) == tuple:
+        fecha_de_nacimiento = fecha_de_nacimiento[0]
+    
+    fecha_de_muerte = obra_respuesta['artistEndDate'],
+    if fecha_de_muerte == " " or fecha_de_muerte == "":
+        fecha_de_muerte = "No especificada"
+    if type(fecha_de_muerte) == tuple:
+        fecha_de_muerte = fecha_de_muerte[0]
+    
+    tipo = obra_respuesta['classification'],
+    if tipo == " " or tipo == "":
+        tipo = "No especificado"
+    if type(tipo) == tuple:
+        tipo = tipo[0]
+    
+    año_de_creación = obra_respuesta['objectDate'],
+    if año_de_creación == " " or año_de_creación == "":
+        año_de_creación = "No especificado"
+    if type(año_de_creación) == tuple:
+        año_de_creación = año_de_creación[0]
+    
+    imagen_de_la_obra = obra_respuesta['primaryImage']
+    if type(imagen_de_la_obra) == tuple:
+        imagen_de_la_obra = imagen_de_la_obra[0]
+        
+    return Obra(
+        numero,
+        titulo,
+        nombre_del_autor,
+        nacionalidad_del_autor,
+        fecha_de_nacimiento,
+        fecha_de_muerte,
+        tipo,
+        año_de_creación,
+        imagen_de_la_obra,
+        )
+
+
+def generar_respuestas(cantidad):
+    """ Función que genera respuestas de la API con algunos campos vacíos, como las reales.
+    """
+    respuestas = list(generar_obras(cantidad).values())
+    for posicion, obra_respuesta in enumerate(respuestas):
+        if posicion % 4 == 0:
+            obra_respuesta["artistNationality"] = ""
+            obra_respuesta["artistBeginDate"] = " "
+        if posicion % 7 == 0:
+            obra_respuesta["classification"] = ""
+    return respuestas
+
+
+def medir(nombre, cantidad, funcion, repeticiones=3):
+    duracion = float("inf")
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        duracion = min(duracion, time.perf_counter() - inicio)
+    print(f"    {nombre:34} {duracion:7.3f} s  {1e9 * duracion / cantidad:7.0f} ns por obra")
+    return duracion
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    respuestas = generar_respuestas(cantidad)
+    print(f"Crear {cantidad} obras completas:")
+    medir("Cadena de comparaciones anterior", cantidad, lambda: [crear_obra_anterior(r) for r in respuestas])
+    medir("lector_de_obras.crear_obra", cantidad, lambda: [crear_obra(r) for r in respuestas])
+    medir("lector_de_obras.crear_obras (lote)", cantidad, lambda: crear_obras(leer_columnas(respuestas)))
+
+    print(f"Crear {cantidad} obras para el listado (modo perezoso):")
+    anterior = medir("Obra completa y luego para_listado", cantidad, lambda: [
+        Obra.para_listado(obra.numero, obra.titulo, obra.nombre_del_autor, None)
+        for obra in (crear_obra_anterior(r) for r in respuestas)])
+    nuevo = medir("crear_obra_para_listado", cantidad, lambda: [crear_obra_para_listado(r, None) for r in respuestas])
+    print(f"    {anterior / nuevo:.1f} veces más rápido que antes.")
+
+    # La cadena anterior nunca aplicaba "No especificado" (cada campo quedaba en una tupla)
+    vacias = sum(1 for obra in crear_obras(leer_columnas(respuestas)) if obra.nacionalidad_del_autor == "No especificada")
+    vacias_antes = sum(1 for r in respuestas if crear_obra_anterior(r).nacionalidad_del_autor == "No especificada")
+    print(f"Nacionalidades vacías reemplazadas: {vacias} con el lector, {vacias_antes} con la cadena anterior.")
+
+
+if __name__ == "__main__":
+    main()
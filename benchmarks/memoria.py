@@ -0,0 +1,92 @@
+""" Benchmark de memoria de la clase Obra.
+
+Compara los bytes por obra de la versión anterior (atributos en un __dict__ por instancia,
+sin compartir textos) con la versión actual (__slots__ y textos repetidos internados),
+tanto para obras completas como para obras perezosas.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.memoria [cantidad_de_obras]
+"""
+import random
+import sys
+import tracemalloc
+
+from Obra import Obra
+
+
+class ObraConDict:
+    """ Copia de la Obra original, con sus atributos en un __dict__ por instancia.
+    """
+    def __init__(self, numero, titulo, nombre_del_autor, nacionalidad_del_autor, fecha_de_nacimiento, fecha_de_muerte, tipo, año_de_creación, imagen_de_la_obra):
+        self.numero = numero
+        self.titulo = titulo
+        self.nombre_del_autor = nombre_del_autor
+        self.nacionalidad_del_autor = nacionalidad_del_autor
+        self.fecha_de_nacimiento = fecha_de_nacimiento
+        self.fecha_de_muerte = fecha_de_muerte
+        self.tipo = tipo
+        self.año_de_creación = año_de_creación
+        self.imagen_de_la_obra = imagen_de_la_obra
+
+
+NACIONALIDADES = ["American", "French", "Dutch", "Japanese", "Italian", "British", "No especificada"]
+TIPOS = ["Paintings", "Prints", "Drawings", "Ceramics", "Textiles", "Photographs", "No especificado"]
+
+
+def registros(cantidad):
+    """ Función que genera datos de obras parecidos a los de la API.
+        Cada texto se construye de nuevo para cada obra, como pasa al leer el JSON de la API.
+    """
+    aleatorio = random.Random(1)
+    for numero in range(1, cantidad + 1):
+        autor = aleatorio.randrange(2000)
+        nacimiento = 1500 + autor % 400
+        yield (
+            numero,
+            f"Obra de prueba numero {numero}",
+            "".join(["Autor ", str(autor), " Apellido"]),
+            "".join(NACIONALIDADES[autor % len(NACIONALIDADES)]),
+            str(nacimiento),
+            str(nacimiento + 60),
+            "".join(TIPOS[aleatorio.randrange(len(TIPOS))]),
+            "".join(["ca. ", str(nacimiento + 30)]),
+            f"https://images.metmuseum.org/CRDImages/ep/original/DP{numero:06d}.jpg",
+        )
+
+
+def medir(crear, cantidad):
+    """ Función que mide la memoria que ocupan las obras creadas.
+    Retorna:
+        Los bytes por obra
+    """
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    obras = [crear(registro) for registro in registros(cantidad)]
+    usado = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del obras
+    return usado / cantidad
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    def hidratador(numero):
+        return None
+
+    casos = [
+        ("Obra con __dict__ (antes)", lambda registro: ObraConDict(*registro)),
+        ("Obra con __slots__ e internado", lambda registro: Obra(*registro)),
+        ("Obra perezosa (solo listado)", lambda registro: Obra.para_listado(registro[0], registro[1], registro[2], hidratador)),
+    ]
+    print(f"Memoria para {cantidad} obras (incluye los textos de cada obra):")
+    referencia = None
+    for nombre, crear in casos:
+        bytes_por_obra = medir(crear, cantidad)
+        if referencia is None:
+            referencia = bytes_por_obra
+        print(f"    {nombre:32} {bytes_por_obra:8.0f} bytes/obra  ({100 * bytes_por_obra / referencia:5.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
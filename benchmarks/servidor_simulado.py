@@ -0,0 +1,166 @@
+""" Servidor local que imita la API de la colección del museo para los benchmarks.
+
+Sirve /departments, /search, /objects/{id} y /objects?metadataDate=... a partir de obras
+generadas, con latencia, tasa de errores 500 y tasa de respuestas 429 configurables.
+
+Uso directo (para probarlo a mano, por ejemplo con curl):
+    python -m benchmarks.servidor_simulado [puerto]
+"""
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from importacion import DEPARTAMENTOS_DEL_MUSEO
+
+NACIONALIDADES = ["American", "French", "Dutch", "Japanese", "Italian", "British", "Spanish", ""]
+TIPOS = ["Paintings", "Prints", "Drawings", "Ceramics", "Textiles", "Photographs", ""]
+DEPARTAMENTOS = ["European Paintings", "Drawings and Prints", "Asian Art", "Egyptian Art", "Photographs", "Modern Art"]
+
+
+def generar_obras(cantidad, semilla=1):
+    """ Función que genera obras con el formato de la API del museo.
+    Atributos:
+        cantidad (int): Cantidad de obras a generar.
+        semilla (int): Semilla para que las obras sean siempre las mismas.
+    Retorna:
+        Un diccionario de id de la obra a su JSON
+    """
+    aleatorio = random.Random(semilla)
+    obras = {}
+    for numero in range(1, cantidad + 1):
+        autor = aleatorio.randrange(max(1, cantidad // 10))
+        nacimiento = 1400 + autor % 550
+        creacion = nacimiento + aleatorio.randrange(20, 60)
+        obras[numero] = {
+            "objectID": numero,
+            "title": f"Obra simulada {numero}",
+            "artistDisplayName": f"Autor{autor} Apellido{autor % 97}",
+            "artistNationality": NACIONALIDADES[autor % len(NACIONALIDADES)],
+            "artistBeginDate": str(nacimiento),
+            "artistEndDate": str(nacimiento + 70),
+            "classification": TIPOS[aleatorio.randrange(len(TIPOS))],
+            "objectDate": f"ca. {creacion}",
+            "objectBeginDate": creacion - 5,
+            "objectEndDate": creacion + 5,
+            "primaryImage": f"https://images.metmuseum.org/CRDImages/ep/original/DP{numero:06d}.jpg" if numero % 3 else "",
+            "department": DEPARTAMENTOS[numero % len(DEPARTAMENTOS)],
+            "metadataDate": f"2024-{1 + numero % 12:02d}-{1 + numero % 28:02d}T00:00:00Z",
+        }
+    return obras
+
+
+class ServidorSimulado:
+    """ Clase que levanta la API simulada en un hilo aparte.
+    """
+
+    def __init__(self, obras, latencia=0.0, tasa_de_errores=0.0, tasa_de_429=0.0, puerto=0):
+        """ Método constructor de la clase ServidorSimulado.
+        Atributos:
+            obras (dict): Obras a servir, de id a JSON (ver generar_obras).
+            latencia (float): Segundos que tarda cada respuesta.
+            tasa_de_errores (float): Proporción de respuestas 500.
+            tasa_de_429 (float): Proporción de respuestas 429 con Retry-After.
+            puerto (int): Puerto local. Si es 0 se elige uno libre.
+        """
+        self.obras = obras
+        self.latencia = latencia
+        self.tasa_de_errores = tasa_de_errores
+        self.tasa_de_429 = tasa_de_429
+        self.peticiones = {}
+        self.candado = threading.Lock()
+        self.aleatorio = random.Random(7)
+
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # Si no, cabeceras y cuerpo por separado suman ~40 ms por respuesta
+
+            def log_message(self, formato, *argumentos):
+                pass
+
+            def do_GET(self):
+                servidor._responder(self)
+
+        self.http = ThreadingHTTPServer(("127.0.0.1", puerto), Manejador)
+        self.http.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.http.server_address[1]}/public/collection/v1"
+        self.hilo = threading.Thread(target=self.http.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.hilo.start()
+        return self
+
+    def __exit__(self, *error):
+        self.http.shutdown()
+        self.http.server_close()
+
+    def _contar(self, ruta):
+        with self.candado:
+            self.peticiones[ruta] = self.peticiones.get(ruta, 0) + 1
+            return self.aleatorio.random()
+
+    def total_de_peticiones(self):
+        with self.candado:
+            return sum(self.peticiones.values())
+
+    def _enviar(self, manejador, estado, datos=None, cabeceras=()):
+        cuerpo = json.dumps(datos).encode("utf-8") if datos is not None else b""
+        manejador.send_response(estado)
+        manejador.send_header("Content-Type", "application/json")
+        manejador.send_header("Content-Length", str(len(cuerpo)))
+        for nombre, valor in cabeceras:
+            manejador.send_header(nombre, valor)
+        manejador.end_headers()
+        manejador.wfile.write(cuerpo)
+
+    def _responder(self, manejador):
+        url = urlparse(manejador.path)
+        parametros = parse_qs(url.query)
+        ruta = url.path.rsplit("/", 2)
+        tipo = "objects" if ruta[-2] == "objects" else ruta[-1]
+        azar = self._contar(tipo)
+        if self.latencia:
+            time.sleep(self.latencia)
+        if azar < self.tasa_de_429:
+            return self._enviar(manejador, 429, cabeceras=[("Retry-After", "1")])
+        if azar < self.tasa_de_429 + self.tasa_de_errores:
+            return self._enviar(manejador, 500)
+
+        if tipo == "departments":
+            departamentos = [{"departmentId": DEPARTAMENTOS_DEL_MUSEO[nombre], "displayName": nombre} for nombre in DEPARTAMENTOS]
+            return self._enviar(manejador, 200, {"departments": departamentos})
+
+        if tipo == "search":
+            consulta = parametros.get("q", [""])[0].lower()
+            if "departmentId" in parametros:
+                numero = int(parametros["departmentId"][0])
+                ids = [obra["objectID"] for obra in self.obras.values() if DEPARTAMENTOS_DEL_MUSEO.get(obra["department"]) == numero]
+            else:
+                ids = [obra["objectID"] for obra in self.obras.values()
+                       if consulta in obra["artistDisplayName"].lower() or consulta == obra["artistNationality"].lower()]
+            return self._enviar(manejador, 200, {"total": len(ids), "objectIDs": ids or None})
+
+        if tipo == "objects" and url.path.endswith("/objects"):
+            desde = parametros.get("metadataDate", [""])[0]
+            ids = [obra["objectID"] for obra in self.obras.values() if obra["metadataDate"][:10] >= desde]
+            return self._enviar(manejador, 200, {"total": len(ids), "objectIDs": ids})
+
+        if tipo == "objects":
+            obra = self.obras.get(int(ruta[-1])) if ruta[-1].isdigit() else None
+            if obra is None:
+                return self._enviar(manejador, 404, {"message": "ObjectID not found"})
+            return self._enviar(manejador, 200, obra)
+
+        return self._enviar(manejador, 404, {"message": "Not a valid route"})
+
+
+if __name__ == "__main__":
+    puerto = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with ServidorSimulado(generar_obras(5000), latencia=0.05, puerto=puerto) as servidor:
+        print(f"API simulada en {servidor.url}")
+        servidor.hilo.join()
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+
+from instrumentacion import instrumentacion
+from libreria_pillow import guardar_imagen_desde_url
+
+
+class CacheDeImagenes:
+    """ Clase que guarda en disco las imágenes de las obras y una miniatura de cada una.
+        Los archivos se nombran con un hash del numero de la obra y la URL, así dos obras
+        con el mismo titulo no se pisan, y la carpeta no crece más allá de un tamaño máximo.
+    """
+
+    def __init__(self, carpeta="imagenes", max_bytes=500*1024*1024, tamaño_de_miniatura=(1024, 1024)):
+        """ Método constructor de la clase CacheDeImagenes.
+        Atributos:
+            carpeta (str): Carpeta donde se guardan las imágenes.
+            max_bytes (int): Tamaño máximo en bytes de las imágenes guardadas.
+            tamaño_de_miniatura (tuple): Ancho y alto máximos de las miniaturas.
+        """
+        self.carpeta_originales = os.path.join(carpeta, "originales")
+        self.carpeta_miniaturas = os.path.join(carpeta, "miniaturas")
+        self.max_bytes = max_bytes
+        self.tamaño_de_miniatura = tamaño_de_miniatura
+        self.candado = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def clave(self, numero_de_obra, url):
+        """ Metodo para obtener el nombre de archivo de la imagen de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            url (str): URL de la imagen.
+        Retorna:
+            El hash que identifica a la imagen
+        """
+        return hashlib.sha1(f"{numero_de_obra}|{url}".encode("utf-8")).hexdigest()
+
+    def _buscar(self, carpeta, clave):
+        """ Metodo que busca el archivo de una clave sin importar su extensión.
+        Retorna:
+            La ruta del archivo o None si no existe
+        """
+        if not os.path.isdir(carpeta):
+            return None
+        for nombre in os.listdir(carpeta):
+            # Se saltan las descargas a medias (.parte y su .parte.validador)
+            if nombre.startswith(clave + ".") and not nombre.startswith(clave + ".parte"):
+                return os.path.join(carpeta, nombre)
+        return None
+
+    def obtener_miniatura(self, numero_de_obra, url, cancelar=None):
+        """ Metodo para obtener la miniatura de la imagen de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            url (str): URL de la imagen.
+            cancelar (threading.Event): Si se activa, la descarga se detiene y se retorna None.
+
+            Si la miniatura ya está guardada se usa directamente. Si no, se descarga la imagen
+            (si tampoco está guardada), se crea la miniatura y se recorta la carpeta si se pasó del máximo.
+        Retorna:
+            La ruta de la miniatura, o None si se canceló o la imagen está dañada.
+            Si no se pudo descargar lanza el error de la descarga, ver guardar_imagen_desde_url
+        """
+        clave = self.clave(numero_de_obra, url)
+        miniatura = self._buscar(self.carpeta_miniaturas, clave)
+        if miniatura is not None:
+            self.aciertos += 1
+            instrumentacion.contar("cache_de_imagenes.aciertos")
+            os.utime(miniatura)  # Marca la miniatura como usada recientemente
+            return miniatura
+
+        self.fallos += 1
+        instrumentacion.contar("cache_de_imagenes.fallos")
+        os.makedirs(self.carpeta_originales, exist_ok=True)
+        os.makedirs(self.carpeta_miniaturas, exist_ok=True)
+        original = self._buscar(self.carpeta_originales, clave)
+        if original is None:
+            original = guardar_imagen_desde_url(url, os.path.join(self.carpeta_originales, clave), cancelar)
+            if original is None or not os.path.exists(original):
+                return None
+
+        miniatura = self._crear_miniatura(original, clave)
+        self._recortar(conservar=miniatura)
+        return miniatura
+
+    def _crear_miniatura(self, original, clave):
+        """ Metodo que crea la miniatura de una imagen con Pillow.
+        Retorna:
+            La ruta de la miniatura, la del original si es un SVG (Pillow no los abre)
+            o None si la imagen está dañada
+        """
+        from PIL import Image
+
+        try:
+            with Image.open(original) as imagen:
+                imagen.thumbnail(self.tamaño_de_miniatura)
+                if imagen.mode in ("RGBA", "LA", "P"):
+                    miniatura = os.path.join(self.carpeta_miniaturas, clave + ".png")
+                    imagen.save(miniatura, "PNG", optimize=True)
+                else:
+                    miniatura = os.path.join(self.carpeta_miniaturas, clave + ".jpg")
+                    imagen.convert("RGB").save(miniatura, "JPEG", quality=85)
+            return miniatura
+        except OSError:
+            if original.endswith(".svg"):
+                return original
+            # La imagen guardada está dañada, se borra para descargarla de nuevo la próxima vez
+            os.remove(original)
+            return None
+
+    def _recortar(self, conservar=None):
+        """ Metodo que borra las imágenes usadas hace más tiempo hasta dejar la carpeta
+            por debajo del 90% del máximo.
+        Atributos:
+            conservar (str): Ruta de un archivo que no se debe borrar, la que se está por mostrar.
+        """
+        with self.candado:
+            archivos = []
+            total = 0
+            for carpeta in (self.carpeta_originales, self.carpeta_miniaturas):
+                for entrada in os.scandir(carpeta):
+                    if entrada.is_file():
+                        datos = entrada.stat()
+                        archivos.append((datos.st_mtime, datos.st_size, entrada.path))
+                        total += datos.st_size
+            if total <= self.max_bytes:
+                return
+            archivos.sort()
+            for _, tamaño, ruta in archivos:
+                if total <= self.max_bytes * 0.9:
+                    break
+                if ruta == conservar:
+                    continue
+                try:
+                    os.remove(ruta)
+                    total -= tamaño
+                except OSError:
+                    pass
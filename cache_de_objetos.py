@@ -0,0 +1,245 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+class CacheDeObjetos:
+    """ Clase que guarda en disco (SQLite) las respuestas de la API del museo para no
+        volver a descargarlas en cada sesión.
+        Guarda por separado las obras (por su id) y las respuestas de las busquedas (por su URL),
+        cada una con su tiempo de vida, y expulsa las entradas menos usadas cuando se llena.
+    """
+
+    def __init__(self, ruta="cache_metroart.sqlite3", ttl_obras=30*24*3600, ttl_busquedas=24*3600, max_entradas=200000):
+        """ Método constructor de la clase CacheDeObjetos.
+        Atributos:
+            ruta (str): Ruta del archivo SQLite.
+            ttl_obras (float): Segundos que una obra guardada se considera válida.
+            ttl_busquedas (float): Segundos que una busqueda guardada se considera válida.
+            max_entradas (int): Cantidad máxima de entradas (obras + busquedas) antes de expulsar.
+        """
+        self.ruta = ruta
+        self.ttl_obras = ttl_obras
+        self.ttl_busquedas = ttl_busquedas
+        self.max_entradas = max_entradas
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.candado = threading.Lock()
+
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        for tabla, clave in (("obras", "numero INTEGER"), ("busquedas", "url TEXT")):
+            self.conexion.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({clave} PRIMARY KEY, datos TEXT, guardado REAL, usado REAL)")
+            self.conexion.execute(f"CREATE INDEX IF NOT EXISTS {tabla}_usado ON {tabla} (usado)")
+        self.conexion.execute("CREATE TABLE IF NOT EXISTS usos (clave TEXT PRIMARY KEY, veces INTEGER)")
+        self.conexion.execute("CREATE TABLE IF NOT EXISTS estado (clave TEXT PRIMARY KEY, valor TEXT)")
+        self.entradas = self._contar()
+
+    def _contar(self):
+        total = 0
+        for tabla in ("obras", "busquedas"):
+            total += self.conexion.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+        return total
+
+    def _obtener(self, tabla, columna, clave, ttl):
+        ahora = time.time()
+        with self.candado:
+            try:
+                fila = self.conexion.execute(f"SELECT datos, guardado FROM {tabla} WHERE {columna} = ?", (clave,)).fetchone()
+            except sqlite3.ProgrammingError:
+                # El cache ya se cerró (al salir) y quedan descargas en segundo plano
+                return None
+            if fila is None or ahora - fila[1] > ttl:
+                self.fallos += 1
+                return None
+            self.conexion.execute(f"UPDATE {tabla} SET usado = ? WHERE {columna} = ?", (ahora, clave))
+            self.aciertos += 1
+        return json.loads(fila[0])
+
+    def _guardar(self, tabla, columna, clave, datos):
+        ahora = time.time()
+        with self.candado:
+            try:
+                cursor = self.conexion.execute(f"UPDATE {tabla} SET datos = ?, guardado = ?, usado = ? WHERE {columna} = ?",
+                                               (json.dumps(datos), ahora, ahora, clave))
+            except sqlite3.ProgrammingError:
+                # El cache ya se cerró (al salir) y quedan descargas en segundo plano
+                return
+            if cursor.rowcount == 0:
+                self.conexion.execute(f"INSERT INTO {tabla} ({columna}, datos, guardado, usado) VALUES (?, ?, ?, ?)",
+                                      (clave, json.dumps(datos), ahora, ahora))
+                self.entradas += 1
+            if self.entradas > self.max_entradas:
+                self._expulsar()
+
+    def _expulsar(self):
+        """ Metodo que borra las entradas usadas hace más tiempo hasta dejar el cache al 90%.
+            Se llama con el candado tomado.
+        """
+        sobrantes = self.entradas - int(self.max_entradas * 0.9)
+        # Se reparte la expulsión entre las dos tablas según el ultimo uso global
+        filas = self.conexion.execute(
+            "SELECT 'obras', numero, usado FROM obras UNION ALL SELECT 'busquedas', url, usado FROM busquedas "
+            "ORDER BY usado LIMIT ?", (sobrantes,)).fetchall()
+        self.conexion.execute("BEGIN")
+        for tabla, clave, _ in filas:
+            columna = "numero" if tabla == "obras" else "url"
+            self.conexion.execute(f"DELETE FROM {tabla} WHERE {columna} = ?", (clave,))
+        self.conexion.execute("COMMIT")
+        self.entradas -= len(filas)
+        self.expulsiones += len(filas)
+
+    def obtener_obra(self, numero_de_obra):
+        """ Metodo para obtener el JSON de una obra guardada.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        Retorna:
+            El JSON de la obra o None si no está guardada o ya venció
+        """
+        return self._obtener("obras", "numero", numero_de_obra, self.ttl_obras)
+
+    def guardar_obra(self, numero_de_obra, datos):
+        """ Metodo para guardar el JSON de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            datos (dict): JSON de la obra devuelto por la API.
+        """
+        self._guardar("obras", "numero", numero_de_obra, datos)
+
+    def borrar_obra(self, numero_de_obra):
+        """ Metodo para borrar una obra guardada, por ejemplo si ya no está en la API.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        """
+        with self.candado:
+            try:
+                cursor = self.conexion.execute("DELETE FROM obras WHERE numero = ?", (numero_de_obra,))
+            except sqlite3.ProgrammingError:
+                # El cache ya se cerró (al salir)
+                return
+            self.entradas -= cursor.rowcount
+
+    def iterar_obras(self, tamaño_de_lote=1000):
+        """ Metodo para recorrer todas las obras guardadas que no han vencido.
+        Atributos:
+            tamaño_de_lote (int): Cantidad de obras que se leen del archivo de una vez.
+
+            No cuenta como acierto ni cambia el orden de expulsión.
+        Retorna:
+            Un generador con el JSON de cada obra
+        """
+        ultimo = -1
+        while True:
+            limite = time.time() - self.ttl_obras
+            with self.candado:
+                try:
+                    filas = self.conexion.execute(
+                        "SELECT numero, datos FROM obras WHERE numero > ? AND guardado >= ? ORDER BY numero LIMIT ?",
+                        (ultimo, limite, tamaño_de_lote)).fetchall()
+                except sqlite3.ProgrammingError:
+                    # El cache se cerró mientras se recorría
+                    return
+            if not filas:
+                return
+            for numero, datos in filas:
+                yield json.loads(datos)
+            ultimo = filas[-1][0]
+
+    def obtener_busqueda(self, url):
+        """ Metodo para obtener la respuesta guardada de una busqueda.
+        Atributos:
+            url (str): URL de la busqueda.
+        Retorna:
+            El JSON de la respuesta o None si no está guardada o ya venció
+        """
+        return self._obtener("busquedas", "url", url, self.ttl_busquedas)
+
+    def guardar_busqueda(self, url, datos):
+        """ Metodo para guardar la respuesta de una busqueda.
+        Atributos:
+            url (str): URL de la busqueda.
+            datos (dict): JSON de la respuesta de la API.
+        """
+        self._guardar("busquedas", "url", url, datos)
+
+    def contar_uso(self, clave):
+        """ Metodo para contar que el usuario usó algo, por ejemplo "departamento:11".
+            Estos contadores no vencen ni se expulsan.
+        Atributos:
+            clave (str): Lo que se usó.
+        """
+        with self.candado:
+            try:
+                self.conexion.execute("INSERT INTO usos (clave, veces) VALUES (?, 1) "
+                                      "ON CONFLICT (clave) DO UPDATE SET veces = veces + 1", (clave,))
+            except sqlite3.ProgrammingError:
+                pass
+
+    def mas_usados(self, prefijo, cantidad):
+        """ Metodo para obtener lo que más se usó en sesiones anteriores.
+        Atributos:
+            prefijo (str): Comienzo de las claves a considerar, por ejemplo "departamento:".
+            cantidad (int): Cantidad máxima de claves a retornar.
+        Retorna:
+            La lista de claves sin el prefijo, de la más usada a la menos usada
+        """
+        with self.candado:
+            filas = self.conexion.execute("SELECT clave FROM usos WHERE substr(clave, 1, ?) = ? ORDER BY veces DESC LIMIT ?",
+                                          (len(prefijo), prefijo, cantidad)).fetchall()
+        return [clave[len(prefijo):] for clave, in filas]
+
+    def obtener_estado(self, clave):
+        """ Metodo para leer un valor guardado entre sesiones, por ejemplo la fecha de la última sincronización.
+        Atributos:
+            clave (str): Nombre del valor.
+        Retorna:
+            El valor o None si nunca se guardó
+        """
+        with self.candado:
+            fila = self.conexion.execute("SELECT valor FROM estado WHERE clave = ?", (clave,)).fetchone()
+        return fila[0] if fila is not None else None
+
+    def guardar_estado(self, clave, valor):
+        """ Metodo para guardar un valor entre sesiones.
+        Atributos:
+            clave (str): Nombre del valor.
+            valor (str): Valor a guardar.
+        """
+        with self.candado:
+            try:
+                self.conexion.execute("INSERT INTO estado (clave, valor) VALUES (?, ?) "
+                                      "ON CONFLICT (clave) DO UPDATE SET valor = excluded.valor", (clave, valor))
+            except sqlite3.ProgrammingError:
+                # El cache ya se cerró (al salir) y terminó una actualización en segundo plano
+                pass
+
+    def guardado_mas_antiguo(self):
+        """ Metodo para saber desde cuándo pueden estar desactualizadas las obras guardadas.
+        Retorna:
+            El momento (segundos desde epoch) en que se guardó la obra más vieja, o None si no hay obras
+        """
+        with self.candado:
+            return self.conexion.execute("SELECT MIN(guardado) FROM obras").fetchone()[0]
+
+    def estadisticas(self):
+        """ Metodo para obtener los contadores del cache.
+        Retorna:
+            Un diccionario con aciertos, fallos, expulsiones, entradas y la tasa de aciertos
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "expulsiones": self.expulsiones,
+            "entradas": self.entradas,
+            "tasa_de_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def cerrar(self):
+        """ Metodo para cerrar la conexión con el archivo del cache.
+        """
+        with self.candado:
+            self.conexion.close()
@@ -0,0 +1,77 @@
+from instrumentacion import instrumentacion
+
+
+class Catalogo:
+    """ Clase que guarda las obras descargadas indexadas por su numero.
+        Reemplaza a la lista de obras: buscar una obra o saber si ya está guardada
+        no depende de cuántas obras haya en el catálogo.
+    """
+
+    def __init__(self):
+        """ Método constructor de la clase Catalogo.
+        Inicializa el catálogo vacío. El diccionario conserva el orden en que se agregan las obras.
+        """
+        self.obras = {}
+        self.cambios = 0  # Obras agregadas o reemplazadas, para saber si hay que guardar una instantánea
+
+    def agregar(self, obra):
+        """ Metodo para agregar una obra al catálogo.
+        Atributos:
+            obra (Obra): Obra a agregar.
+        Retorna:
+            True si la obra se agregó, False si ya estaba guardada
+        """
+        with instrumentacion.medir("catalogo.agregar"):
+            if obra.numero in self.obras:
+                return False
+            self.obras[obra.numero] = obra
+            self.cambios += 1
+            return True
+
+    def reemplazar(self, obra):
+        """ Metodo para guardar una obra aunque ya esté en el catálogo, por ejemplo si cambió en la API.
+        Atributos:
+            obra (Obra): Obra nueva.
+        """
+        self.obras[obra.numero] = obra
+        self.cambios += 1
+
+    def quitar(self, numero_de_obra):
+        """ Metodo para sacar una obra del catálogo, por ejemplo si ya no está en la API.
+        Atributos:
+            numero_de_obra (int): Numero de la obra.
+        """
+        if self.obras.pop(numero_de_obra, None) is not None:
+            self.cambios += 1
+
+    def obtener(self, numero_de_obra):
+        """ Metodo para buscar una obra por su numero.
+        Atributos:
+            numero_de_obra (int): Numero de la obra.
+        Retorna:
+            La obra o None si no está en el catálogo
+        """
+        return self.obras.get(numero_de_obra)
+
+    def listar(self, ids_de_obras):
+        """ Metodo para recorrer las obras de un grupo de ids.
+        Atributos:
+            ids_de_obras (list): IDs de las obras a recorrer.
+        Retorna:
+            Un generador con las obras guardadas en el orden de ids_de_obras, sin repetir
+        """
+        vistas = set()
+        for numero_de_obra in ids_de_obras:
+            obra = self.obras.get(numero_de_obra)
+            if obra is not None and numero_de_obra not in vistas:
+                vistas.add(numero_de_obra)
+                yield obra
+
+    def __contains__(self, numero_de_obra):
+        return numero_de_obra in self.obras
+
+    def __len__(self):
+        return len(self.obras)
+
+    def __iter__(self):
+        return iter(self.obras.values())
@@ -0,0 +1,161 @@
+import random
+import threading
+import time
+from collections import deque
+
+from instrumentacion import instrumentacion
+
+
+class ClienteAPI:
+    """ Clase que hace las peticiones HTTP a la API del museo.
+        Reutiliza las conexiones abiertas (keep-alive), reintenta los errores temporales
+        con espera exponencial y guarda estadísticas de latencia y reintentos.
+    """
+
+    def __init__(self, limitador=None, conexiones=10, intentos=6, timeout=(5, 30), espera_base=0.5, espera_maxima=30):
+        """ Método constructor de la clase ClienteAPI.
+        Atributos:
+            limitador (LimitadorDeTasa): Limitador de peticiones por segundo. Si es None no se limita.
+            conexiones (int): Cantidad de conexiones que se mantienen abiertas por host.
+            intentos (int): Cantidad máxima de intentos por petición antes de rendirse.
+            timeout (tuple): Segundos máximos para conectar y para leer la respuesta.
+            espera_base (float): Segundos de espera antes del primer reintento.
+            espera_maxima (float): Tope en segundos de la espera entre reintentos.
+        """
+        self.limitador = limitador
+        self.intentos = intentos
+        self.timeout = timeout
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.conexiones = conexiones
+        self.sesion = None  # Se crea con la primera petición, ver _abrir_sesion
+
+        self.candado = threading.Lock()
+        self.peticiones = 0
+        self.reintentos = 0
+        self.fallidas = 0
+        self.por_estado = {}
+        self.latencias = deque(maxlen=10000)
+
+    def _abrir_sesion(self):
+        """ Metodo que crea la sesión HTTP la primera vez que se necesita.
+            requests se importa recién aquí: importarlo tarda más que todo el resto del arranque,
+            y con el catálogo y los departamentos guardados el menú puede mostrarse sin la API.
+        Retorna:
+            La sesión
+        """
+        with self.candado:
+            if self.sesion is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                sesion = requests.Session()
+                adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=self.conexiones)
+                sesion.mount("https://", adaptador)
+                sesion.mount("http://", adaptador)
+                self.sesion = sesion
+        return self.sesion
+
+    def _registrar(self, inicio, estado):
+        with self.candado:
+            self.peticiones += 1
+            self.por_estado[estado] = self.por_estado.get(estado, 0) + 1
+            self.latencias.append(time.perf_counter() - inicio)
+
+    def _espera(self, intento, respuesta=None):
+        """ Metodo que calcula cuánto esperar antes del siguiente intento.
+        Atributos:
+            intento (int): Numero del intento que falló, empezando en 0.
+            respuesta (Response): Respuesta de la API si la hubo.
+
+            Si la API indica Retry-After se respeta, si no se usa espera exponencial con jitter.
+        Retorna:
+            Los segundos a esperar
+        """
+        if respuesta is not None and respuesta.status_code in (429, 503):
+            reintentar_en = respuesta.headers.get("Retry-After")
+            if reintentar_en:
+                try:
+                    return min(self.espera_maxima, float(reintentar_en))
+                except ValueError:
+                    from email.utils import parsedate_to_datetime
+
+                    try:
+                        fecha = parsedate_to_datetime(reintentar_en)
+                        return min(self.espera_maxima, max(0.0, fecha.timestamp() - time.time()))
+                    except (TypeError, ValueError):
+                        pass
+        tope = min(self.espera_maxima, self.espera_base * 2 ** intento)
+        return random.uniform(tope / 2, tope)
+
+    def leer(self, url, si_no_existe=None):
+        """ Metodo para leer una URL de la API.
+        Atributos:
+            url (str): URL a leer.
+            si_no_existe: Lo que se retorna si la API respondió 404, para distinguirlo de un error.
+        Retorna:
+            El JSON de la respuesta, si_no_existe si la API respondió 404 o None si se agotaron los intentos
+        """
+        import requests
+
+        sesion = self._abrir_sesion()
+        for intento in range(self.intentos):
+            if self.limitador is not None:
+                self.limitador.esperar(url)
+            inicio = time.perf_counter()
+            respuesta = None
+            try:
+                respuesta = sesion.get(url, timeout=self.timeout)
+            except requests.exceptions.RequestException:
+                # Errores de conexión o timeout, no hay respuesta
+                self._registrar(inicio, "error")
+            else:
+                self._registrar(inicio, respuesta.status_code)
+                instrumentacion.contar("api.bytes", len(respuesta.content))
+                if respuesta.status_code == 200:
+                    try:
+                        return respuesta.json()
+                    except ValueError:
+                        pass
+                elif respuesta.status_code == 404:
+                    return si_no_existe
+                elif respuesta.status_code < 500 and respuesta.status_code != 429:
+                    # Otros errores del cliente no se arreglan reintentando
+                    break
+
+            if intento < self.intentos - 1:
+                with self.candado:
+                    self.reintentos += 1
+                time.sleep(self._espera(intento, respuesta))
+
+        with self.candado:
+            self.fallidas += 1
+        print(f"\nNo se pudo leer {url} de la API.")
+        return None
+
+    def estadisticas(self):
+        """ Metodo para obtener las estadísticas de las peticiones hechas.
+        Retorna:
+            Un diccionario con peticiones, reintentos, fallidas, respuestas por estado
+            y la latencia media, p50, p95 y máxima en milisegundos
+        """
+        with self.candado:
+            latencias = sorted(self.latencias)
+            estadisticas = {
+                "peticiones": self.peticiones,
+                "reintentos": self.reintentos,
+                "fallidas": self.fallidas,
+                "por_estado": dict(self.por_estado),
+            }
+        if latencias:
+            estadisticas["latencia_media_ms"] = 1000 * sum(latencias) / len(latencias)
+            estadisticas["latencia_p50_ms"] = 1000 * latencias[len(latencias) // 2]
+            estadisticas["latencia_p95_ms"] = 1000 * latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))]
+            estadisticas["latencia_max_ms"] = 1000 * latencias[-1]
+        return estadisticas
+
+    def cerrar(self):
+        """ Metodo para cerrar las conexiones abiertas.
+        """
+        if self.sesion is not None:
+            self.sesion.close()
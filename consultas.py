@@ -0,0 +1,124 @@
+import csv
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Obra import CAMPOS_DE_DETALLE
+
+TIPOS_DE_CONSULTA = ("departamento", "nacionalidad", "autor")
+
+# Columnas de cada resultado, con los mismos nombres que los atributos de Obra
+CAMPOS_DE_SALIDA = ("consulta", "numero", "titulo", "nombre_del_autor") + CAMPOS_DE_DETALLE
+
+
+def leer_consultas(ruta):
+    """ Función para leer un archivo de consultas, una por línea con el formato "tipo valor".
+    Atributos:
+        ruta (str): Ruta del archivo. Las líneas vacías y las que empiezan con # se ignoran.
+
+        Por ejemplo:
+            departamento 11
+            nacionalidad Dutch
+            autor Rembrandt van Rijn
+
+        Si una línea no es una consulta válida (tipo desconocido, sin valor o un departamento
+        que no es un numero) lanza ValueError con el archivo y el numero de línea.
+    Retorna:
+        Una lista de tuplas (tipo, valor)
+    """
+    consultas = []
+    with open(ruta, encoding="utf-8") as archivo:
+        for numero_de_linea, linea in enumerate(archivo, 1):
+            linea = linea.strip()
+            if not linea or linea.startswith("#"):
+                continue
+            tipo, _, valor = linea.partition(" ")
+            if tipo not in TIPOS_DE_CONSULTA or not valor.strip():
+                raise ValueError(f"{ruta}:{numero_de_linea}: consulta invalida {linea!r}, "
+                                 f"se espera uno de {', '.join(TIPOS_DE_CONSULTA)} seguido de un valor")
+            valor = valor.strip()
+            if tipo == "departamento" and not valor.isdecimal():
+                raise ValueError(f"{ruta}:{numero_de_linea}: consulta invalida {linea!r}, "
+                                 f"el departamento se indica con su ID numérico")
+            consultas.append((tipo, valor))
+    return consultas
+
+
+def ejecutar_consulta(museo, tipo, valor):
+    """ Función para ejecutar una consulta sin pasar por el menú.
+    Atributos:
+        museo (MetroArt): Museo donde se busca.
+        tipo (str): "departamento", "nacionalidad" o "autor".
+        valor (str): ID del departamento, nacionalidad o nombre del autor.
+    Retorna:
+        Un generador con las obras encontradas, a medida que llegan
+    """
+    if tipo == "departamento":
+        return museo.iterar_obras(museo.ids_del_departamento(int(valor)))
+    if tipo == "nacionalidad":
+        return museo.iterar_por_nacionalidad(valor)
+    if tipo == "autor":
+        return museo.iterar_por_autor(valor)
+    raise ValueError(f"Tipo de consulta desconocido: {tipo}")
+
+
+class EscritorDeResultados:
+    """ Clase que escribe las obras encontradas en JSONL o CSV, una línea por obra.
+        Varias consultas pueden escribir a la vez: cada línea se escribe completa y se envía
+        enseguida, así otro programa puede leer los resultados mientras llegan.
+    """
+
+    def __init__(self, salida, formato="jsonl"):
+        """ Método constructor de la clase EscritorDeResultados.
+        Atributos:
+            salida (file): Archivo de texto donde se escribe, por ejemplo sys.stdout.
+            formato (str): "jsonl" o "csv". El CSV empieza con una línea de encabezado.
+        """
+        if formato not in ("jsonl", "csv"):
+            raise ValueError(f"Formato desconocido: {formato}")
+        self.salida = salida
+        self.formato = formato
+        self.candado = threading.Lock()
+        self.escritas = 0
+        if formato == "csv":
+            self.csv = csv.writer(salida)
+            self.csv.writerow(CAMPOS_DE_SALIDA)
+
+    def escribir(self, consulta, obra):
+        """ Metodo para escribir una obra.
+        Atributos:
+            consulta (str): Consulta que encontró la obra, por ejemplo "autor=Rembrandt".
+            obra (Obra): Obra encontrada.
+        """
+        valores = [consulta] + [getattr(obra, campo) for campo in CAMPOS_DE_SALIDA[1:]]
+        with self.candado:
+            if self.formato == "jsonl":
+                self.salida.write(json.dumps(dict(zip(CAMPOS_DE_SALIDA, valores)), ensure_ascii=False) + "\n")
+            else:
+                self.csv.writerow(valores)
+            self.salida.flush()
+            self.escritas += 1
+
+
+def ejecutar_consultas(museo, consultas, escritor, concurrentes=4):
+    """ Función para ejecutar varias consultas a la vez escribiendo sus resultados.
+    Atributos:
+        museo (MetroArt): Museo donde se busca. Todas las consultas comparten su catálogo,
+                          sus índices y su cache, así una obra se descarga una sola vez.
+        consultas (list): Tuplas (tipo, valor), ver leer_consultas.
+        escritor (EscritorDeResultados): Donde se escriben las obras encontradas.
+        concurrentes (int): Cantidad de consultas que se ejecutan a la vez.
+    Retorna:
+        Un diccionario de cada consulta a la cantidad de obras encontradas
+    """
+    def ejecutar(tipo, valor):
+        consulta = f"{tipo}={valor}"
+        cantidad = 0
+        for obra in ejecutar_consulta(museo, tipo, valor):
+            escritor.escribir(consulta, obra)
+            cantidad += 1
+        return consulta, cantidad
+
+    with ThreadPoolExecutor(max_workers=concurrentes, thread_name_prefix="consulta") as ejecutor:
+        futuros = [ejecutor.submit(ejecutar, tipo, valor) for tipo, valor in consultas]
+        return dict(futuro.result() for futuro in futuros)
@@ -0,0 +1,149 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from instrumentacion import instrumentacion
+
+# Segundos que se espera una imagen antes de avisar que se mostrará al terminar de descargarse
+ESPERA_DEL_CACHE = 0.1
+
+
+class DescargasDeImagenes:
+    """ Clase que descarga y muestra las imágenes de las obras en segundo plano, sin bloquear el menú.
+        La descarga se adelanta apenas se muestran los detalles de una obra, así cuando el usuario
+        pide la imagen normalmente ya está guardada. Si el usuario no la pide, se cancela.
+        Los hilos de descarga no imprimen: los errores vuelven en el futuro y se guardan como
+        avisos que el menú muestra con mostrar_avisos, así no se mezclan con lo que se pide al usuario.
+    """
+
+    def __init__(self, cache_de_imagenes, trabajadores=2):
+        """ Método constructor de la clase DescargasDeImagenes.
+        Atributos:
+            cache_de_imagenes (CacheDeImagenes): Cache donde se guardan las imágenes y miniaturas.
+            trabajadores (int): Cantidad máxima de imágenes que se descargan a la vez.
+        """
+        self.cache_de_imagenes = cache_de_imagenes
+        self.ejecutor = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="imagen")
+        self.candado = threading.Lock()
+        self.descargas = {}  # (numero, url) -> (futuro, evento de cancelación)
+        self.pedidas = set()  # Descargas que el usuario pidió ver, no se cancelan
+        self.avisos = []  # Mensajes de las descargas pedidas que terminaron, para mostrar en el menú
+
+    def _obtener(self, numero_de_obra, url, cancelar):
+        with instrumentacion.medir("imagen.obtener"):
+            return self.cache_de_imagenes.obtener_miniatura(numero_de_obra, url, cancelar)
+
+    def adelantar(self, numero_de_obra, url):
+        """ Metodo para empezar a descargar la imagen de una obra por si el usuario la pide.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            url (str): URL de la imagen. Si está vacía no se hace nada.
+        Retorna:
+            El futuro con la ruta de la miniatura, o None si la obra no tiene imagen
+        """
+        if url == '':
+            return None
+        clave = (numero_de_obra, url)
+        with self.candado:
+            descarga = self.descargas.get(clave)
+            nueva = descarga is None
+            if nueva:
+                cancelar = threading.Event()
+                try:
+                    futuro = self.ejecutor.submit(self._obtener, numero_de_obra, url, cancelar)
+                except RuntimeError:
+                    # El programa está terminando
+                    return None
+                descarga = self.descargas[clave] = (futuro, cancelar)
+        if nueva:
+            # Fuera del candado: si el futuro ya terminó, _olvidar se llama aquí mismo y lo toma
+            descarga[0].add_done_callback(lambda futuro: self._olvidar(clave, futuro))
+        return descarga[0]
+
+    def _olvidar(self, clave, futuro):
+        with self.candado:
+            descarga = self.descargas.get(clave)
+            if descarga is not None and descarga[0] is futuro:
+                del self.descargas[clave]
+                self.pedidas.discard(clave)
+
+    def cancelar(self, numero_de_obra, url):
+        """ Metodo para cancelar la descarga adelantada de una imagen que el usuario no pidió.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            url (str): URL de la imagen.
+        """
+        clave = (numero_de_obra, url)
+        with self.candado:
+            if clave in self.pedidas:
+                return
+            descarga = self.descargas.pop(clave, None)
+        if descarga is not None:
+            futuro, cancelar = descarga
+            futuro.cancel()  # Si todavía no empezó
+            cancelar.set()  # Si ya empezó, se detiene en el siguiente bloque
+
+    def cancelar_todas(self):
+        """ Metodo para cancelar todas las descargas adelantadas, por ejemplo al salir de un listado.
+        """
+        with self.candado:
+            claves = list(self.descargas)
+        for numero_de_obra, url in claves:
+            self.cancelar(numero_de_obra, url)
+
+    def mostrar(self, numero_de_obra, url):
+        """ Metodo para mostrar la imagen de una obra en una ventana nueva cuando termine de descargarse.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            url (str): URL de la imagen.
+        Retorna:
+            True si la imagen ya estaba descargada, False si se mostrará al terminar la descarga
+        """
+        futuro = self.adelantar(numero_de_obra, url)
+        if futuro is None:
+            print("No se pudo descargar la imagen.")
+            return False
+        with self.candado:
+            # La imagen pedida ya no se cancela aunque el usuario salga del listado
+            if not futuro.done():
+                self.pedidas.add((numero_de_obra, url))
+        # Si la miniatura ya estaba en el cache el futuro termina enseguida
+        lista = len(wait([futuro], timeout=ESPERA_DEL_CACHE).done) > 0
+        futuro.add_done_callback(self._mostrar_resultado)
+        # Si ya terminó, _mostrar_resultado se llamó aquí mismo y su aviso se muestra ahora
+        self.mostrar_avisos()
+        return lista
+
+    def _mostrar_resultado(self, futuro):
+        if futuro.cancelled():
+            error = "se canceló la descarga"
+        elif futuro.exception() is not None:
+            error = futuro.exception()
+        elif futuro.result() is None:
+            error = "la imagen está dañada"
+        else:
+            from PIL import Image
+
+            try:
+                with instrumentacion.medir("imagen.mostrar"):
+                    with Image.open(futuro.result()) as imagen:
+                        imagen.show()
+                return
+            except OSError as e:
+                error = e
+        with self.candado:
+            self.avisos.append(f"No se pudo descargar la imagen: {error}")
+
+    def mostrar_avisos(self):
+        """ Metodo para imprimir los avisos de las descargas pedidas que terminaron desde la última vez.
+            Se llama desde el menú, antes de pedirle algo al usuario.
+        """
+        with self.candado:
+            avisos, self.avisos = self.avisos, []
+        for aviso in avisos:
+            print(aviso)
+
+    def cerrar(self):
+        """ Metodo para cancelar lo pendiente y dejar de aceptar descargas.
+        """
+        self.cancelar_todas()
+        self.ejecutor.shutdown(wait=False, cancel_futures=True)
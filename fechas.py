@@ -0,0 +1,159 @@
+import re
+
+# Año que el museo usa como fecha de muerte de los autores vivos
+AÑO_DE_AUTOR_VIVO = 9999
+
+_SIGLO = re.compile(r"(early|mid|late)?[\s-]*(\d{1,2})(?:st|nd|rd|th)(?:\s*[–-]\s*(early|mid|late)?[\s-]*(\d{1,2})(?:st|nd|rd|th))?\s*(?:century|centuries)")
+_MILENIO = re.compile(r"(\d{1,2})(?:st|nd|rd|th)\s*millenni")
+_DECADA = re.compile(r"(\d{3})0s")
+_NUMERO = re.compile(r"\d+")
+_ORDINAL = re.compile(r"\d+(?:st|nd|rd|th)\b")
+_AÑO_SUELTO = re.compile(r"-?\d+")
+# Separa los extremos de un rango: "1650–60", "300 B.C.-A.D. 100", "1800 to 1850", sin cortar "mid-19th"
+_SEPARADOR = re.compile(r"\s*–\s*|\s+-\s+|(?<=\d)-(?=\d)|(?<=\.)\s*-\s*|\s+to\s+")
+
+
+def _es_antes_de_cristo(texto):
+    return "b.c" in texto or "bce" in texto
+
+
+def _tiene_era(texto):
+    return _es_antes_de_cristo(texto) or "a.d" in texto or re.search(r"\bce\b", texto) is not None
+
+
+def _años_del_siglo(siglo, parte, antes_de_cristo):
+    """ Función que convierte un siglo (y si es el comienzo, mediados o fines) en años.
+    """
+    if antes_de_cristo:
+        inicio, fin = -siglo * 100, -siglo * 100 + 99
+    else:
+        inicio, fin = (siglo - 1) * 100, (siglo - 1) * 100 + 99
+    if parte == "early":
+        return inicio, inicio + 33
+    if parte == "mid":
+        return inicio + 33, inicio + 66
+    if parte == "late":
+        return inicio + 66, fin
+    return inicio, fin
+
+
+def _leer_extremo(texto, antes_de_cristo):
+    """ Función que lee los años de una fecha sin rango entre eras, o de un extremo de un rango.
+    Retorna:
+        Una tupla (inicio, fin) o None
+    """
+    signo = -1 if antes_de_cristo else 1
+
+    milenio = _MILENIO.search(texto)
+    if milenio is not None:
+        numero = int(milenio.group(1))
+        if antes_de_cristo:
+            return -numero * 1000, -(numero - 1) * 1000 - 1
+        return (numero - 1) * 1000, numero * 1000 - 1
+
+    siglo = _SIGLO.search(texto)
+    if siglo is not None:
+        parte_inicial, primero, parte_final, ultimo = siglo.groups()
+        inicio, fin = _años_del_siglo(int(primero), parte_inicial, antes_de_cristo)
+        if ultimo is not None:
+            inicio_final, fin_final = _años_del_siglo(int(ultimo), parte_final, antes_de_cristo)
+            inicio, fin = min(inicio, inicio_final), max(fin, fin_final)
+        return inicio, fin
+
+    decada = _DECADA.search(texto)
+    if decada is not None:
+        inicio = int(decada.group(1)) * 10
+        if inicio % 100 == 0:
+            # "1800s" es el siglo, no la década
+            return (inicio, inicio + 99) if not antes_de_cristo else (-inicio - 99, -inicio)
+        return (inicio, inicio + 9) if not antes_de_cristo else (-inicio - 9, -inicio)
+
+    # Los ordinales sueltos ("5th dynasty") no son años
+    texto = _ORDINAL.sub("", texto)
+    numeros = [numero for numero in _NUMERO.findall(texto) if len(numero) >= 3]
+    if not numeros and _tiene_era(texto):
+        # Años cortos como "A.D. 50" solo si se indica la era
+        numeros = _NUMERO.findall(texto)
+    if not numeros:
+        return None
+    años = [signo * int(numero) for numero in numeros]
+    return min(años), max(años)
+
+
+def leer_años(texto):
+    """ Función para convertir una fecha del museo en un año de inicio y uno de fin.
+    Atributos:
+        texto (str): Fecha como la escribe el museo, por ejemplo "1606", "ca. 1650–60",
+                     "1850s", "late 18th century", "ca. 1500 B.C." o "ca. 300 B.C.–A.D. 100".
+    Retorna:
+        Una tupla (inicio, fin) con los años, negativos antes de Cristo, o None si el texto
+        no tiene un año reconocible (por ejemplo "No especificado")
+    """
+    if not isinstance(texto, str):
+        return None
+    texto = texto.strip().lower()
+
+    partes = _SEPARADOR.split(texto, maxsplit=1)
+    if len(partes) == 2:
+        primero, ultimo = partes
+        # Cada extremo tiene su era; si el primero no la indica vale la del final ("1000–800 B.C.")
+        ultimo_antes_de_cristo = _es_antes_de_cristo(ultimo)
+        primero_antes_de_cristo = _es_antes_de_cristo(primero) or (not _tiene_era(primero) and ultimo_antes_de_cristo)
+        numero_inicial = _NUMERO.findall(primero)
+        numero_final = _NUMERO.match(ultimo)
+        if not primero_antes_de_cristo and not ultimo_antes_de_cristo and numero_inicial and numero_final \
+                and len(numero_final.group()) < len(numero_inicial[-1]) and not _ORDINAL.match(ultimo):
+            # "1650–60" significa 1650 a 1660
+            inicial = numero_inicial[-1]
+            ultimo = inicial[:len(inicial) - len(numero_final.group())] + ultimo
+        inicio = _leer_extremo(primero, primero_antes_de_cristo)
+        fin = _leer_extremo(ultimo, ultimo_antes_de_cristo)
+        if inicio is not None and fin is not None:
+            return min(inicio[0], fin[0]), max(inicio[1], fin[1])
+    # Sin rango, o un rango que solo se entiende entero como "18th–19th century"
+    return _leer_extremo(texto, _es_antes_de_cristo(texto))
+
+
+def _año(valor):
+    """ Función que lee un año suelto como el de artistBeginDate u objectBeginDate.
+        Si hay varios autores ("1606|1620") se usa el primero.
+    """
+    if isinstance(valor, int):
+        return valor
+    if not isinstance(valor, str):
+        return None
+    valor = valor.split("|")[0].strip()
+    coincidencia = _AÑO_SUELTO.match(valor)
+    return int(coincidencia.group()) if coincidencia else None
+
+
+def años_de_creacion(obra_respuesta):
+    """ Función para obtener los años en que se creó una obra.
+    Atributos:
+        obra_respuesta (dict): JSON de la obra devuelto por la API.
+
+        Se usan objectBeginDate y objectEndDate, que el museo ya da como números, y si faltan
+        (o son los dos 0) se lee el texto de objectDate.
+    Retorna:
+        Una tupla (inicio, fin) o None si no se sabe
+    """
+    inicio = _año(obra_respuesta.get('objectBeginDate'))
+    fin = _año(obra_respuesta.get('objectEndDate'))
+    if inicio is not None and fin is not None and (inicio, fin) != (0, 0):
+        return min(inicio, fin), max(inicio, fin)
+    return leer_años(obra_respuesta.get('objectDate'))
+
+
+def años_de_vida(obra_respuesta):
+    """ Función para obtener los años de nacimiento y muerte del autor de una obra.
+    Atributos:
+        obra_respuesta (dict): JSON de la obra devuelto por la API.
+    Retorna:
+        Una tupla (nacimiento, muerte) o None si no se sabe cuándo nació o cuándo murió.
+        Si el autor sigue vivo el museo da AÑO_DE_AUTOR_VIVO como muerte
+    """
+    nacimiento = _año(obra_respuesta.get('artistBeginDate'))
+    muerte = _año(obra_respuesta.get('artistEndDate'))
+    if nacimiento is None or muerte is None or muerte < nacimiento:
+        return None
+    return nacimiento, muerte
@@ -1,19 +1,17 @@
-def imprimir_menu(opcion1, opcion2, opcion3):
+def imprimir_menu(*opciones):
         """ Metodo para imprimir un menu simple
         Atributos:
-            opcion1 (str): opción a imprimir en el sistema de primera en la lista de opciones
-            opcion2 (str): opción a imprimir en el sistema de segunda en la lista de opciones
-            opcion3 (str): opción a imprimir en el sistema de tercera en la lista de opciones
+            opciones (str): opciones a imprimir en el sistema, en el orden de la lista de opciones.
+                            Al final se agrega la opción Salir
 
         Retorna:
             selección: opcion elegida por el usuario
         """    
         print("Elija la opción deseada:")
-        print(f"1. {opcion1}")
-        print(f"2. {opcion2}")
-        print(f"3. {opcion3}")
-        print(f"4. Salir")
-        seleccion = input("Seleccione una opción (1-4): ")
+        for numero, opcion in enumerate(opciones, 1):
+                print(f"{numero}. {opcion}")
+        print(f"{len(opciones) + 1}. Salir")
+        seleccion = input(f"Seleccione una opción (1-{len(opciones) + 1}): ")
         return seleccion
 
 def es_numero(numero):
@@ -0,0 +1,195 @@
+import csv
+import json
+import sys
+from collections import deque
+
+from lector_de_obras import crear_obras, leer_columnas, leer_datos_para_indices
+
+# Departamentos de la API del museo, para que las obras importadas usen los mismos numeros
+DEPARTAMENTOS_DEL_MUSEO = {
+    "American Decorative Arts": 1,
+    "Ancient Near Eastern Art": 3,
+    "Arms and Armor": 4,
+    "Arts of Africa, Oceania, and the Americas": 5,
+    "Asian Art": 6,
+    "The Cloisters": 7,
+    "The Costume Institute": 8,
+    "Drawings and Prints": 9,
+    "Egyptian Art": 10,
+    "European Paintings": 11,
+    "European Sculpture and Decorative Arts": 12,
+    "Greek and Roman Art": 13,
+    "Islamic Art": 14,
+    "The Robert Lehman Collection": 15,
+    "The Libraries": 16,
+    "Medieval Art": 17,
+    "Musical Instruments": 18,
+    "Photographs": 19,
+    "Modern Art": 21,
+}
+
+# Columnas del CSV de acceso abierto del museo (MetObjects.csv) y su campo en la API
+COLUMNAS_CSV = {
+    "Object ID": "objectID",
+    "Department": "department",
+    "Title": "title",
+    "Artist Display Name": "artistDisplayName",
+    "Artist Nationality": "artistNationality",
+    "Artist Begin Date": "artistBeginDate",
+    "Artist End Date": "artistEndDate",
+    "Classification": "classification",
+    "Object Date": "objectDate",
+    "Object Begin Date": "objectBeginDate",
+    "Object End Date": "objectEndDate",
+    "Metadata Date": "metadataDate",
+}
+# Campos del CSV que traen un valor por autor separados por "|", se usa el del primero como en la API
+CAMPOS_POR_AUTOR = ("artistDisplayName", "artistNationality", "artistBeginDate", "artistEndDate")
+
+
+def _obra_del_csv(campos, valores):
+    """ Función que arma el JSON de una obra a partir de los valores de una fila del CSV.
+    """
+    obra_respuesta = dict(zip(campos, valores))
+    obra_respuesta["objectID"] = int(obra_respuesta["objectID"])
+    for campo in CAMPOS_POR_AUTOR:
+        valor = obra_respuesta.get(campo)
+        if valor and "|" in valor:
+            obra_respuesta[campo] = valor.split("|")[0].strip()
+    obra_respuesta["primaryImage"] = ""  # El CSV no trae la URL de la imagen
+    return obra_respuesta
+
+
+def leer_lotes_del_volcado(ruta, tamaño_de_lote=1000):
+    """ Función para leer un volcado de obras en lotes, sin interpretarlas todavía.
+    Atributos:
+        ruta (str): Ruta del archivo. Si termina en .jsonl o .json se lee como un JSON de obra
+                    por línea (como los devuelve la API), si no como el CSV de acceso abierto del museo.
+        tamaño_de_lote (int): Cantidad de obras por lote.
+
+        El archivo se lee línea por línea, nunca se carga completo en memoria.
+    Retorna:
+        Un generador de tuplas (campos, lote). Para un JSONL campos es None y el lote tiene las
+        líneas de texto; para el CSV campos son los nombres de la API de las columnas usadas
+        y el lote tiene solo esos valores de cada fila. Se convierten con preparar_lote
+    """
+    if ruta.endswith(".jsonl") or ruta.endswith(".json"):
+        with open(ruta, encoding="utf-8") as archivo:
+            lote = []
+            for linea in archivo:
+                if linea.strip():
+                    lote.append(linea)
+                    if len(lote) == tamaño_de_lote:
+                        yield None, lote
+                        lote = []
+            if lote:
+                yield None, lote
+        return
+
+    csv.field_size_limit(sys.maxsize)
+    with open(ruta, encoding="utf-8-sig", newline="") as archivo:
+        lector_csv = csv.reader(archivo)
+        cabecera = next(lector_csv)
+        columnas = [(posicion, COLUMNAS_CSV[nombre]) for posicion, nombre in enumerate(cabecera) if nombre in COLUMNAS_CSV]
+        posiciones = [posicion for posicion, _ in columnas]
+        campos = tuple(campo for _, campo in columnas)
+        lote = []
+        for fila in lector_csv:
+            lote.append([fila[posicion] for posicion in posiciones])
+            if len(lote) == tamaño_de_lote:
+                yield campos, lote
+                lote = []
+        if lote:
+            yield campos, lote
+
+
+def preparar_lote(campos, lote):
+    """ Función que hace el trabajo de CPU de importar un lote: interpretar cada obra, normalizar
+        sus campos y calcular lo que guardan los índices. Corre en los procesos de importación.
+    Atributos:
+        campos (tuple): Campos de las columnas del CSV, o None si el lote es de un JSONL.
+        lote (list): Lote de leer_lotes_del_volcado.
+    Retorna:
+        Una tupla (columnas de las obras para crear_obras, lista con los datos para los índices
+        de cada obra), ambas en el orden del lote
+    """
+    if campos is None:
+        obras_respuesta = [json.loads(registro) for registro in lote]
+    else:
+        obras_respuesta = [_obra_del_csv(campos, registro) for registro in lote]
+    return leer_columnas(obras_respuesta), [leer_datos_para_indices(obra_respuesta) for obra_respuesta in obras_respuesta]
+
+
+def preparar_volcado(ruta, procesos=1, tamaño_de_lote=1000):
+    """ Función para preparar las obras de un volcado repartiendo los lotes entre varios procesos.
+    Atributos:
+        ruta (str): Ruta del volcado.
+        procesos (int): Cantidad de procesos. Con 1 todo se hace en este proceso.
+        tamaño_de_lote (int): Cantidad de obras que se envía a un proceso por vez.
+
+        Solo hay unos pocos lotes por proceso en vuelo a la vez, así la memoria no crece
+        con el tamaño del volcado, y los lotes se entregan en el orden del archivo.
+    Retorna:
+        Un generador con lo que retorna preparar_lote para cada lote
+    """
+    lotes = leer_lotes_del_volcado(ruta, tamaño_de_lote)
+    if procesos <= 1:
+        for campos, lote in lotes:
+            yield preparar_lote(campos, lote)
+        return
+    from concurrent.futures import ProcessPoolExecutor  # Importa multiprocessing, solo hace falta al importar un volcado
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = deque()
+        for campos, lote in lotes:
+            pendientes.append(ejecutor.submit(preparar_lote, campos, lote))
+            if len(pendientes) >= 2 * procesos:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def importar_volcado(museo, ruta, mostrar_progreso=True, procesos=1):
+    """ Función para cargar en el museo todas las obras de un volcado, en una sola pasada.
+    Atributos:
+        museo (MetroArt): Museo donde se cargan las obras.
+        ruta (str): Ruta del volcado (CSV del museo o JSONL de obras de la API).
+        mostrar_progreso (bool): Si es True imprime el avance cada 100000 obras.
+        procesos (int): Cantidad de procesos que interpretan y normalizan las obras, ver preparar_volcado.
+
+        Cada obra se guarda en el catálogo y en los índices de nacionalidades y autores,
+        y su id se agrega a las obras de su departamento, así las tres busquedas
+        funcionan sin conexión. Los procesos solo preparan las obras: el catálogo y los
+        índices se llenan en este proceso, en el orden del archivo.
+    Retorna:
+        La cantidad de obras importadas, sin contar las filas repetidas
+    """
+    departamentos_conocidos = {departamento['displayName']: departamento['departmentId'] for departamento in museo.departamentos}
+    siguiente_id_de_departamento = 100
+    importadas = 0
+    for columnas, datos_del_lote in preparar_volcado(ruta, procesos):
+        for obra, datos in zip(crear_obras(columnas), datos_del_lote):
+            museo.registrar_datos_para_indices(datos)
+            if not museo.obras.agregar(obra):
+                # Fila repetida: la obra ya está en el catálogo y en las de su departamento
+                continue
+
+            nombre_del_departamento = datos[4] or "No especificado"
+            ids_de_obras = museo.obras_por_departamento.get(nombre_del_departamento)
+            if ids_de_obras is None:
+                ids_de_obras = museo.obras_por_departamento[nombre_del_departamento] = []
+                if nombre_del_departamento not in departamentos_conocidos:
+                    id_del_departamento = DEPARTAMENTOS_DEL_MUSEO.get(nombre_del_departamento)
+                    if id_del_departamento is None:
+                        id_del_departamento = siguiente_id_de_departamento
+                        siguiente_id_de_departamento += 1
+                    departamentos_conocidos[nombre_del_departamento] = id_del_departamento
+                    museo.departamentos.append({'departmentId': id_del_departamento, 'displayName': nombre_del_departamento})
+            ids_de_obras.append(obra.numero)
+
+            importadas += 1
+            if mostrar_progreso and importadas % 100000 == 0:
+                print(f"    {importadas} obras importadas")
+
+    museo.departamentos.sort(key=lambda departamento: departamento['departmentId'])
+    return importadas
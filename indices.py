@@ -0,0 +1,478 @@
+import bisect
+import itertools
+import threading
+import unicodedata
+from array import array
+
+
+class IndiceDeNacionalidades:
+    """ Clase que recuerda la nacionalidad del autor de cada obra que el sistema ha leído.
+        Permite responder una busqueda por nacionalidad con los datos locales y saber
+        qué obras ya se revisaron (aceptadas o descartadas) para no volver a descargarlas.
+    """
+
+    def __init__(self):
+        """ Método constructor de la clase IndiceDeNacionalidades.
+        Inicializa el índice vacío.
+        """
+        self.obras_por_nacionalidad = {}
+        self.nacionalidad_de_obra = {}
+        self.candado = threading.Lock()
+
+    def registrar(self, numero_de_obra, nacionalidad):
+        """ Metodo para registrar la nacionalidad del autor de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            nacionalidad (str): Nacionalidad del autor tal como la da la API.
+        """
+        with self.candado:
+            anterior = self.nacionalidad_de_obra.get(numero_de_obra)
+            if anterior == nacionalidad:
+                return
+            if anterior is not None:
+                self.obras_por_nacionalidad[anterior].discard(numero_de_obra)
+            self.nacionalidad_de_obra[numero_de_obra] = nacionalidad
+            self.obras_por_nacionalidad.setdefault(nacionalidad, set()).add(numero_de_obra)
+
+    def quitar(self, numero_de_obra):
+        """ Metodo para olvidar una obra, por ejemplo si ya no está en la API.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        """
+        with self.candado:
+            anterior = self.nacionalidad_de_obra.pop(numero_de_obra, None)
+            if anterior is not None:
+                self.obras_por_nacionalidad[anterior].discard(numero_de_obra)
+
+    def nacionalidad_de(self, numero_de_obra):
+        """ Metodo para saber la nacionalidad del autor de una obra ya leída.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        Retorna:
+            La nacionalidad o None si la obra nunca se ha leído
+        """
+        return self.nacionalidad_de_obra.get(numero_de_obra)
+
+    def obras_de(self, nacionalidad):
+        """ Metodo para obtener las obras conocidas de una nacionalidad.
+        Atributos:
+            nacionalidad (str): Nacionalidad buscada.
+        Retorna:
+            La lista de IDs ordenada
+        """
+        with self.candado:
+            return sorted(self.obras_por_nacionalidad.get(nacionalidad, ()))
+
+    def conjunto_de(self, nacionalidad):
+        """ Metodo para obtener las obras conocidas de una nacionalidad sin importar mayúsculas,
+            para intersectarlas con otras restricciones.
+        Atributos:
+            nacionalidad (str): Nacionalidad buscada.
+        Retorna:
+            Un conjunto nuevo con los IDs
+        """
+        buscada = nacionalidad.strip().casefold()
+        obras = set()
+        with self.candado:
+            for nombre, ids_de_obras in self.obras_por_nacionalidad.items():
+                if nombre.casefold() == buscada:
+                    obras |= ids_de_obras
+        return obras
+
+    def __len__(self):
+        return len(self.nacionalidad_de_obra)
+
+
+class IndiceDeFacetas:
+    """ Clase que guarda, para cada valor de departamento, clasificación (tipo) y si tiene imagen,
+        el conjunto de obras leídas que lo tienen. Junto con los índices de nacionalidades
+        y de autores permite combinar restricciones intersectando conjuntos, sin ir a la API.
+    """
+
+    FACETAS = ("departamento", "clasificacion", "imagen")
+
+    def __init__(self):
+        """ Método constructor de la clase IndiceDeFacetas.
+        Inicializa el índice vacío.
+        """
+        self.obras_por_valor = {faceta: {} for faceta in self.FACETAS}
+        self.valores_de_obra = {}
+        self.nombre_de_valor = {}  # Valor normalizado a como lo escribe la API, para mostrarlo
+        self.candado = threading.Lock()
+
+    @staticmethod
+    def _clave(valor):
+        return valor.strip().casefold() if isinstance(valor, str) else valor
+
+    def registrar(self, numero_de_obra, departamento, clasificacion, tiene_imagen):
+        """ Metodo para registrar los valores de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            departamento (str): Nombre del departamento tal como lo da la API.
+            clasificacion (str): Clasificación de la obra (el tipo de Obra).
+            tiene_imagen (bool): Si la obra tiene imagen.
+        """
+        valores = (self._clave(departamento or ""), self._clave(clasificacion or ""), bool(tiene_imagen))
+        with self.candado:
+            anteriores = self.valores_de_obra.get(numero_de_obra)
+            if anteriores == valores:
+                return
+            for faceta, anterior, valor in zip(self.FACETAS, anteriores or (None,) * len(self.FACETAS), valores):
+                if anterior == valor:
+                    continue
+                obras_por_valor = self.obras_por_valor[faceta]
+                if anteriores is not None:
+                    obras_por_valor[anterior].discard(numero_de_obra)
+                obras = obras_por_valor.get(valor)
+                if obras is None:
+                    obras = obras_por_valor[valor] = set()
+                    if faceta != "imagen":
+                        self.nombre_de_valor.setdefault((faceta, valor), departamento if faceta == "departamento" else clasificacion)
+                obras.add(numero_de_obra)
+            self.valores_de_obra[numero_de_obra] = valores
+
+    def quitar(self, numero_de_obra):
+        """ Metodo para olvidar una obra, por ejemplo si ya no está en la API.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        """
+        with self.candado:
+            anteriores = self.valores_de_obra.pop(numero_de_obra, None)
+            if anteriores is None:
+                return
+            for faceta, anterior in zip(self.FACETAS, anteriores):
+                self.obras_por_valor[faceta][anterior].discard(numero_de_obra)
+
+    def valores_de(self, numero_de_obra):
+        """ Metodo para saber los valores registrados de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        Retorna:
+            Una tupla (departamento, clasificacion, tiene_imagen) escrita como la da la API,
+            o None si la obra no está registrada
+        """
+        with self.candado:
+            valores = self.valores_de_obra.get(numero_de_obra)
+            if valores is None:
+                return None
+            departamento, clasificacion, tiene_imagen = valores
+            return (self.nombre_de_valor.get(("departamento", departamento), departamento),
+                    self.nombre_de_valor.get(("clasificacion", clasificacion), clasificacion),
+                    tiene_imagen)
+
+    def valores(self, faceta):
+        """ Metodo para conocer los valores de una faceta y cuántas obras tiene cada uno.
+        Atributos:
+            faceta (str): "departamento", "clasificacion" o "imagen".
+        Retorna:
+            Una lista de tuplas (valor, cantidad de obras), de más a menos obras
+        """
+        with self.candado:
+            cantidades = [(self.nombre_de_valor.get((faceta, valor), valor), len(obras)) for valor, obras in self.obras_por_valor[faceta].items() if obras]
+        return sorted(cantidades, key=lambda cantidad: (-cantidad[1], str(cantidad[0])))
+
+    def intersectar(self, restricciones, otros_conjuntos=()):
+        """ Metodo para obtener las obras que cumplen todas las restricciones a la vez.
+        Atributos:
+            restricciones (dict): Faceta a valor buscado, por ejemplo {"imagen": True}.
+                                  Los textos se comparan sin importar mayúsculas.
+            otros_conjuntos (list): Conjuntos de IDs de otros índices que también deben cumplirse.
+
+            Se empieza por el conjunto más chico, así el costo depende de la cantidad
+            de resultados y no del tamaño del catálogo.
+        Retorna:
+            Un conjunto nuevo con los IDs, vacío si no hay restricciones
+        """
+        with self.candado:
+            conjuntos = [self.obras_por_valor[faceta].get(self._clave(valor), set()) for faceta, valor in restricciones.items()]
+            conjuntos += list(otros_conjuntos)
+            if not conjuntos:
+                return set()
+            conjuntos.sort(key=len)
+            resultado = set(conjuntos[0])
+            for conjunto in conjuntos[1:]:
+                if not resultado:
+                    break
+                resultado &= conjunto
+        return resultado
+
+    def __len__(self):
+        return len(self.valores_de_obra)
+
+
+class IndiceDeIntervalos:
+    """ Clase que guarda un intervalo de años por obra (por ejemplo cuándo se creó o cuándo vivió
+        su autor) en arreglos ordenados por el año de inicio. Las busquedas por rango usan busqueda
+        binaria en lugar de recorrer todas las obras.
+        Los intervalos más largos que LARGO_MAXIMO (autores vivos, fechas muy imprecisas) se
+        guardan aparte y se revisan uno por uno: son pocos y así el corte de la busqueda binaria
+        sigue siendo ajustado para el resto.
+    """
+
+    LARGO_MAXIMO = 150
+
+    def __init__(self):
+        """ Método constructor de la clase IndiceDeIntervalos.
+        Inicializa el índice vacío.
+        """
+        self.intervalo_de_obra = {}
+        self.inicios = array("i")
+        self.fines = array("i")
+        self.numeros = array("q")
+        self.largos = []
+        self.ordenados_al_dia = True
+        self.candado = threading.Lock()
+
+    def registrar(self, numero_de_obra, intervalo):
+        """ Metodo para registrar el intervalo de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            intervalo (tuple): Años (inicio, fin), o None si no se conocen.
+        """
+        with self.candado:
+            if self.intervalo_de_obra.get(numero_de_obra) == intervalo:
+                return
+            if intervalo is None:
+                del self.intervalo_de_obra[numero_de_obra]
+            else:
+                self.intervalo_de_obra[numero_de_obra] = intervalo
+            self.ordenados_al_dia = False
+
+    def _ordenar(self):
+        """ Metodo que vuelve a armar los arreglos ordenados con las obras registradas desde la última busqueda.
+        """
+        cortos = []
+        largos = []
+        for numero_de_obra, (inicio, fin) in self.intervalo_de_obra.items():
+            if fin - inicio > self.LARGO_MAXIMO:
+                largos.append((inicio, fin, numero_de_obra))
+            else:
+                cortos.append((inicio, fin, numero_de_obra))
+        cortos.sort()
+        self.inicios = array("i", [intervalo[0] for intervalo in cortos])
+        self.fines = array("i", [intervalo[1] for intervalo in cortos])
+        self.numeros = array("q", [intervalo[2] for intervalo in cortos])
+        self.largos = largos
+        self.ordenados_al_dia = True
+
+    def buscar(self, desde, hasta):
+        """ Metodo para buscar las obras cuyo intervalo se cruza con un rango de años.
+        Atributos:
+            desde (int): Primer año del rango, negativo antes de Cristo.
+            hasta (int): Último año del rango. Con desde == hasta se busca un año puntual,
+                         por ejemplo los autores vivos en 1800.
+        Retorna:
+            La lista de IDs ordenada por el año de inicio de su intervalo
+        """
+        with self.candado:
+            if not self.ordenados_al_dia:
+                self._ordenar()
+            # Un intervalo corto que se cruza con el rango empieza a lo sumo LARGO_MAXIMO años antes
+            izquierda = bisect.bisect_left(self.inicios, desde - self.LARGO_MAXIMO)
+            derecha = bisect.bisect_right(self.inicios, hasta)
+            encontradas = [(self.inicios[i], self.numeros[i]) for i in range(izquierda, derecha) if self.fines[i] >= desde]
+            encontradas += [(inicio, numero_de_obra) for inicio, fin, numero_de_obra in self.largos if inicio <= hasta and fin >= desde]
+        encontradas.sort()
+        return [numero_de_obra for _, numero_de_obra in encontradas]
+
+    def intervalo_de(self, numero_de_obra):
+        """ Metodo para saber el intervalo registrado de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        Retorna:
+            La tupla (inicio, fin) o None si no se conoce
+        """
+        return self.intervalo_de_obra.get(numero_de_obra)
+
+    def __len__(self):
+        return len(self.intervalo_de_obra)
+
+
+def normalizar(texto):
+    """ Función para normalizar un texto antes de indexarlo o buscarlo.
+    Atributos:
+        texto (str): Texto a normalizar.
+    Retorna:
+        La lista de palabras del texto en minúsculas, sin acentos ni signos
+    """
+    sin_acentos = unicodedata.normalize("NFKD", texto)
+    letras = []
+    for caracter in sin_acentos:
+        if unicodedata.combining(caracter):
+            continue
+        letras.append(caracter.lower() if caracter.isalnum() else " ")
+    return "".join(letras).split()
+
+
+def _borrados(palabra):
+    """ Función que genera las variantes de una palabra con una letra menos.
+        Dos palabras están a una edición de distancia (letra cambiada, sobrante o faltante)
+        si comparten alguna variante o una es variante de la otra.
+    """
+    return {palabra[:i] + palabra[i+1:] for i in range(len(palabra))}
+
+
+class IndiceDeAutores:
+    """ Clase que indexa las obras leídas por las palabras del nombre de su autor.
+        Permite buscar autores por nombre completo, por el comienzo de las palabras
+        o con un error de tipeo, sin acentos ni mayúsculas, y sin ir a la API.
+    """
+
+    # Palabras más cortas que esto no se buscan con errores de tipeo, darían demasiados resultados
+    LARGO_MINIMO_APROXIMADO = 4
+
+    def __init__(self):
+        """ Método constructor de la clase IndiceDeAutores.
+        Inicializa el índice vacío.
+        """
+        self.obras_por_palabra = {}
+        self.autor_de_obra = {}
+        self.palabras_por_borrado = {}
+        self.palabras_ordenadas = []
+        self.ordenadas_al_dia = True
+        self.candado = threading.Lock()
+
+    def registrar(self, numero_de_obra, nombre_del_autor, palabras=None):
+        """ Metodo para registrar el autor de una obra.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+            nombre_del_autor (str): Nombre del autor tal como lo da la API.
+            palabras (list): El nombre ya normalizado, si se calculó antes. Si es None se normaliza aquí.
+        """
+        with self.candado:
+            anterior = self.autor_de_obra.get(numero_de_obra)
+            if anterior == nombre_del_autor:
+                return
+            if anterior is not None:
+                for palabra in normalizar(anterior):
+                    self.obras_por_palabra[palabra].discard(numero_de_obra)
+            self.autor_de_obra[numero_de_obra] = nombre_del_autor
+            for palabra in (palabras if palabras is not None else normalizar(nombre_del_autor)):
+                obras = self.obras_por_palabra.get(palabra)
+                if obras is None:
+                    obras = self.obras_por_palabra[palabra] = set()
+                    self.ordenadas_al_dia = False
+                    if len(palabra) >= self.LARGO_MINIMO_APROXIMADO:
+                        for variante in _borrados(palabra) | {palabra}:
+                            self.palabras_por_borrado.setdefault(variante, set()).add(palabra)
+                obras.add(numero_de_obra)
+
+    def quitar(self, numero_de_obra):
+        """ Metodo para olvidar una obra, por ejemplo si ya no está en la API.
+            Las palabras del autor quedan indexadas aunque se queden sin obras.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        """
+        with self.candado:
+            anterior = self.autor_de_obra.pop(numero_de_obra, None)
+            if anterior is not None:
+                for palabra in normalizar(anterior):
+                    self.obras_por_palabra[palabra].discard(numero_de_obra)
+
+    def autor_de(self, numero_de_obra):
+        """ Metodo para saber el autor de una obra ya leída.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        Retorna:
+            El nombre del autor o None si la obra nunca se ha leído
+        """
+        return self.autor_de_obra.get(numero_de_obra)
+
+    def _palabras_con_prefijo(self, prefijo):
+        if not self.ordenadas_al_dia:
+            self.palabras_ordenadas = sorted(self.obras_por_palabra)
+            self.ordenadas_al_dia = True
+        inicio = bisect.bisect_left(self.palabras_ordenadas, prefijo)
+        palabras = []
+        for palabra in itertools.islice(self.palabras_ordenadas, inicio, None):
+            if not palabra.startswith(prefijo):
+                break
+            palabras.append(palabra)
+        return palabras
+
+    def _palabras_aproximadas(self, palabra):
+        if len(palabra) < self.LARGO_MINIMO_APROXIMADO:
+            return set()
+        palabras = set()
+        for variante in _borrados(palabra) | {palabra}:
+            palabras |= self.palabras_por_borrado.get(variante, set())
+        # Compartir una variante también junta palabras a dos ediciones (por ejemplo dos letras
+        # cambiadas), se dejan solo las que están a una edición
+        return {candidata for candidata in palabras if _a_una_edicion(palabra, candidata)}
+
+    def palabras_que_coinciden(self, palabra):
+        """ Metodo para obtener las palabras indexadas que coinciden con una palabra buscada.
+        Atributos:
+            palabra (str): Palabra normalizada.
+
+            Primero se buscan las palabras que empiezan igual; si no hay ninguna,
+            las que están a un error de tipeo.
+        Retorna:
+            La lista de palabras indexadas
+        """
+        with self.candado:
+            palabras = self._palabras_con_prefijo(palabra)
+            if not palabras:
+                palabras = list(self._palabras_aproximadas(palabra))
+        return palabras
+
+    def buscar(self, nombre):
+        """ Metodo para buscar las obras de un autor.
+        Atributos:
+            nombre (str): Nombre o parte del nombre del autor.
+
+            Cada palabra buscada tiene que coincidir con alguna palabra del nombre del autor.
+        Retorna:
+            La lista ordenada de IDs de las obras encontradas
+        """
+        resultado = None
+        for palabra in normalizar(nombre):
+            obras = set()
+            for coincidente in self.palabras_que_coinciden(palabra):
+                obras |= self.obras_por_palabra[coincidente]
+            resultado = obras if resultado is None else resultado & obras
+            if not resultado:
+                return []
+        return sorted(resultado) if resultado else []
+
+    def coincide(self, nombre_del_autor, nombre):
+        """ Metodo para saber si el nombre de un autor coincide con lo buscado, con las mismas
+            reglas que buscar.
+        Atributos:
+            nombre_del_autor (str): Nombre del autor de la obra.
+            nombre (str): Nombre buscado.
+        Retorna:
+            True si cada palabra buscada coincide con alguna palabra del autor
+        """
+        palabras_del_autor = normalizar(nombre_del_autor)
+        for palabra in normalizar(nombre):
+            if any(propia.startswith(palabra) for propia in palabras_del_autor):
+                continue
+            # Igual que en buscar, el error de tipeo solo se acepta si ninguna palabra conocida empieza así
+            if len(palabra) < self.LARGO_MINIMO_APROXIMADO:
+                return False
+            with self.candado:
+                hay_prefijo = len(self._palabras_con_prefijo(palabra)) > 0
+            if hay_prefijo or not any(_a_una_edicion(palabra, propia) for propia in palabras_del_autor):
+                return False
+        return True
+
+    def __len__(self):
+        return len(self.autor_de_obra)
+
+
+def _a_una_edicion(a, b):
+    """ Función que indica si dos palabras están a lo sumo a una edición de distancia.
+    """
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i+1:] == b[i+1:]
+    return a[i:] == b[i+1:]
@@ -0,0 +1,452 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+
+from Obra import Obra
+from catalogo import Catalogo
+from indices import normalizar
+from instrumentacion import instrumentacion
+from lector_de_obras import crear_obra
+
+MAGICO = b"METROART"
+VERSION = 1
+
+# Cabecera: mágico, versión, cantidad de obras y (posición, largo) de cada sección
+CABECERA = struct.Struct("<8sIQ" + "QQ" * 5)
+SECCIONES = ("numeros", "registros", "posiciones_de_cadenas", "cadenas", "metadatos")
+
+# Un registro por obra, en el orden de los numeros:
+#   los campos de Obra y los datos crudos de los índices como posiciones en la tabla de cadenas,
+#   los años de creación y de vida del autor y banderas
+REGISTRO = struct.Struct("<" + "I" * 8 + "I" * 4 + "i" * 4 + "B3x")
+CAMPOS_DE_OBRA = ("titulo", "nombre_del_autor", "nacionalidad_del_autor", "fecha_de_nacimiento",
+                  "fecha_de_muerte", "tipo", "año_de_creación", "imagen_de_la_obra")
+TIENE_IMAGEN = 1
+TIENE_CREACION = 2
+TIENE_VIDA = 4
+
+# Segundos que valen los IDs guardados de un departamento si el museo no tiene cache de disco,
+# igual que las busquedas en CacheDeObjetos
+VIGENCIA_DE_DEPARTAMENTOS = 24 * 3600
+
+
+class Instantanea:
+    """ Clase que lee una instantánea del catálogo mapeada en memoria.
+        Abrirla solo lee la cabecera y los metadatos: cada obra se decodifica recién cuando se pide,
+        y el sistema operativo carga del disco solo las páginas que se tocan.
+    """
+
+    def __init__(self, ruta):
+        """ Método constructor de la clase Instantanea.
+        Atributos:
+            ruta (str): Ruta del archivo escrito con guardar_instantanea.
+
+            Lanza ValueError si el archivo no es una instantánea de esta versión.
+        """
+        self.ruta = ruta
+        with open(ruta, "rb") as archivo:
+            self.mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            valores = CABECERA.unpack_from(self.mapa, 0)
+        except struct.error:
+            self.mapa.close()
+            raise ValueError(f"{ruta} no es una instantánea del catálogo")
+        magico, version, self.cantidad = valores[:3]
+        if magico != MAGICO or version != VERSION:
+            self.mapa.close()
+            raise ValueError(f"{ruta} no es una instantánea del catálogo de esta versión")
+        self.secciones = {nombre: (valores[3 + 2*i], valores[4 + 2*i]) for i, nombre in enumerate(SECCIONES)}
+        vista = memoryview(self.mapa)
+        self.numeros = self._vista(vista, "numeros").cast("q")
+        self.posiciones_de_cadenas = self._vista(vista, "posiciones_de_cadenas").cast("Q")
+        self.inicio_de_cadenas = self.secciones["cadenas"][0]
+        self.inicio_de_registros = self.secciones["registros"][0]
+        self.metadatos = json.loads(bytes(self._vista(vista, "metadatos")).decode("utf-8"))
+        self.cadenas = {}
+        self.candado = threading.Lock()
+        self.restaurados = {}  # Listas de IDs de departamentos que abrir_instantanea le dio al museo
+
+    def _vista(self, vista, seccion):
+        posicion, largo = self.secciones[seccion]
+        return vista[posicion:posicion + largo]
+
+    def cadena(self, indice):
+        """ Metodo para leer una cadena de la tabla de cadenas.
+        Atributos:
+            indice (int): Posición de la cadena en la tabla.
+        Retorna:
+            El texto, el mismo objeto cada vez que se pide la misma cadena
+        """
+        cadena = self.cadenas.get(indice)
+        if cadena is None:
+            inicio = self.inicio_de_cadenas + self.posiciones_de_cadenas[indice]
+            fin = self.inicio_de_cadenas + self.posiciones_de_cadenas[indice + 1]
+            cadena = self.cadenas.setdefault(indice, self.mapa[inicio:fin].decode("utf-8"))
+        return cadena
+
+    def posicion(self, numero_de_obra):
+        """ Metodo para buscar una obra con busqueda binaria sobre los numeros.
+        Atributos:
+            numero_de_obra (int): ID de la obra.
+        Retorna:
+            La posición del registro o None si la obra no está en la instantánea
+        """
+        posicion = bisect.bisect_left(self.numeros, numero_de_obra)
+        if posicion < self.cantidad and self.numeros[posicion] == numero_de_obra:
+            return posicion
+        return None
+
+    def registro(self, posicion):
+        """ Metodo para leer los valores crudos de un registro.
+        Retorna:
+            La tupla de valores de REGISTRO
+        """
+        return REGISTRO.unpack_from(self.mapa, self.inicio_de_registros + posicion * REGISTRO.size)
+
+    def obra(self, posicion):
+        """ Metodo para decodificar la obra de un registro.
+        Atributos:
+            posicion (int): Posición del registro.
+        Retorna:
+            La obra completa
+        """
+        valores = self.registro(posicion)
+        with instrumentacion.medir("instantanea.decodificar"):
+            return Obra(self.numeros[posicion], *[self.cadena(indice) for indice in valores[:8]])
+
+    def datos_para_indices(self, posicion, palabras_por_autor=None):
+        """ Metodo para armar los datos de los índices de un registro, como leer_datos_para_indices.
+        Atributos:
+            posicion (int): Posición del registro.
+            palabras_por_autor (dict): Nombres de autor ya normalizados, para no repetir el trabajo.
+        Retorna:
+            La tupla para MetroArt.registrar_datos_para_indices
+        """
+        valores = self.registro(posicion)
+        departamento, nacionalidad, nombre_del_autor, clasificacion = [self.cadena(indice) for indice in valores[8:12]]
+        creacion_inicio, creacion_fin, vida_inicio, vida_fin, banderas = valores[12:]
+        palabras = None
+        if palabras_por_autor is not None:
+            palabras = palabras_por_autor.get(nombre_del_autor)
+            if palabras is None:
+                palabras = palabras_por_autor[nombre_del_autor] = normalizar(nombre_del_autor)
+        return (
+            self.numeros[posicion],
+            nacionalidad,
+            nombre_del_autor,
+            palabras,
+            departamento,
+            clasificacion,
+            bool(banderas & TIENE_IMAGEN),
+            (creacion_inicio, creacion_fin) if banderas & TIENE_CREACION else None,
+            (vida_inicio, vida_fin) if banderas & TIENE_VIDA else None,
+        )
+
+    def ids_del_departamento(self, nombre_del_departamento):
+        """ Metodo para leer los IDs guardados de un departamento.
+        Retorna:
+            Un array con los IDs en el orden en que se guardaron, o None si no se guardó el departamento
+        """
+        seccion = self.metadatos["obras_por_departamento"].get(nombre_del_departamento)
+        if seccion is None:
+            return None
+        posicion, cantidad = seccion
+        ids_de_obras = array("q")
+        ids_de_obras.frombytes(self.mapa[posicion:posicion + 8 * cantidad])
+        return ids_de_obras
+
+    def guardado_del_departamento(self, nombre_del_departamento):
+        """ Metodo para saber cuándo se obtuvieron los IDs guardados de un departamento.
+        Retorna:
+            El momento en segundos desde epoch, o 0 si no se sabe
+        """
+        return self.metadatos.get("guardado_de_departamentos", {}).get(nombre_del_departamento, 0)
+
+    def __len__(self):
+        return self.cantidad
+
+
+class CatalogoMapeado(Catalogo):
+    """ Clase Catalogo que empieza con las obras de una instantánea sin decodificarlas.
+        Las obras que se agregan o reemplazan, y las de la instantánea ya decodificadas,
+        se guardan en el diccionario del Catalogo; las demás se buscan en el archivo.
+        Las obras de la instantánea que se quitan se recuerdan aparte, el archivo no cambia.
+    """
+
+    def __init__(self, instantanea):
+        """ Método constructor de la clase CatalogoMapeado.
+        Atributos:
+            instantanea (Instantanea): Instantánea abierta.
+        """
+        super().__init__()
+        self.instantanea = instantanea
+        self.nuevas = 0  # Obras agregadas que no están en la instantánea
+        self.quitadas = set()  # Obras de la instantánea que se sacaron del catálogo
+        self.candado = threading.Lock()
+
+    def _contar_nueva(self, numero_de_obra):
+        if numero_de_obra in self.quitadas:
+            # Vuelve una obra de la instantánea, ya estaba contada
+            self.quitadas.discard(numero_de_obra)
+        else:
+            self.nuevas += 1
+
+    def agregar(self, obra):
+        with instrumentacion.medir("catalogo.agregar"):
+            if obra.numero in self:
+                return False
+            self._contar_nueva(obra.numero)
+            self.obras[obra.numero] = obra
+            self.cambios += 1
+            return True
+
+    def reemplazar(self, obra):
+        if obra.numero not in self:
+            self._contar_nueva(obra.numero)
+        self.obras[obra.numero] = obra
+        self.cambios += 1
+
+    def quitar(self, numero_de_obra):
+        if numero_de_obra not in self:
+            return
+        self.obras.pop(numero_de_obra, None)
+        if self.instantanea.posicion(numero_de_obra) is not None:
+            self.quitadas.add(numero_de_obra)
+        else:
+            self.nuevas -= 1
+        self.cambios += 1
+
+    def obtener(self, numero_de_obra):
+        obra = self.obras.get(numero_de_obra)
+        if obra is not None:
+            return obra
+        if numero_de_obra in self.quitadas:
+            return None
+        posicion = self.instantanea.posicion(numero_de_obra)
+        if posicion is None:
+            return None
+        with self.candado:
+            # Se guarda la obra decodificada, así siempre se entrega el mismo objeto
+            obra = self.obras.get(numero_de_obra)
+            if obra is None:
+                obra = self.obras[numero_de_obra] = self.instantanea.obra(posicion)
+        return obra
+
+    def listar(self, ids_de_obras):
+        vistas = set()
+        for numero_de_obra in ids_de_obras:
+            if numero_de_obra in vistas:
+                continue
+            obra = self.obtener(numero_de_obra)
+            if obra is not None:
+                vistas.add(numero_de_obra)
+                yield obra
+
+    def __contains__(self, numero_de_obra):
+        if numero_de_obra in self.obras:
+            return True
+        return numero_de_obra not in self.quitadas and self.instantanea.posicion(numero_de_obra) is not None
+
+    def __len__(self):
+        return self.instantanea.cantidad + self.nuevas - len(self.quitadas)
+
+    def __iter__(self):
+        for numero_de_obra in self.instantanea.numeros:
+            if numero_de_obra not in self.quitadas:
+                yield self.obtener(numero_de_obra)
+        for numero_de_obra, obra in list(self.obras.items()):
+            if self.instantanea.posicion(numero_de_obra) is None:
+                yield obra
+
+
+def _obra_para_guardar(museo, obra):
+    """ Función que consigue la obra completa para escribirla sin consultar la API.
+    Retorna:
+        La obra completa o None si solo se conocen los datos del listado
+    """
+    if obra.esta_hidratada():
+        return obra
+    if museo.cache is not None:
+        obra_respuesta = museo.cache.obtener_obra(obra.numero)
+        if obra_respuesta is not None:
+            return crear_obra(obra_respuesta)
+    return None
+
+
+def _obras_ordenadas(catalogo):
+    """ Función que recorre el catálogo ordenado por numero.
+        Las obras de la instantánea anterior que nadie usó se decodifican de a una y no
+        quedan guardadas en el catálogo.
+    """
+    if not isinstance(catalogo, CatalogoMapeado):
+        yield from sorted(catalogo, key=lambda obra: obra.numero)
+        return
+    instantanea = catalogo.instantanea
+    for numero_de_obra in sorted((set(instantanea.numeros) - catalogo.quitadas) | set(catalogo.obras)):
+        obra = catalogo.obras.get(numero_de_obra)
+        yield obra if obra is not None else instantanea.obra(instantanea.posicion(numero_de_obra))
+
+
+def guardar_instantanea(museo, ruta):
+    """ Función para escribir el catálogo del museo en una instantánea.
+    Atributos:
+        museo (MetroArt): Museo con el catálogo, los índices y las obras por departamento.
+        ruta (str): Ruta del archivo.
+
+        Se escriben las obras completas del catálogo (las perezosas solo si están en el cache de
+        disco), con los datos de sus índices, y los IDs de las obras de cada departamento.
+        Se escribe primero a un archivo temporal que luego reemplaza al anterior: si el programa
+        se corta a la mitad, la instantánea anterior sigue entera.
+    Retorna:
+        La cantidad de obras guardadas
+    """
+    anterior = museo.obras.instantanea if isinstance(museo.obras, CatalogoMapeado) else None
+    indices_de_cadenas = {}
+    cadenas = bytearray()
+    posiciones_de_cadenas = array("Q", [0])
+
+    def indice(cadena):
+        if not isinstance(cadena, str):
+            cadena = "" if cadena is None else str(cadena)
+        posicion = indices_de_cadenas.get(cadena)
+        if posicion is None:
+            posicion = indices_de_cadenas[cadena] = len(posiciones_de_cadenas) - 1
+            cadenas.extend(cadena.encode("utf-8"))
+            posiciones_de_cadenas.append(len(cadenas))
+        return posicion
+
+    def datos_de(obra):
+        numero_de_obra = obra.numero
+        nacionalidad = museo.indice_de_nacionalidades.nacionalidad_de(numero_de_obra)
+        if nacionalidad is None and anterior is not None and anterior.posicion(numero_de_obra) is not None:
+            # Los índices todavía no terminan de cargar la instantánea anterior
+            return anterior.datos_para_indices(anterior.posicion(numero_de_obra))
+        facetas = museo.indice_de_facetas.valores_de(numero_de_obra) or ("", obra.tipo, bool(obra.imagen_de_la_obra))
+        return (numero_de_obra, nacionalidad if nacionalidad is not None else obra.nacionalidad_del_autor,
+                museo.indice_de_autores.autor_de(numero_de_obra) or obra.nombre_del_autor, None,
+                facetas[0], facetas[1], facetas[2],
+                museo.indice_de_creacion.intervalo_de(numero_de_obra),
+                museo.indice_de_vida_de_autores.intervalo_de(numero_de_obra))
+
+    numeros = array("q")
+    registros = bytearray()
+    with instrumentacion.medir("instantanea.guardar"):
+        for obra in _obras_ordenadas(museo.obras):
+            obra = _obra_para_guardar(museo, obra)
+            if obra is None:
+                continue
+            _, nacionalidad, nombre_del_autor, _, departamento, clasificacion, tiene_imagen, creacion, vida = datos_de(obra)
+            banderas = (TIENE_IMAGEN if tiene_imagen else 0) | (TIENE_CREACION if creacion else 0) | (TIENE_VIDA if vida else 0)
+            numeros.append(obra.numero)
+            registros.extend(REGISTRO.pack(
+                *[indice(getattr(obra, campo)) for campo in CAMPOS_DE_OBRA],
+                indice(departamento), indice(nacionalidad), indice(nombre_del_autor), indice(clasificacion),
+                *(creacion or (0, 0)), *(vida or (0, 0)), banderas))
+
+        secciones = [numeros.tobytes(), bytes(registros), posiciones_de_cadenas.tobytes(), bytes(cadenas)]
+        posicion = CABECERA.size + sum(len(seccion) for seccion in secciones)
+        # Los IDs de cada departamento van después de los metadatos, que dicen dónde está cada uno
+        ids_por_departamento = bytearray()
+        obras_por_departamento = {}
+        guardado_de_departamentos = {}
+        ahora = time.time()
+        for nombre_del_departamento, ids_de_obras in museo.obras_por_departamento.items():
+            obras_por_departamento[nombre_del_departamento] = [len(ids_por_departamento), len(ids_de_obras)]
+            ids_por_departamento.extend(array("q", ids_de_obras).tobytes())
+            # Una lista que viene de la instantánea anterior conserva el momento en que se obtuvo
+            restaurada = anterior is not None and anterior.restaurados.get(nombre_del_departamento) is ids_de_obras
+            guardado_de_departamentos[nombre_del_departamento] = \
+                anterior.guardado_del_departamento(nombre_del_departamento) if restaurada else ahora
+        metadatos = {"departamentos": museo.departamentos, "obras_por_departamento": obras_por_departamento,
+                     "guardado_de_departamentos": guardado_de_departamentos}
+        largo_de_metadatos = len(json.dumps(metadatos).encode("utf-8"))
+        # Las posiciones se escriben en el JSON, así que se calculan con el largo que tendrá al final
+        while True:
+            inicio_de_ids = posicion + largo_de_metadatos
+            metadatos["obras_por_departamento"] = {nombre: [inicio_de_ids + inicio, cantidad]
+                                                   for nombre, (inicio, cantidad) in obras_por_departamento.items()}
+            texto_de_metadatos = json.dumps(metadatos).encode("utf-8")
+            if len(texto_de_metadatos) == largo_de_metadatos:
+                break
+            largo_de_metadatos = len(texto_de_metadatos)
+        secciones.append(texto_de_metadatos)
+
+        ubicaciones = []
+        posicion = CABECERA.size
+        for seccion in secciones:
+            ubicaciones += [posicion, len(seccion)]
+            posicion += len(seccion)
+        temporal = ruta + ".tmp"
+        try:
+            with open(temporal, "wb") as archivo:
+                archivo.write(CABECERA.pack(MAGICO, VERSION, len(numeros), *ubicaciones))
+                for seccion in secciones:
+                    archivo.write(seccion)
+                archivo.write(ids_por_departamento)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, ruta)
+        except OSError:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+    return len(numeros)
+
+
+def abrir_instantanea(museo, ruta, vigencia=None):
+    """ Función para empezar a usar el catálogo de una instantánea en lugar de reconstruirlo.
+    Atributos:
+        museo (MetroArt): Museo recién creado, con el catálogo vacío.
+        ruta (str): Ruta de la instantánea.
+        vigencia (float): Segundos que valen los IDs guardados de cada departamento. Si es None
+                          se usa el tiempo de vida de las busquedas del cache del museo.
+
+        El catálogo queda listo enseguida; los índices se llenan con indexar_instantanea,
+        que conviene llamar en un hilo aparte.
+        Los IDs de un departamento más viejos que la vigencia no se usan, así el departamento
+        se vuelve a buscar (en el cache o en la API); sin conexión se usan igual.
+    Retorna:
+        La instantánea abierta, o None si no existe o no es válida
+    """
+    if not os.path.exists(ruta):
+        return None
+    try:
+        instantanea = Instantanea(ruta)
+    except (OSError, ValueError) as error:
+        print(f"No se pudo abrir la instantánea: {error}")
+        return None
+    museo.obras = CatalogoMapeado(instantanea)
+    conocidos = {departamento['displayName'] for departamento in museo.departamentos}
+    for departamento in instantanea.metadatos["departamentos"]:
+        if departamento['displayName'] not in conocidos:
+            museo.departamentos.append(departamento)
+    museo.departamentos.sort(key=lambda departamento: departamento['departmentId'])
+    if vigencia is None:
+        vigencia = museo.cache.ttl_busquedas if museo.cache is not None else VIGENCIA_DE_DEPARTAMENTOS
+    ahora = time.time()
+    for nombre_del_departamento in instantanea.metadatos["obras_por_departamento"]:
+        if nombre_del_departamento in museo.obras_por_departamento:
+            continue
+        if not museo.sin_conexion and ahora - instantanea.guardado_del_departamento(nombre_del_departamento) > vigencia:
+            continue
+        ids_de_obras = instantanea.ids_del_departamento(nombre_del_departamento)
+        museo.obras_por_departamento[nombre_del_departamento] = instantanea.restaurados[nombre_del_departamento] = ids_de_obras
+    return instantanea
+
+
+def indexar_instantanea(museo, instantanea):
+    """ Función para llenar los índices del museo con las obras de una instantánea.
+    Atributos:
+        museo (MetroArt): Museo donde se abrió la instantánea.
+        instantanea (Instantanea): Instantánea abierta.
+
+        Los nombres de autor se normalizan una sola vez por autor.
+    """
+    palabras_por_autor = {}
+    for posicion in range(len(instantanea)):
+        museo.registrar_datos_para_indices(instantanea.datos_para_indices(posicion, palabras_por_autor))
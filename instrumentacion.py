@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class _SinMedicion:
+    """ Medición vacía que se usa cuando la instrumentación está apagada.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *error):
+        return False
+
+
+_SIN_MEDICION = _SinMedicion()
+
+
+class _Medicion:
+    """ Medición de un bloque de código, se registra al salir del bloque.
+    """
+    __slots__ = ("instrumentacion", "nombre", "inicio")
+
+    def __init__(self, instrumentacion, nombre):
+        self.instrumentacion = instrumentacion
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *error):
+        self.instrumentacion.registrar(self.nombre, self.inicio, time.perf_counter())
+        return False
+
+
+class Instrumentacion:
+    """ Clase que mide cuánto tardan las partes del sistema que más se usan (lecturas de la API,
+        creación de obras, catálogo, listados e imágenes) y cuenta bytes y aciertos de los caches.
+        Apagada no guarda nada, así que se puede dejar en el código sin costo apreciable.
+    """
+
+    def __init__(self, activa=False, ruta_de_traza=None, max_eventos=200000):
+        """ Método constructor de la clase Instrumentacion.
+        Atributos:
+            activa (bool): Si es False las mediciones y contadores no hacen nada. Pedir una traza la activa.
+            ruta_de_traza (str): Archivo JSON donde se guarda cada medición al terminar, en el formato
+                                 de trazas de Chrome (se abre en chrome://tracing o en Perfetto).
+                                 Si es None no se guardan las mediciones individuales.
+            max_eventos (int): Cantidad máxima de mediciones individuales que se guardan para la traza.
+        """
+        self.activa = activa or bool(ruta_de_traza)
+        self.ruta_de_traza = ruta_de_traza
+        self.candado = threading.Lock()
+        self.tiempos = {}
+        self.contadores = {}
+        self.max_eventos = max_eventos
+        self.eventos = deque(maxlen=max_eventos) if ruta_de_traza else None
+        self.origen = time.perf_counter()
+
+    def configurar(self, activa, ruta_de_traza=None):
+        """ Metodo para prender o apagar la instrumentación, por ejemplo según los argumentos del programa.
+        Atributos:
+            activa (bool): Si se miden las partes del sistema.
+            ruta_de_traza (str): Archivo JSON para la traza, o None para no guardarla.
+        """
+        with self.candado:
+            self.activa = activa or bool(ruta_de_traza)
+            self.ruta_de_traza = ruta_de_traza
+            if ruta_de_traza and self.eventos is None:
+                self.eventos = deque(maxlen=self.max_eventos)
+
+    def medir(self, nombre):
+        """ Metodo para medir el tiempo de un bloque de código.
+        Atributos:
+            nombre (str): Nombre de lo que se mide, por ejemplo "leer_api".
+        Retorna:
+            Un objeto para usar con with
+        """
+        if not self.activa:
+            return _SIN_MEDICION
+        return _Medicion(self, nombre)
+
+    def registrar(self, nombre, inicio, fin):
+        """ Metodo para registrar una medición ya hecha.
+        Atributos:
+            nombre (str): Nombre de lo que se midió.
+            inicio (float): Momento de inicio según time.perf_counter().
+            fin (float): Momento de fin según time.perf_counter().
+        """
+        if not self.activa:
+            return
+        with self.candado:
+            duraciones = self.tiempos.get(nombre)
+            if duraciones is None:
+                duraciones = self.tiempos[nombre] = []
+            duraciones.append(fin - inicio)
+            if self.eventos is not None:
+                self.eventos.append((nombre, inicio, fin, threading.get_ident()))
+
+    def contar(self, nombre, cantidad=1):
+        """ Metodo para sumar a un contador, por ejemplo bytes descargados o aciertos de un cache.
+        Atributos:
+            nombre (str): Nombre del contador. Los pares "X.aciertos" y "X.fallos" se muestran
+                          juntos en el resumen con su tasa de aciertos.
+            cantidad (int): Cantidad a sumar.
+        """
+        if not self.activa or not cantidad:
+            return
+        with self.candado:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def resumen(self):
+        """ Metodo para obtener el resumen de la sesión.
+        Retorna:
+            Un texto con llamadas, tiempo total, media, p50, p95 y máximo de cada medición,
+            los contadores y la tasa de aciertos de cada cache
+        """
+        with self.candado:
+            tiempos = {nombre: sorted(duraciones) for nombre, duraciones in self.tiempos.items()}
+            contadores = dict(self.contadores)
+
+        lineas = ["---------- Rendimiento de la sesión ----------", ""]
+        lineas.append(f"{'Medición':28} {'Llamadas':>9} {'Total s':>9} {'Media ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'Máx ms':>9}")
+        for nombre, duraciones in sorted(tiempos.items(), key=lambda item: -sum(item[1])):
+            cantidad = len(duraciones)
+            total = sum(duraciones)
+            p50 = duraciones[cantidad // 2]
+            p95 = duraciones[min(cantidad - 1, int(cantidad * 0.95))]
+            lineas.append(f"{nombre:28} {cantidad:9} {total:9.3f} {1000 * total / cantidad:9.2f} "
+                          f"{1000 * p50:9.2f} {1000 * p95:9.2f} {1000 * duraciones[-1]:9.2f}")
+
+        caches = set()
+        for nombre in contadores:
+            if nombre.endswith(".aciertos") or nombre.endswith(".fallos"):
+                caches.add(nombre.rsplit(".", 1)[0])
+        otros = [nombre for nombre in contadores if nombre.rsplit(".", 1)[0] not in caches]
+        if caches or otros:
+            lineas.append("")
+        for cache in sorted(caches):
+            aciertos = contadores.get(cache + ".aciertos", 0)
+            fallos = contadores.get(cache + ".fallos", 0)
+            tasa = f"{aciertos / (aciertos + fallos):.1%}" if aciertos + fallos else "-"
+            lineas.append(f"{cache:28} {aciertos} aciertos, {fallos} fallos, tasa de aciertos {tasa}")
+        for nombre in sorted(otros):
+            valor = contadores[nombre]
+            if nombre.endswith("bytes"):
+                lineas.append(f"{nombre:28} {valor / 1024 / 1024:.2f} MB")
+            else:
+                lineas.append(f"{nombre:28} {valor}")
+        return "\n".join(lineas)
+
+    def guardar_traza(self):
+        """ Metodo para guardar las mediciones individuales en el archivo de traza, si se pidió uno.
+        Retorna:
+            La ruta del archivo o None si no hay traza
+        """
+        if self.eventos is None or not self.ruta_de_traza:
+            return None
+        with self.candado:
+            eventos = list(self.eventos)
+            contadores = dict(self.contadores)
+        traza = {
+            "traceEvents": [
+                {"name": nombre, "ph": "X", "pid": os.getpid(), "tid": hilo,
+                 "ts": 1e6 * (inicio - self.origen), "dur": 1e6 * (fin - inicio)}
+                for nombre, inicio, fin, hilo in eventos
+            ],
+            "otherData": contadores,
+        }
+        with open(self.ruta_de_traza, "w", encoding="utf-8") as archivo:
+            json.dump(traza, archivo)
+        return self.ruta_de_traza
+
+
+# Instancia que usan todos los módulos. Se prende con la variable de entorno METROART_PERFIL=1
+# (y METROART_TRAZA=archivo.json para guardar la traza) o con los argumentos --perfil y --traza de main.py
+instrumentacion = Instrumentacion(os.environ.get("METROART_PERFIL", "") not in ("", "0"), os.environ.get("METROART_TRAZA") or None)
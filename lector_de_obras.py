@@ -0,0 +1,114 @@
+from Obra import Obra
+from fechas import años_de_creacion, años_de_vida
+from indices import normalizar
+
+# Campos de la API en el orden de los argumentos de Obra, con el valor que se usa si vienen vacíos
+CAMPOS_DE_LA_API = (
+    ("title", "No especificado"),
+    ("artistDisplayName", "No especificado"),
+    ("artistNationality", "No especificada"),
+    ("artistBeginDate", "No especificada"),
+    ("artistEndDate", "No especificada"),
+    ("classification", "No especificado"),
+    ("objectDate", "No especificado"),
+    ("primaryImage", ""),  # Vacía significa que la obra no tiene imagen
+)
+# Los campos que guarda una obra perezosa del listado, los primeros de la tabla
+CAMPOS_DEL_LISTADO = CAMPOS_DE_LA_API[:2]
+
+VACIOS = frozenset(("", " "))
+
+
+def leer_fila(obra_respuesta, campos=CAMPOS_DE_LA_API):
+    """ Función para normalizar el JSON de una obra en una sola pasada por la tabla de campos.
+    Atributos:
+        obra_respuesta (dict): JSON de la obra devuelto por la API.
+        campos (tuple): Tabla de campos a leer, por defecto CAMPOS_DE_LA_API.
+
+        Los campos que faltan, son null o están en blanco toman el valor de la tabla.
+    Retorna:
+        Una lista con el numero y los campos en el orden de los argumentos de Obra
+    """
+    obtener = obra_respuesta.get
+    fila = [obra_respuesta['objectID']]
+    for clave, valor_por_defecto in campos:
+        valor = obtener(clave)
+        if valor is None or valor in VACIOS:
+            valor = valor_por_defecto
+        fila.append(valor)
+    return fila
+
+
+def crear_obra(obra_respuesta):
+    """ Función para crear una obra a partir de la respuesta de la API.
+    Atributos:
+        obra_respuesta (dict): JSON de la obra devuelto por la API.
+    Retorna:
+        La obra creada
+    """
+    return Obra(*leer_fila(obra_respuesta))
+
+
+def leer_columnas(obras_respuesta):
+    """ Función para normalizar un lote de respuestas de la API campo por campo en vez de obra por obra.
+    Atributos:
+        obras_respuesta (list): JSON de cada obra.
+    Retorna:
+        Una lista de columnas (numeros y luego un campo de CAMPOS_DE_LA_API por columna),
+        cada una con un valor por obra en el orden del lote
+    """
+    columnas = [[obra_respuesta['objectID'] for obra_respuesta in obras_respuesta]]
+    for clave, valor_por_defecto in CAMPOS_DE_LA_API:
+        valores = [obra_respuesta.get(clave) for obra_respuesta in obras_respuesta]
+        columnas.append([valor_por_defecto if valor is None or valor in VACIOS else valor for valor in valores])
+    return columnas
+
+
+def crear_obras(columnas):
+    """ Función para crear de una vez las obras de un lote.
+    Atributos:
+        columnas (list): Columnas del lote, ver leer_columnas.
+    Retorna:
+        Una lista con las obras creadas, en el orden del lote
+    """
+    return [Obra(*fila) for fila in zip(*columnas)]
+
+
+def leer_datos_para_indices(obra_respuesta, normalizar_autor=True):
+    """ Función para calcular de una vez todo lo que los índices de MetroArt guardan de una obra.
+    Atributos:
+        obra_respuesta (dict): JSON de la obra devuelto por la API.
+        normalizar_autor (bool): Si es False las palabras del autor quedan en None y las calcula el
+                                 índice de autores solo si el autor de la obra cambió.
+
+        Es la parte cara de registrar una obra (palabras del autor, fechas), y no depende del
+        museo, así se puede hacer en otro proceso al importar un volcado.
+    Retorna:
+        Una tupla (numero, nacionalidad, nombre del autor, palabras del autor, departamento,
+        clasificación, si tiene imagen, años de creación, años de vida del autor)
+    """
+    nombre_del_autor = obra_respuesta.get('artistDisplayName') or ""
+    return (
+        obra_respuesta['objectID'],
+        obra_respuesta.get('artistNationality') or "",
+        nombre_del_autor,
+        normalizar(nombre_del_autor) if normalizar_autor else None,
+        obra_respuesta.get('department'),
+        obra_respuesta.get('classification'),
+        bool(obra_respuesta.get('primaryImage')),
+        años_de_creacion(obra_respuesta),
+        años_de_vida(obra_respuesta),
+    )
+
+
+def crear_obra_para_listado(obra_respuesta, hidratador):
+    """ Función para crear directamente la obra perezosa del listado, sin armar antes la obra completa.
+    Atributos:
+        obra_respuesta (dict): JSON de la obra devuelto por la API.
+        hidratador (function): Función que recibe el numero de la obra y retorna la obra completa.
+    Retorna:
+        La obra sin hidratar, solo con numero, titulo y nombre del autor
+    """
+    numero, titulo, nombre_del_autor = leer_fila(obra_respuesta, CAMPOS_DEL_LISTADO)
+    return Obra.para_listado(numero, titulo, nombre_del_autor, hidratador)
+
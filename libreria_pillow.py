@@ -1,37 +1,144 @@
-import requests 
-from PIL import Image
+import os
 
-def guardar_imagen_desde_url(url, nombre_archivo): 
+from instrumentacion import instrumentacion
+
+# Tamaño de los bloques en que se lee y escribe la imagen
+TAMAÑO_DE_BLOQUE = 64 * 1024
+# Segundos de espera para conectarse y entre bloque y bloque
+TIEMPO_DE_ESPERA = (5, 30)
+
+def _extension(content_type):
+    """ Metodo para elegir la extensión del archivo según el Content-Type de la respuesta.
+    """
+    extension = '.png'  # Valor por defecto
+    if content_type:
+        if 'image/png' in content_type: extension = '.png'
+        elif 'image/jpeg' in content_type: extension = '.jpg'
+        elif 'image/svg+xml' in content_type: extension = '.svg'
+    return extension
+
+def _borrar_parcial(parcial):
+    """ Metodo que borra lo descargado de una imagen y su validador, si existen.
+    """
+    for ruta in (parcial, f"{parcial}.validador"):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+def _leer_validador(parcial):
+    """ Metodo que lee el ETag o Last-Modified de la imagen de la que se descargó el parcial.
+    Retorna:
+        El validador, o None si no se guardó
+    """
+    try:
+        with open(f"{parcial}.validador", encoding="utf-8") as archivo:
+            return archivo.read().strip() or None
+    except OSError:
+        return None
+
+def _guardar_validador(parcial, headers):
+    """ Metodo que guarda junto al parcial el validador de la respuesta, para pedir con If-Range
+        solo la continuación de la misma imagen. Un ETag débil (W/) no sirve para If-Range.
+    """
+    etag = headers.get('ETag')
+    validador = etag if etag and not etag.startswith('W/') else headers.get('Last-Modified')
+    ruta = f"{parcial}.validador"
+    if validador:
+        with open(ruta, 'w', encoding="utf-8") as archivo:
+            archivo.write(validador)
+    elif os.path.exists(ruta):
+        os.remove(ruta)
+
+def _descargar(url, nombre_archivo, parcial, cancelar, tamaño_de_bloque, tiempo_de_espera):
+    """ Metodo que hace un intento de descarga, continuando el archivo parcial si existe.
+        Solo se continúa si se sabe de qué versión de la imagen es el parcial: se pide con
+        If-Range, y si la imagen cambió en el servidor responde 200 con la imagen nueva entera.
+    Retorna:
+        El nombre del archivo guardado, o None si se canceló.
+        Si el tamaño no coincide con el Content-Length lanza ChunkedEncodingError y lo descargado queda para continuar.
+    """
+    import requests
+
+    descargados = os.path.getsize(parcial) if os.path.exists(parcial) else 0
+    validador = _leer_validador(parcial) if descargados else None
+    cabeceras = {'Range': f'bytes={descargados}-', 'If-Range': validador} if validador else {}
+    with requests.get(url, stream=True, timeout=tiempo_de_espera, headers=cabeceras) as response:
+        if response.status_code == 416:
+            # El parcial no corresponde a la imagen del servidor, se empieza de cero
+            _borrar_parcial(parcial)
+            raise requests.exceptions.HTTPError(f"Rango no válido para '{parcial}', se descarta lo descargado")
+        response.raise_for_status()  # Lanza una excepción para códigos de estado de error (4xx o 5xx)
+
+        # 206 si el servidor continúa desde donde quedó; con 200 manda la imagen entera
+        continua = validador is not None and response.status_code == 206 \
+            and response.headers.get('Content-Range', '').startswith(f'bytes {descargados}-')
+        if continua:
+            instrumentacion.contar("imagenes.reanudadas")
+        else:
+            descargados = 0
+            _guardar_validador(parcial, response.headers)
+        esperados = None
+        if response.headers.get('Content-Length') and not response.headers.get('Content-Encoding'):
+            esperados = descargados + int(response.headers['Content-Length'])
+
+        with open(parcial, 'ab' if continua else 'wb') as file:
+            for chunk in response.iter_content(chunk_size=tamaño_de_bloque):
+                if cancelar is not None and cancelar.is_set():
+                    break
+                file.write(chunk)
+                descargados += len(chunk)
+                instrumentacion.contar("imagenes.bytes", len(chunk))
+        if cancelar is not None and cancelar.is_set():
+            _borrar_parcial(parcial)
+            return None
+        if esperados is not None and descargados != esperados:
+            if descargados > esperados:
+                _borrar_parcial(parcial)
+            raise requests.exceptions.ChunkedEncodingError(f"Descarga incompleta: se recibieron {descargados} de {esperados} bytes")
+
+        nombre_archivo_final = f"{nombre_archivo}{_extension(response.headers.get('Content-Type'))}"
+        # El archivo final aparece completo o no aparece
+        os.replace(parcial, nombre_archivo_final)
+        _borrar_parcial(parcial)
+        return nombre_archivo_final
+
+def guardar_imagen_desde_url(url, nombre_archivo, cancelar=None, tamaño_de_bloque=TAMAÑO_DE_BLOQUE, tiempo_de_espera=TIEMPO_DE_ESPERA, intentos=3):
     """ Metodo para la funcionalidad de guardar la imagen.
-        Atributos: 
+        Atributos:
             url (str): URL de la imagen.
-            nombre_archivo (str): Nombre del archivo a guardar.
-    
-        Descarga una imagen desde una URL y la guarda en un archivo en la carpeta imagenes. 
+            nombre_archivo (str): Nombre del archivo a guardar, sin la extensión.
+            cancelar (threading.Event): Si se activa, se deja de descargar, se borra lo descargado y se retorna None.
+            tamaño_de_bloque (int): Bytes que se leen y escriben por vez.
+            tiempo_de_espera (tuple): Segundos de espera para conectarse y para recibir cada bloque.
+            intentos (int): Cantidad de veces que se intenta la descarga antes de rendirse.
+
+        Descarga una imagen desde una URL y la guarda en un archivo en la carpeta imagenes.
+        Se descarga a un archivo .parte que se renombra al terminar, así nunca queda una imagen
+        a medias con el nombre final. Si la descarga se corta, el próximo intento (en esta llamada
+        o en una posterior) pide con Range solo lo que falta, con el ETag o Last-Modified guardado
+        en .parte.validador como If-Range para no juntar partes de dos versiones de la imagen.
+        No imprime nada: se usa desde hilos en segundo plano y quien la llama avisa al usuario.
+    Retorna:
+        El nombre del archivo guardado, con la extensión, o None si se canceló.
+        Si no se pudo descargar lanza el error del último intento
     """
     if url == '':
-        print("La URL está vacía. No se puede descargar la imagen.")
-    else:
-        try: 
-            response = requests.get(url, stream=True) 
-            response.raise_for_status()  # Lanza una excepción para códigos de estado de error (4xx o 5xx) 
-
-            content_type = response.headers.get('Content-Type') 
-            extension = '.png'  # Valor por defecto 
-            if content_type: 
-                if 'image/png' in content_type: extension = '.png' 
-                elif 'image/jpeg' in content_type: extension = '.jpg' 
-                elif 'image/svg+xml' in content_type: extension = '.svg' 
-
-            nombre_archivo_final = f"{nombre_archivo}{extension}" 
-
-            with open(nombre_archivo_final, 'wb') as file: 
-                for chunk in response.iter_content(chunk_size=8192): 
-                    file.write(chunk) 
-            print(f"Imagen guardada exitosamente como '{nombre_archivo_final}'") 
-
-        except requests.exceptions.RequestException as e: 
-            print(f"Error al hacer el request: {e}") 
-        except IOError as e: 
-            print(f"Error al escribir el archivo: {e}") 
-        return nombre_archivo_final 
+        raise ValueError("La URL está vacía. No se puede descargar la imagen.")
+    import requests  # Recién con la primera descarga, ver ClienteAPI._abrir_sesion
+
+    parcial = f"{nombre_archivo}.parte"
+    for intento in range(intentos):
+        try:
+            return _descargar(url, nombre_archivo, parcial, cancelar, tamaño_de_bloque, tiempo_de_espera)
+        except requests.exceptions.HTTPError as e:
+            error = e
+            if e.response is not None and 400 <= e.response.status_code < 500 and e.response.status_code != 416:
+                # La imagen no existe o no se puede pedir, reintentar no sirve
+                _borrar_parcial(parcial)
+                break
+        except requests.exceptions.RequestException as e:
+            error = e
+        except IOError as e:
+            error = e
+            _borrar_parcial(parcial)
+            break
+    raise error
@@ -0,0 +1,96 @@
+import threading
+
+
+class ListadoProgresivo:
+    """ Clase que muestra por páginas las obras que van llegando de un generador.
+        Un hilo en segundo plano consume el generador y guarda las obras a medida que llegan,
+        así la primera página se puede mostrar apenas están sus obras y las siguientes
+        se van descargando mientras el usuario lee.
+    """
+
+    def __init__(self, obras, tamaño_de_pagina=20, paginas_adelantadas=2):
+        """ Método constructor de la clase ListadoProgresivo.
+        Atributos:
+            obras (generator): Generador que entrega las obras.
+            tamaño_de_pagina (int): Cantidad de obras por página.
+            paginas_adelantadas (int): Cantidad de páginas que se descargan por delante
+                                       de la que está viendo el usuario.
+        """
+        self.tamaño_de_pagina = tamaño_de_pagina
+        self.paginas_adelantadas = paginas_adelantadas
+        self.obras = []
+        self.pagina_actual = 0
+        self.terminado = False
+        self.cancelado = False
+        self.condicion = threading.Condition()
+        self.hilo = threading.Thread(target=self._consumir, args=(obras,), daemon=True)
+        self.hilo.start()
+
+    def _consumir(self, obras):
+        """ Metodo que corre en segundo plano guardando las obras del generador.
+            Se detiene cuando lleva paginas_adelantadas páginas por delante de la actual
+            y sigue cuando el usuario avanza.
+        """
+        try:
+            for obra in obras:
+                with self.condicion:
+                    self.obras.append(obra)
+                    self.condicion.notify_all()
+                    while not self.cancelado and len(self.obras) >= self._limite():
+                        self.condicion.wait()
+                    if self.cancelado:
+                        break
+        finally:
+            obras.close()
+            with self.condicion:
+                self.terminado = True
+                self.condicion.notify_all()
+
+    def _limite(self):
+        return (self.pagina_actual + 1 + self.paginas_adelantadas) * self.tamaño_de_pagina
+
+    def pagina(self, numero_de_pagina):
+        """ Metodo para obtener las obras de una página.
+        Atributos:
+            numero_de_pagina (int): Numero de la página, empezando en 0.
+
+            Espera hasta que la página esté completa o hasta que no lleguen más obras.
+        Retorna:
+            La lista de obras de la página
+        """
+        inicio = numero_de_pagina * self.tamaño_de_pagina
+        fin = inicio + self.tamaño_de_pagina
+        with self.condicion:
+            self.pagina_actual = numero_de_pagina
+            self.condicion.notify_all()
+            while not self.terminado and len(self.obras) < fin:
+                self.condicion.wait()
+            return self.obras[inicio:fin]
+
+    def hay_pagina_siguiente(self, numero_de_pagina):
+        """ Metodo para saber si existe una página después de la indicada.
+        Atributos:
+            numero_de_pagina (int): Numero de la página actual, empezando en 0.
+        Retorna:
+            True si ya llegó al menos una obra de la página siguiente
+        """
+        fin = (numero_de_pagina + 1) * self.tamaño_de_pagina
+        with self.condicion:
+            while not self.terminado and len(self.obras) <= fin:
+                self.condicion.wait()
+            return len(self.obras) > fin
+
+    def cargadas(self):
+        """ Metodo para saber cuántas obras han llegado hasta ahora.
+        Retorna:
+            La cantidad de obras recibidas
+        """
+        with self.condicion:
+            return len(self.obras)
+
+    def cancelar(self):
+        """ Metodo para dejar de descargar obras, por ejemplo cuando el usuario sale del listado.
+        """
+        with self.condicion:
+            self.cancelado = True
+            self.condicion.notify_all()
@@ -1,11 +1,151 @@
+import argparse
+import cProfile
+import contextlib
+import os
+import sys
+
 from MetroArt import MetroArt
+from cache_de_objetos import CacheDeObjetos
+from consultas import EscritorDeResultados, ejecutar_consultas, leer_consultas
+from importacion import importar_volcado
+from instantanea import abrir_instantanea, guardar_instantanea, indexar_instantanea
+from instrumentacion import instrumentacion
+from precarga import PrecargaDeDepartamentos
+from sincronizacion import sincronizar
 def main():
     """Función para iniciar el sistema
-    """    
-    museo = MetroArt()
-    museo.cargar_datos_csv("CH_Nationality_List_20171130_v1.csv")
-    museo.cargar_datos_API()
-    museo.menu()
-
-main()
-    
\ No newline at end of file
+    """
+    parser = argparse.ArgumentParser(description="Sistema de catálogo de la colección de arte del Museo metropolitano de Arte")
+    parser.add_argument("--volcado", help="CSV de acceso abierto del museo o JSONL de obras para cargar el catálogo completo")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="Procesos que preparan las obras del volcado (por defecto uno por núcleo)")
+    parser.add_argument("--instantanea", default="catalogo_metroart.bin",
+                        help="Archivo donde se guarda el catálogo al salir y desde el cual se abre al iniciar, sin reconstruirlo")
+    parser.add_argument("--sin-conexion", action="store_true", help="No consultar la API del museo")
+    parser.add_argument("--precargar", nargs="?", const="", metavar="IDS",
+                        help="Descargar en segundo plano los departamentos indicados (por ejemplo 11,19) o, sin valor, los más usados")
+    parser.add_argument("--perfil", action="store_true", help="Medir las partes del sistema y mostrar un resumen al salir (también con METROART_PERFIL=1)")
+    parser.add_argument("--traza", help="Guardar cada medición en este archivo JSON (formato de trazas de Chrome)")
+    parser.add_argument("--cprofile", help="Perfilar la sesión con cProfile y guardar el resultado en este archivo")
+    comandos = parser.add_subparsers(dest="comando")
+    buscar = comandos.add_parser("buscar", aliases=["search"], help="Ejecutar busquedas sin el menú y escribir las obras en la salida estándar")
+    buscar.add_argument("--departamento", "--department", type=int, action="append", default=[], help="ID de un departamento (se puede repetir)")
+    buscar.add_argument("--nacionalidad", "--nationality", action="append", default=[], help="Nacionalidad del autor (se puede repetir)")
+    buscar.add_argument("--autor", "--author", action="append", default=[], help="Nombre del autor (se puede repetir)")
+    buscar.add_argument("--consultas", "--queries", help='Archivo con una consulta por línea, por ejemplo "departamento 11"')
+    buscar.add_argument("--formato", "--format", choices=["jsonl", "csv"], default="jsonl")
+    buscar.add_argument("--concurrentes", type=int, default=4, help="Consultas que se ejecutan a la vez")
+    sincronizar_parser = comandos.add_parser("sincronizar", help="Actualizar las obras guardadas con los cambios de la API desde la última sincronización")
+    sincronizar_parser.add_argument("--desde", help="Fecha AAAA-MM-DD desde la cual buscar cambios, en lugar de la última sincronización")
+    comandos.add_parser("instantanea", help="Guardar ahora la instantánea del catálogo, por ejemplo después de importar un volcado")
+    argumentos = parser.parse_args()
+    if argumentos.perfil or argumentos.traza:
+        instrumentacion.configurar(True, argumentos.traza or instrumentacion.ruta_de_traza)
+    perfilador = None
+    if argumentos.cprofile:
+        perfilador = cProfile.Profile()
+        perfilador.enable()
+
+    consultas = []
+    es_busqueda = argumentos.comando in ("buscar", "search")
+    if es_busqueda:
+        consultas = [("departamento", str(numero)) for numero in argumentos.departamento]
+        consultas += [("nacionalidad", nombre) for nombre in argumentos.nacionalidad]
+        consultas += [("autor", nombre) for nombre in argumentos.autor]
+        if argumentos.consultas:
+            try:
+                consultas += leer_consultas(argumentos.consultas)
+            except (OSError, ValueError) as error:
+                buscar.error(str(error))
+        if not consultas:
+            buscar.error("indique al menos una consulta")
+
+    # En las busquedas sin menú la salida estándar queda solo para los resultados y los mensajes van a stderr
+    salida = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr if es_busqueda else sys.stdout):
+        cache = CacheDeObjetos("cache_metroart.sqlite3")
+        museo = MetroArt(cache=cache, modo_perezoso=not es_busqueda)
+        museo.sin_conexion = argumentos.sin_conexion
+        museo.cargar_datos_csv("CH_Nationality_List_20171130_v1.csv")
+        # Con los departamentos guardados en el cache el menú no espera a la API, se actualizan en segundo plano
+        actualizar_departamentos = museo.cargar_datos_API(esperar_actualizacion=argumentos.comando is not None)
+        instantanea = None
+        if argumentos.volcado:
+            print(f'\n---------- Importando {argumentos.volcado} ----------\n')
+            importadas = importar_volcado(museo, argumentos.volcado, procesos=argumentos.procesos)
+            print(f'\n---------- Se importaron {importadas} obras. ----------\n')
+        else:
+            instantanea = abrir_instantanea(museo, argumentos.instantanea)
+            if instantanea is not None:
+                print(f'\n---------- Catálogo abierto desde {argumentos.instantanea}: {len(instantanea)} obras. ----------\n')
+
+        def indexar():
+            # Primero la instantánea y después el cache, que puede tener obras más recientes
+            if instantanea is not None:
+                indexar_instantanea(museo, instantanea)
+            museo.indexar_cache()
+
+        if argumentos.precargar is not None and not museo.sin_conexion:
+            museo.precarga = PrecargaDeDepartamentos(museo)
+            departamentos = [valor for valor in argumentos.precargar.split(",") if valor.strip()]
+            if not departamentos:
+                departamentos = cache.mas_usados("departamento:", 3)
+            for numero_del_departamento in departamentos:
+                museo.precarga.agregar(int(numero_del_departamento))
+        if argumentos.comando is None:
+            # Los índices se llenan con las obras de sesiones anteriores mientras se usa el menú, y los
+            # departamentos se actualizan después de cargar el catálogo, que puede agregar departamentos que la API no tiene
+            en_segundo_plano = [indexar]
+            if actualizar_departamentos:
+                en_segundo_plano.append(museo.actualizar_departamentos)
+            museo.menu(en_segundo_plano)
+        elif argumentos.comando == "sincronizar":
+            indexar()
+            sincronizar(museo, argumentos.desde)
+        elif argumentos.comando == "instantanea":
+            indexar()
+        else:
+            indexar()
+            try:
+                resultados = ejecutar_consultas(museo, consultas, EscritorDeResultados(salida, argumentos.formato), argumentos.concurrentes)
+                for consulta, cantidad in resultados.items():
+                    print(f"{consulta}: {cantidad} obras")
+            except BrokenPipeError:
+                # El programa que leía los resultados terminó antes (por ejemplo head)
+                os.dup2(os.open(os.devnull, os.O_WRONLY), salida.fileno())
+                print("La salida se cerró antes de terminar las consultas.")
+        if museo.obras.cambios > 0 or argumentos.comando == "instantanea":
+            try:
+                guardadas = guardar_instantanea(museo, argumentos.instantanea)
+                print(f"Instantánea: {guardadas} obras guardadas en {argumentos.instantanea}.")
+            except OSError as error:
+                # Por ejemplo en Windows, que no deja reemplazar el archivo mapeado que se está usando
+                print(f"No se pudo guardar la instantánea: {error}")
+        estadisticas = cache.estadisticas()
+        print(f"Cache: {estadisticas['aciertos']} aciertos, {estadisticas['fallos']} fallos, {estadisticas['entradas']} entradas guardadas.")
+        estadisticas = museo.cliente.estadisticas()
+        print(f"API: {estadisticas['peticiones']} peticiones, {estadisticas['reintentos']} reintentos, {estadisticas['fallidas']} fallidas.")
+        if estadisticas['peticiones'] > 0:
+            print(f"Latencia: p50 {estadisticas['latencia_p50_ms']:.0f} ms, p95 {estadisticas['latencia_p95_ms']:.0f} ms.")
+        estadisticas = museo.peticiones_compartidas.estadisticas()
+        if estadisticas['compartidas'] > 0:
+            print(f"Peticiones compartidas: {estadisticas['compartidas']} de {estadisticas['pedidas']} "
+                  f"({estadisticas['porcentaje_compartidas']:.1f}%) esperaron a otra igual en curso.")
+        if perfilador is not None:
+            perfilador.disable()
+            perfilador.dump_stats(argumentos.cprofile)
+            print(f"Perfil de cProfile guardado en {argumentos.cprofile} (se lee con python -m pstats).")
+        if instrumentacion.activa:
+            print(instrumentacion.resumen())
+            ruta_de_traza = instrumentacion.guardar_traza()
+            if ruta_de_traza:
+                print(f"Traza guardada en {ruta_de_traza}.")
+        if museo.precarga is not None:
+            museo.precarga.detener()
+            print(f"Precarga: {museo.precarga.precargadas} obras.")
+        museo.descargas_de_imagenes.cerrar()
+        museo.cliente.cerrar()
+        cache.cerrar()
+
+# Los procesos de importación vuelven a importar este módulo en algunos sistemas, solo el principal inicia el sistema
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+
+
+class LimitadorDeTasa:
+    """ Clase que limita la cantidad de peticiones por segundo que se hacen a cada host.
+        La API del museo rechaza a los clientes que superan su limite, por eso todas las
+        descargas pasan por aqui antes de salir a la red.
+    """
+
+    def __init__(self, peticiones_por_segundo=50):
+        """ Método constructor de la clase LimitadorDeTasa.
+        Atributos:
+            peticiones_por_segundo (float): Maximo de peticiones por segundo a un mismo host.
+                                            Si es 0 o None no se limita.
+        """
+        self.intervalo = 1 / peticiones_por_segundo if peticiones_por_segundo else 0
+        self.proximo_turno = {}
+        self.candado = threading.Lock()
+
+    def esperar(self, url):
+        """ Metodo que bloquea el hilo actual hasta que le toque su turno al host de la URL.
+        Atributos:
+            url (str): URL que se va a consultar.
+        """
+        if not self.intervalo:
+            return
+        host = urlparse(url).netloc
+        with self.candado:
+            ahora = time.monotonic()
+            turno = max(ahora, self.proximo_turno.get(host, ahora))
+            self.proximo_turno[host] = turno + self.intervalo
+        espera = turno - ahora
+        if espera > 0:
+            time.sleep(espera)
+
+
+class MotorDeDescarga:
+    """ Clase que descarga obras de la API en paralelo con un numero acotado de hilos.
+        Las busquedas le entregan una lista de ids y reciben las obras a medida que llegan.
+    """
+
+    def __init__(self, leer, trabajadores=8):
+        """ Método constructor de la clase MotorDeDescarga.
+        Atributos:
+            leer (function): Función que recibe el id de una obra y retorna su JSON o None si no existe.
+            trabajadores (int): Cantidad de hilos que descargan a la vez.
+        """
+        self.leer = leer
+        self.trabajadores = trabajadores
+        self.ejecutor = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="descarga")
+
+    def obtener_obras(self, ids_de_obras, convertir, mostrar_progreso=True, leer=None):
+        """ Metodo para descargar un grupo de obras en paralelo.
+        Atributos:
+            ids_de_obras (list): IDs de las obras a descargar.
+            convertir (function): Función que recibe el JSON de una obra y retorna el resultado
+                                  a entregar, o None si la obra se descarta.
+            mostrar_progreso (bool): Si es True imprime cada obra a medida que llega.
+            leer (function): Función para leer cada obra en lugar de la del motor, por ejemplo
+                             para ignorar el cache al sincronizar.
+
+            Nunca hay mas de dos peticiones por trabajador en vuelo, asi que si quien consume
+            deja de pedir resultados las descargas pendientes se cancelan.
+            Las obras que la API no encuentra (404) se saltan igual que antes.
+        Retorna:
+            Un generador con los resultados de convertir en el orden en que terminan las descargas.
+        """
+        if leer is None:
+            leer = self.leer
+        pendientes = {}
+        ids = iter(ids_de_obras)
+        limite = self.trabajadores * 2
+        try:
+            while True:
+                while len(pendientes) < limite:
+                    numero_de_obra = next(ids, None)
+                    if numero_de_obra is None:
+                        break
+                    try:
+                        pendientes[self.ejecutor.submit(leer, numero_de_obra)] = numero_de_obra
+                    except RuntimeError:
+                        # El programa está terminando y ya no se aceptan descargas
+                        return
+
+                if not pendientes:
+                    break
+
+                listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    numero_de_obra = pendientes.pop(futuro)
+                    obra_respuesta = futuro.result()
+                    if mostrar_progreso:
+                        print(f"    Obra numero {numero_de_obra}")
+
+                    if obra_respuesta is None:
+                        if mostrar_progreso:
+                            print("Obra no válida en la API. No almacenada.")
+                        continue
+
+                    resultado = convertir(obra_respuesta)
+                    if resultado is not None:
+                        yield resultado
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
@@ -0,0 +1,80 @@
+import threading
+
+from instrumentacion import instrumentacion
+
+
+class _PeticionEnCurso:
+    """ Clase con el resultado de una petición que todavía se está haciendo.
+    """
+    __slots__ = ("terminada", "resultado", "error")
+
+    def __init__(self):
+        self.terminada = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class PeticionesCompartidas:
+    """ Clase que junta las peticiones iguales que se hacen a la vez.
+        Si una busqueda pide una URL que otra ya está leyendo, espera esa misma lectura en lugar
+        de hacer otra petición a la API, y ambas reciben el mismo resultado.
+        Una vez terminada la lectura la URL se olvida: las siguientes peticiones van a la API de nuevo.
+    """
+
+    def __init__(self):
+        """ Método constructor de la clase PeticionesCompartidas.
+        """
+        self.candado = threading.Lock()
+        self.en_curso = {}
+        self.pedidas = 0
+        self.compartidas = 0
+
+    def leer(self, clave, leer, *argumentos):
+        """ Metodo para hacer una petición, o esperar la que ya está en curso con la misma clave.
+        Atributos:
+            clave (str): Lo que identifica a la petición, por ejemplo la URL.
+            leer (function): Función que hace la petición si no hay otra en curso.
+            argumentos: Argumentos para leer.
+        Retorna:
+            El resultado de leer. Si leer lanzó una excepción, la reciben todas las que esperaban
+        """
+        with self.candado:
+            self.pedidas += 1
+            peticion = self.en_curso.get(clave)
+            propia = peticion is None
+            if propia:
+                peticion = self.en_curso[clave] = _PeticionEnCurso()
+            else:
+                self.compartidas += 1
+        if not propia:
+            instrumentacion.contar("api.compartidas")
+            peticion.terminada.wait()
+            if peticion.error is not None:
+                raise peticion.error
+            return peticion.resultado
+
+        try:
+            peticion.resultado = leer(*argumentos)
+        except BaseException as error:
+            peticion.error = error
+            raise
+        finally:
+            with self.candado:
+                del self.en_curso[clave]
+            peticion.terminada.set()
+        return peticion.resultado
+
+    def estadisticas(self):
+        """ Metodo para obtener cuántas peticiones se ahorraron.
+        Retorna:
+            Un diccionario con las peticiones pedidas, las compartidas (que esperaron a otra
+            en lugar de ir a la API) y el porcentaje de compartidas
+        """
+        with self.candado:
+            pedidas = self.pedidas
+            compartidas = self.compartidas
+        return {
+            "pedidas": pedidas,
+            "compartidas": compartidas,
+            "porcentaje_compartidas": 100 * compartidas / pedidas if pedidas else 0.0,
+        }
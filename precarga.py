@@ -0,0 +1,100 @@
+import heapq
+import itertools
+import threading
+
+# Prioridad de los departamentos que elige el usuario, por delante de los configurados
+PRIORIDAD_DEL_USUARIO = 0
+PRIORIDAD_DE_FONDO = 1
+
+
+class PrecargaDeDepartamentos:
+    """ Clase que descarga en segundo plano las obras de algunos departamentos antes de que
+        el usuario los busque, guardándolas en el catálogo y en el cache.
+        Trabaja de a un lote por vez y entre lote y lote revisa si llegó algo más urgente:
+        el departamento que el usuario acaba de elegir pasa adelante de los demás.
+    """
+
+    def __init__(self, museo, obras_por_departamento=200, tamaño_de_lote=20):
+        """ Método constructor de la clase PrecargaDeDepartamentos.
+        Atributos:
+            museo (MetroArt): Museo donde se guardan las obras.
+            obras_por_departamento (int): Cantidad máxima de obras que se precargan de cada departamento.
+            tamaño_de_lote (int): Cantidad de obras que se descargan antes de revisar la cola.
+        """
+        self.museo = museo
+        self.obras_por_departamento = obras_por_departamento
+        self.tamaño_de_lote = tamaño_de_lote
+        self.cola = []
+        self.orden = itertools.count()
+        self.condicion = threading.Condition()
+        self.detenida = False
+        self.precargadas = 0
+        self.hilo = threading.Thread(target=self._trabajar, name="precarga", daemon=True)
+        self.hilo.start()
+
+    def agregar(self, numero_del_departamento, prioridad=PRIORIDAD_DE_FONDO, desde=0):
+        """ Metodo para pedir la precarga de un departamento.
+        Atributos:
+            numero_del_departamento (int): ID del departamento.
+            prioridad (int): Los numeros más bajos se atienden primero; a igual prioridad, por orden de llegada.
+            desde (int): Posición de la primera obra a precargar en la lista del departamento.
+        """
+        with self.condicion:
+            heapq.heappush(self.cola, (prioridad, next(self.orden), numero_del_departamento, desde, desde + self.obras_por_departamento))
+            self.condicion.notify()
+
+    def priorizar(self, numero_del_departamento, desde=0):
+        """ Metodo para pasar adelante el departamento que eligió el usuario.
+        Atributos:
+            numero_del_departamento (int): ID del departamento.
+            desde (int): Posición desde la que conviene precargar, por ejemplo la primera obra
+                         que el listado todavía no está descargando.
+        """
+        self.agregar(numero_del_departamento, PRIORIDAD_DEL_USUARIO, desde)
+
+    def detener(self):
+        """ Metodo para terminar la precarga, por ejemplo al salir del sistema.
+            El lote que se está descargando termina, pero no se empieza otro.
+        """
+        with self.condicion:
+            self.detenida = True
+            self.condicion.notify()
+
+    def _hay_algo_mas_urgente(self, prioridad):
+        with self.condicion:
+            return self.detenida or (len(self.cola) > 0 and self.cola[0][0] < prioridad)
+
+    def _trabajar(self):
+        """ Metodo que corre en segundo plano atendiendo la cola por orden de prioridad.
+        """
+        while True:
+            with self.condicion:
+                while not self.detenida and not self.cola:
+                    self.condicion.wait()
+                if self.detenida:
+                    return
+                prioridad, _, numero_del_departamento, desde, hasta = heapq.heappop(self.cola)
+            try:
+                self._precargar(prioridad, numero_del_departamento, desde, hasta)
+            except Exception:
+                # La precarga es solo una ayuda: si falla, la busqueda se hace igual cuando se pida
+                pass
+
+    def _precargar(self, prioridad, numero_del_departamento, desde, hasta):
+        """ Metodo que descarga las obras de un departamento por lotes.
+            Si aparece algo más urgente, deja el departamento en la cola desde donde quedó.
+        """
+        ids_de_obras = self.museo.ids_del_departamento(numero_del_departamento)
+        limite = min(len(ids_de_obras), hasta)
+        posicion = desde
+        while posicion < limite:
+            lote = ids_de_obras[posicion:min(posicion + self.tamaño_de_lote, limite)]
+            for obra in self.museo.iterar_obras(lote):
+                pass
+            posicion += len(lote)
+            self.precargadas += len(lote)
+            if posicion < limite and self._hay_algo_mas_urgente(prioridad):
+                with self.condicion:
+                    if not self.detenida:
+                        heapq.heappush(self.cola, (prioridad, next(self.orden), numero_del_departamento, posicion, hasta))
+                return
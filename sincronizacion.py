@@ -0,0 +1,130 @@
+import datetime
+import json
+
+# Clave del cache donde se guarda la fecha de la última sincronización
+CLAVE_ULTIMA_SINCRONIZACION = "ultima_sincronizacion"
+# Clave del cache con los IDs que no se pudieron leer, se vuelven a pedir en la próxima sincronización
+CLAVE_NO_LEIDAS = "no_leidas_al_sincronizar"
+# Lo que retorna la lectura de una obra a la que la API responde 404
+NO_EXISTE = object()
+
+
+def fecha_desde_la_cual_sincronizar(museo):
+    """ Función para saber desde qué fecha pueden haber cambiado las obras guardadas.
+    Atributos:
+        museo (MetroArt): Museo a sincronizar.
+    Retorna:
+        La fecha (AAAA-MM-DD) de la última sincronización o, si nunca se sincronizó, la de la
+        obra guardada hace más tiempo en el cache. None si no hay nada guardado.
+    """
+    if museo.cache is None:
+        return None
+    fecha = museo.cache.obtener_estado(CLAVE_ULTIMA_SINCRONIZACION)
+    if fecha is not None:
+        return fecha
+    guardado = museo.cache.guardado_mas_antiguo()
+    if guardado is None:
+        return None
+    return datetime.datetime.fromtimestamp(guardado, datetime.timezone.utc).date().isoformat()
+
+
+def sincronizar(museo, desde=None, mostrar_progreso=True):
+    """ Función para poner al día las obras conocidas con los cambios de la API del museo.
+    Atributos:
+        museo (MetroArt): Museo a sincronizar. Se consideran conocidas las obras del catálogo
+                          y las del índice de nacionalidades (que incluye las del cache de disco).
+        desde (str): Fecha AAAA-MM-DD desde la cual buscar cambios. Si es None se usa la de
+                     la última sincronización (ver fecha_desde_la_cual_sincronizar).
+        mostrar_progreso (bool): Si es True imprime el avance.
+
+        Pide a la API solo los IDs de las obras modificadas desde la fecha (/objects?metadataDate=)
+        y vuelve a descargar, sin pasar por el cache, las que el sistema ya conoce. Cada obra
+        descargada actualiza los índices, el cache y el catálogo en el lugar.
+        Las obras que no se conocen no se descargan: se leerán cuando alguna busqueda las pida.
+        Las conocidas que la API ya no tiene (responde 404 o no están en el listado de /objects)
+        se sacan del catálogo, los índices y el cache. Las que no se pudieron leer por otro error
+        se guardan y se vuelven a pedir en la próxima sincronización.
+    Retorna:
+        Un diccionario con la fecha usada, las obras modificadas en la API, las conocidas que
+        se revisaron, las actualizadas, las borradas y las que no se pudieron leer;
+        o None si no se pudo sincronizar
+    """
+    if desde is None:
+        desde = fecha_desde_la_cual_sincronizar(museo)
+    if desde is None:
+        if mostrar_progreso:
+            print("No hay obras guardadas ni una sincronización anterior, no hay nada que actualizar.")
+        return None
+    inicio = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+    datos = museo.leer_api(f"{museo.url_api}/objects?metadataDate={desde}")
+    if datos is None:
+        if mostrar_progreso:
+            print("La API no respondió, no se pudo sincronizar.")
+        return None
+    modificadas = datos.get('objectIDs') or []
+
+    def es_conocida(numero_de_obra):
+        return numero_de_obra in museo.obras or museo.indice_de_nacionalidades.nacionalidad_de(numero_de_obra) is not None
+
+    pendientes = museo.cache.obtener_estado(CLAVE_NO_LEIDAS) if museo.cache is not None else None
+    conocidas = []
+    for numero_de_obra in dict.fromkeys(modificadas + (json.loads(pendientes) if pendientes else [])):
+        if es_conocida(numero_de_obra):
+            conocidas.append(numero_de_obra)
+    if mostrar_progreso:
+        print(f"{len(modificadas)} obras modificadas en la API desde {desde}, {len(conocidas)} conocidas por actualizar.")
+
+    actualizadas = set()
+    borradas = set()
+
+    def convertir(obra_respuesta):
+        # leer_obra ya actualizó los índices y el cache, falta el catálogo
+        numero_de_obra = obra_respuesta['objectID']
+        if numero_de_obra in museo.obras:
+            museo.obras.reemplazar(museo.convertir_respuesta(obra_respuesta))
+        actualizadas.add(numero_de_obra)
+        return numero_de_obra
+
+    def leer_sin_cache(numero_de_obra):
+        obra_respuesta = museo.leer_obra(numero_de_obra, usar_cache=False, si_no_existe=NO_EXISTE)
+        if obra_respuesta is NO_EXISTE:
+            borradas.add(numero_de_obra)
+            return None
+        return obra_respuesta
+
+    for numero_de_obra in museo.motor.obtener_obras(conocidas, convertir, mostrar_progreso=False, leer=leer_sin_cache):
+        if mostrar_progreso and len(actualizadas) % 1000 == 0:
+            print(f"    {len(actualizadas)} obras actualizadas")
+
+    # Las obras borradas no siempre aparecen como modificadas, se buscan en el listado completo
+    listado = museo.leer_api(f"{museo.url_api}/objects")
+    if listado is not None:
+        en_la_api = set(listado.get('objectIDs') or [])
+        # El índice de nacionalidades tiene todas las obras conocidas (catálogo, cache, instantánea)
+        for numero_de_obra in list(museo.indice_de_nacionalidades.nacionalidad_de_obra):
+            if numero_de_obra not in en_la_api:
+                borradas.add(numero_de_obra)
+    elif mostrar_progreso:
+        print("No se pudo leer el listado de obras de la API, no se buscaron obras borradas.")
+    for numero_de_obra in borradas:
+        museo.olvidar_obra(numero_de_obra)
+
+    no_leidas = [numero_de_obra for numero_de_obra in conocidas if numero_de_obra not in actualizadas and numero_de_obra not in borradas]
+    if museo.cache is not None:
+        museo.cache.guardar_estado(CLAVE_NO_LEIDAS, json.dumps(no_leidas))
+        museo.cache.guardar_estado(CLAVE_ULTIMA_SINCRONIZACION, inicio)
+    resultado = {
+        "desde": desde,
+        "modificadas": len(modificadas),
+        "revisadas": len(conocidas),
+        "actualizadas": len(actualizadas),
+        "borradas": len(borradas),
+        "no_leidas": len(no_leidas),
+    }
+    if mostrar_progreso:
+        print(f"Sincronización terminada: {resultado['actualizadas']} obras actualizadas, "
+              f"{resultado['borradas']} borradas de la API, {resultado['no_leidas']} no se pudieron leer.")
+        if no_leidas:
+            print("Las obras que no se pudieron leer se volverán a pedir en la próxima sincronización.")
+    return resultado
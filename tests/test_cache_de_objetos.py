@@ -0,0 +1,93 @@
+import types
+
+import pytest
+
+import cache_de_objetos
+from cache_de_objetos import CacheDeObjetos
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    # Reloj que solo avanza cuando el test lo pide
+    reloj = types.SimpleNamespace(ahora=1000.0)
+    monkeypatch.setattr(cache_de_objetos, "time", types.SimpleNamespace(time=lambda: reloj.ahora))
+    return reloj
+
+
+@pytest.fixture
+def cache(tmp_path, reloj):
+    cache = CacheDeObjetos(str(tmp_path / "cache.sqlite3"), ttl_obras=100, ttl_busquedas=10, max_entradas=10)
+    yield cache
+    cache.cerrar()
+
+
+def test_guardar_y_obtener(cache):
+    cache.guardar_obra(1, {"objectID": 1, "title": "Obra"})
+    cache.guardar_busqueda("https://api/search?q=x", {"objectIDs": [1]})
+    assert cache.obtener_obra(1) == {"objectID": 1, "title": "Obra"}
+    assert cache.obtener_busqueda("https://api/search?q=x") == {"objectIDs": [1]}
+    assert cache.obtener_obra(2) is None
+    assert cache.estadisticas()["aciertos"] == 2
+    assert cache.estadisticas()["fallos"] == 1
+
+
+def test_vencimiento(cache, reloj):
+    cache.guardar_obra(1, {"objectID": 1})
+    cache.guardar_busqueda("busqueda", {"objectIDs": [1]})
+    reloj.ahora += 10
+    assert cache.obtener_busqueda("busqueda") == {"objectIDs": [1]}
+    reloj.ahora += 1
+    assert cache.obtener_busqueda("busqueda") is None  # Las busquedas vencen antes que las obras
+    assert cache.obtener_obra(1) == {"objectID": 1}
+    reloj.ahora += 90
+    assert cache.obtener_obra(1) is None
+    assert list(cache.iterar_obras()) == []
+
+    # Guardarla de nuevo la renueva
+    cache.guardar_obra(1, {"objectID": 1, "title": "Nueva"})
+    assert cache.obtener_obra(1) == {"objectID": 1, "title": "Nueva"}
+    assert cache.estadisticas()["entradas"] == 2
+
+
+def test_expulsa_las_menos_usadas(cache, reloj):
+    for numero in range(1, 11):
+        cache.guardar_obra(numero, {"objectID": numero})
+        reloj.ahora += 1
+    # Usar la obra 1 la pasa al final de la fila de expulsión
+    assert cache.obtener_obra(1) is not None
+    reloj.ahora += 1
+    cache.guardar_obra(11, {"objectID": 11})
+
+    estadisticas = cache.estadisticas()
+    # Se pasó del máximo (10): se borran las usadas hace más tiempo hasta quedar al 90%
+    assert estadisticas["entradas"] == 9
+    assert estadisticas["expulsiones"] == 2
+    assert cache.obtener_obra(2) is None
+    assert cache.obtener_obra(3) is None
+    assert cache.obtener_obra(1) is not None
+    assert cache.obtener_obra(11) is not None
+    assert [obra["objectID"] for obra in cache.iterar_obras(tamaño_de_lote=4)] == [1, 4, 5, 6, 7, 8, 9, 10, 11]
+
+
+def test_borrar_obra(cache):
+    cache.guardar_obra(1, {"objectID": 1})
+    cache.guardar_obra(2, {"objectID": 2})
+    cache.borrar_obra(1)
+    cache.borrar_obra(3)
+    assert cache.obtener_obra(1) is None
+    assert cache.estadisticas()["entradas"] == 1
+
+
+def test_estado_entre_sesiones(tmp_path, reloj):
+    ruta = str(tmp_path / "cache.sqlite3")
+    cache = CacheDeObjetos(ruta)
+    cache.guardar_estado("ultima_sincronizacion", "2024-01-31")
+    cache.guardar_obra(1, {"objectID": 1})
+    cache.cerrar()
+
+    cache = CacheDeObjetos(ruta)
+    assert cache.obtener_estado("ultima_sincronizacion") == "2024-01-31"
+    assert cache.obtener_estado("otra") is None
+    assert cache.estadisticas()["entradas"] == 1
+    assert cache.guardado_mas_antiguo() == 1000.0
+    cache.cerrar()
@@ -0,0 +1,33 @@
+import pytest
+
+from fechas import AÑO_DE_AUTOR_VIVO, años_de_vida, leer_años
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("1606", (1606, 1606)),
+    ("ca. 1650–60", (1650, 1660)),
+    ("1850s", (1850, 1859)),
+    ("1800s", (1800, 1899)),
+    ("late 18th century", (1766, 1799)),
+    ("18th–19th century", (1700, 1899)),
+    ("ca. 1500 B.C.", (-1500, -1500)),
+    ("1000–800 B.C.", (-1000, -800)),
+    ("ca. 300 B.C.–A.D. 100", (-300, 100)),
+    ("1st century B.C.–1st century A.D.", (-100, 99)),
+    ("5th millennium B.C.", (-5000, -4001)),
+    ("A.D. 50", (50, 50)),
+    ("No especificado", None),
+    (None, None),
+])
+def test_leer_años(texto, esperado):
+    assert leer_años(texto) == esperado
+
+
+@pytest.mark.parametrize("nacimiento, muerte, esperado", [
+    ("1606", "1669", (1606, 1669)),
+    ("1950", str(AÑO_DE_AUTOR_VIVO), (1950, AÑO_DE_AUTOR_VIVO)),
+    ("1780", "", None),
+    ("", "1850", None),
+])
+def test_años_de_vida(nacimiento, muerte, esperado):
+    assert años_de_vida({"artistBeginDate": nacimiento, "artistEndDate": muerte}) == esperado
@@ -0,0 +1,134 @@
+import pytest
+
+from indices import IndiceDeAutores, IndiceDeFacetas, IndiceDeIntervalos
+
+
+@pytest.fixture
+def autores():
+    indice = IndiceDeAutores()
+    indice.registrar(1, "Rembrandt van Rijn")
+    indice.registrar(2, "Johannes Vermeer")
+    indice.registrar(3, "Vincent van Gogh")
+    indice.registrar(4, "Jean-Antoine Watteau")
+    indice.registrar(5, "Élisabeth Vigée Le Brun")
+    return indice
+
+
+@pytest.mark.parametrize("nombre, esperado", [
+    ("Rembrandt van Rijn", [1]),
+    ("remb", [1]),
+    ("van", [1, 3]),
+    ("v", [1, 2, 3, 5]),
+    ("van gogh", [3]),
+    ("elisabeth vigee", [5]),
+    ("WATTEAU jean", [4]),
+    ("Vermer", [2]),  # Una letra faltante
+    ("Vermeeer", [2]),  # Una letra sobrante
+    ("Vermaer", [2]),  # Una letra cambiada
+    ("Varmaer", []),  # Dos ediciones
+    ("Gogg", [3]),
+    ("Goh", []),  # Muy corta para buscarla con errores de tipeo
+    ("rembrandt gogh", []),
+    ("", []),
+])
+def test_buscar_autores(autores, nombre, esperado):
+    assert autores.buscar(nombre) == esperado
+
+
+def test_el_prefijo_gana_al_error_de_tipeo(autores):
+    autores.registrar(6, "Jan Vermeern")
+    # "vermeer" es prefijo de "vermeern", así que no se buscan palabras a una edición
+    assert autores.buscar("vermeer") == [2, 6]
+    assert autores.coincide("Johannes Vermeer", "vermeer")
+    assert autores.coincide("Johannes Vermeer", "vermeez")
+    assert not autores.coincide("Johannes Vermeer", "varmeez")
+
+
+def test_cambiar_y_quitar_autores(autores):
+    autores.registrar(3, "Paul Gauguin")
+    assert autores.buscar("gogh") == []
+    assert autores.buscar("gauguin") == [3]
+    autores.quitar(1)
+    assert autores.buscar("rembrandt") == []
+    assert autores.autor_de(1) is None
+    assert len(autores) == 4
+
+
+@pytest.fixture
+def facetas():
+    indice = IndiceDeFacetas()
+    indice.registrar(1, "European Paintings", "Paintings", True)
+    indice.registrar(2, "European Paintings", "Paintings", False)
+    indice.registrar(3, "European Paintings", "Drawings", True)
+    indice.registrar(4, "Drawings and Prints", "Drawings", True)
+    indice.registrar(5, None, None, False)
+    return indice
+
+
+@pytest.mark.parametrize("restricciones, esperado", [
+    ({"departamento": "European Paintings"}, {1, 2, 3}),
+    ({"departamento": "european paintings ", "clasificacion": "PAINTINGS"}, {1, 2}),
+    ({"departamento": "European Paintings", "imagen": True}, {1, 3}),
+    ({"clasificacion": "Drawings", "imagen": True}, {3, 4}),
+    ({"departamento": "European Paintings", "clasificacion": "Drawings", "imagen": False}, set()),
+    ({"departamento": "Egyptian Art"}, set()),
+    ({"departamento": ""}, {5}),
+    ({}, set()),
+])
+def test_intersectar_facetas(facetas, restricciones, esperado):
+    assert facetas.intersectar(restricciones) == esperado
+
+
+def test_intersectar_con_otros_conjuntos(facetas):
+    assert facetas.intersectar({"imagen": True}, [{1, 2, 4}]) == {1, 4}
+    assert facetas.intersectar({}, [{1, 2}, {2, 3}]) == {2}
+
+
+def test_cambiar_y_quitar_facetas(facetas):
+    facetas.registrar(2, "Drawings and Prints", "Prints", True)
+    assert facetas.intersectar({"departamento": "European Paintings"}) == {1, 3}
+    assert facetas.valores_de(2) == ("Drawings and Prints", "Prints", True)
+    facetas.quitar(4)
+    assert facetas.intersectar({"departamento": "Drawings and Prints"}) == {2}
+    assert facetas.valores_de(4) is None
+    assert ("European Paintings", 2) in facetas.valores("departamento")
+
+
+LARGO = IndiceDeIntervalos.LARGO_MAXIMO
+
+
+@pytest.fixture
+def intervalos():
+    indice = IndiceDeIntervalos()
+    indice.registrar(1, (1000, 1000 + LARGO))  # El más largo que todavía se busca con bisect
+    indice.registrar(2, (1000, 1000 + LARGO + 1))  # El más corto que se guarda aparte
+    indice.registrar(3, (1000 - LARGO, 1000))
+    indice.registrar(4, (2000, 2000))
+    indice.registrar(5, (-500, -300))
+    return indice
+
+
+@pytest.mark.parametrize("desde, hasta, esperado", [
+    (1000 + LARGO, 1000 + LARGO, [1, 2]),
+    (1000 + LARGO + 1, 1000 + LARGO + 1, [2]),
+    (1000 + LARGO + 2, 1999, []),
+    (1000, 1000, [3, 1, 2]),
+    (1000 - LARGO, 1000 - LARGO, [3]),
+    (1000 - LARGO - 1, 1000 - LARGO - 1, []),
+    (1999, 2000, [4]),
+    (-400, -400, [5]),
+    (-1000, 3000, [5, 3, 1, 2, 4]),
+])
+def test_buscar_intervalos(intervalos, desde, hasta, esperado):
+    assert intervalos.buscar(desde, hasta) == esperado
+
+
+def test_cambiar_y_quitar_intervalos(intervalos):
+    assert intervalos.buscar(2000, 2000) == [4]
+    intervalos.registrar(4, (1000 + LARGO + 1, 1000 + 2 * LARGO + 2))  # Pasa de corto a largo
+    assert intervalos.buscar(2000, 2000) == []
+    assert intervalos.buscar(1000 + 2 * LARGO + 2, 1000 + 2 * LARGO + 2) == [4]
+    intervalos.registrar(2, None)
+    assert intervalos.buscar(1000 + LARGO + 1, 1000 + LARGO + 1) == [4]
+    assert intervalos.intervalo_de(2) is None
+    assert len(intervalos) == 4
@@ -0,0 +1,114 @@
+import time
+import types
+
+import instantanea
+from MetroArt import MetroArt
+from Obra import CAMPOS_DE_DETALLE, Obra
+from cache_de_imagenes import CacheDeImagenes
+from instantanea import abrir_instantanea, guardar_instantanea, indexar_instantanea
+from lector_de_obras import crear_obra
+
+OBRAS = [
+    {"objectID": 1, "title": "The Night Watch", "artistDisplayName": "Rembrandt van Rijn", "artistNationality": "Dutch",
+     "artistBeginDate": "1606", "artistEndDate": "1669", "classification": "Paintings", "objectDate": "1642",
+     "primaryImage": "https://images.metmuseum.org/1.jpg", "department": "European Paintings"},
+    {"objectID": 2, "title": "Study of a Head", "artistDisplayName": "Jean-Antoine Watteau", "artistNationality": "French",
+     "artistBeginDate": "1684", "artistEndDate": "1721", "classification": "Drawings", "objectDate": "ca. 1715–16",
+     "primaryImage": "", "department": "Drawings and Prints"},
+    {"objectID": 3, "title": "", "artistDisplayName": "", "artistNationality": "", "artistBeginDate": "",
+     "artistEndDate": "", "classification": "", "objectDate": "", "primaryImage": "", "department": "European Paintings"},
+]
+
+
+def crear_museo(tmp_path, sin_conexion=True):
+    museo = MetroArt(peticiones_por_segundo=0, cache_de_imagenes=CacheDeImagenes(str(tmp_path / "imagenes")))
+    museo.sin_conexion = sin_conexion
+    return museo
+
+
+def guardar_museo(tmp_path, monkeypatch=None, hace=0):
+    if hace:
+        # La instantánea se guarda como si fuera hace esos segundos
+        guardada = time.time() - hace
+        monkeypatch.setattr(instantanea, "time", types.SimpleNamespace(time=lambda: guardada))
+    museo = crear_museo(tmp_path)
+    for obra_respuesta in OBRAS:
+        museo.obras.agregar(crear_obra(obra_respuesta))
+        museo.registrar_respuesta(obra_respuesta)
+    museo.departamentos = [{"departmentId": 9, "displayName": "Drawings and Prints"},
+                           {"departmentId": 11, "displayName": "European Paintings"}]
+    museo.obras_por_departamento = {"European Paintings": [1, 3], "Drawings and Prints": [2]}
+    ruta = str(tmp_path / "catalogo.bin")
+    assert guardar_instantanea(museo, ruta) == len(OBRAS)
+    if hace:
+        monkeypatch.undo()
+    return museo, ruta
+
+
+def test_guardar_y_abrir(tmp_path):
+    museo, ruta = guardar_museo(tmp_path)
+    abierto = crear_museo(tmp_path)
+    guardada = abrir_instantanea(abierto, ruta)
+
+    assert len(abierto.obras) == len(OBRAS)
+    for obra_respuesta in OBRAS:
+        original = museo.obras.obtener(obra_respuesta["objectID"])
+        obra = abierto.obras.obtener(obra_respuesta["objectID"])
+        for campo in ("numero", "titulo", "nombre_del_autor") + CAMPOS_DE_DETALLE:
+            assert getattr(obra, campo) == getattr(original, campo)
+    assert abierto.obras.obtener(4) is None
+    assert [departamento["displayName"] for departamento in abierto.departamentos] == ["Drawings and Prints", "European Paintings"]
+    assert {nombre: list(ids) for nombre, ids in abierto.obras_por_departamento.items()} == museo.obras_por_departamento
+
+    indexar_instantanea(abierto, guardada)
+    assert abierto.indice_de_nacionalidades.obras_de("Dutch") == [1]
+    assert abierto.indice_de_autores.buscar("watteau") == [2]
+    assert abierto.indice_de_facetas.intersectar({"departamento": "european paintings", "imagen": True}) == {1}
+    assert abierto.indice_de_creacion.intervalo_de(2) == (1715, 1716)
+    assert abierto.indice_de_vida_de_autores.intervalo_de(1) == (1606, 1669)
+
+
+def test_no_guarda_obras_perezosas_sin_datos(tmp_path):
+    museo = crear_museo(tmp_path)
+    museo.obras.agregar(crear_obra(OBRAS[0]))
+    perezosa = Obra.para_listado(2, "Study of a Head", "Jean-Antoine Watteau", lambda numero_de_obra: None)
+    perezosa.hidratar()  # La API no la devolvió, quedan los datos de relleno
+    museo.obras.agregar(perezosa)
+    ruta = str(tmp_path / "catalogo.bin")
+
+    assert guardar_instantanea(museo, ruta) == 1
+    abierto = crear_museo(tmp_path)
+    abrir_instantanea(abierto, ruta)
+    assert abierto.obras.obtener(2) is None
+
+
+def test_departamentos_vencidos(tmp_path, monkeypatch):
+    _, ruta = guardar_museo(tmp_path, monkeypatch, hace=2 * 3600)
+
+    vigente = crear_museo(tmp_path, sin_conexion=False)
+    abrir_instantanea(vigente, ruta, vigencia=3 * 3600)
+    assert sorted(vigente.obras_por_departamento) == ["Drawings and Prints", "European Paintings"]
+
+    vencida = crear_museo(tmp_path, sin_conexion=False)
+    abrir_instantanea(vencida, ruta, vigencia=3600)
+    assert vencida.obras_por_departamento == {}
+    assert len(vencida.obras) == len(OBRAS)  # Las obras no vencen, solo los IDs de los departamentos
+
+    sin_conexion = crear_museo(tmp_path)
+    abrir_instantanea(sin_conexion, ruta, vigencia=3600)
+    assert sorted(sin_conexion.obras_por_departamento) == ["Drawings and Prints", "European Paintings"]
+
+
+def test_volver_a_guardar_conserva_el_momento_de_los_departamentos(tmp_path, monkeypatch):
+    _, ruta = guardar_museo(tmp_path, monkeypatch, hace=3600)
+    abierto = crear_museo(tmp_path)
+    guardada = abrir_instantanea(abierto, ruta)
+    antes = guardada.guardado_del_departamento("European Paintings")
+    abierto.obras_por_departamento["Drawings and Prints"] = [2]  # Una lista nueva, recién buscada
+    nueva_ruta = str(tmp_path / "catalogo2.bin")
+    guardar_instantanea(abierto, nueva_ruta)
+
+    reabierto = crear_museo(tmp_path)
+    nueva = abrir_instantanea(reabierto, nueva_ruta)
+    assert nueva.guardado_del_departamento("European Paintings") == antes
+    assert nueva.guardado_del_departamento("Drawings and Prints") > antes